@@ -0,0 +1,195 @@
+import logging
+import os
+import socket
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    id_negocio TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    lease_until REAL,
+    attempts INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_claims_owner ON claims (owner, status);
+"""
+
+# Un ID se toma si nunca se reclamó, si su lease venció (el worker murió) o si falló
+# menos de max_attempts veces en esta corrida (ver reset_attempts). Los IDs en estado
+# 'done' no se vuelven a tomar.
+CLAIM_SQL = """
+INSERT INTO claims (id_negocio, status, owner, lease_until, attempts, updated_at)
+VALUES (?, 'leased', ?, ?, 1, ?)
+ON CONFLICT (id_negocio) DO UPDATE SET
+    status = 'leased',
+    owner = excluded.owner,
+    lease_until = excluded.lease_until,
+    attempts = claims.attempts + 1,
+    updated_at = excluded.updated_at
+WHERE (claims.status = 'leased' AND claims.lease_until < excluded.updated_at)
+   OR (claims.status = 'failed' AND claims.attempts < ?)
+"""
+
+
+class ClaimStore:
+    """
+    Tabla de reclamos de IDs compartida entre procesos y entre ejecuciones.
+
+    Antes de descargar un negocio, el worker lo reclama con un lease: el reclamo es un
+    único UPSERT atómico en SQLite (modo WAL), así que dos procesos nunca obtienen el
+    mismo ID. Al terminar se marca 'done' (después de escribirlo en el CSV) o 'failed'.
+    Si un worker muere, sus IDs quedan 'leased' hasta que vence el lease y otro los toma;
+    al retomar una corrida caída, release_dead_owners los libera sin esperar.
+    """
+
+    def __init__(self, config: dict, path: Optional[str] = None, lease_seconds: Optional[int] = None):
+        self.claims_config = config['extractor'].get('claims', {})
+        self.path = path or self.claims_config.get('path', 'data/cache/claims.sqlite3')
+        self.lease_seconds = lease_seconds if lease_seconds is not None else self.claims_config.get('lease_seconds', 900)
+        self.max_attempts = self.claims_config.get('max_attempts', 3)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self.stats: Dict[str, int] = {'claimed': 0, 'rejected': 0}
+
+    @property
+    def owner(self) -> str:
+        """Identificador del proceso que reclama."""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Conexión propia del proceso actual (las conexiones SQLite no se comparten entre procesos)."""
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # check_same_thread=False: el escritor del CSV la usa desde su propio hilo
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def claim(self, business_id: str) -> bool:
+        """
+        Intenta reclamar un ID para descargarlo.
+
+        Returns:
+            bool: True si este proceso obtuvo el lease; False si ya está hecho o lo tiene otro worker.
+        """
+        now = time.time()
+        try:
+            cursor = self.conn.execute(CLAIM_SQL, (str(business_id), self.owner, now + self.lease_seconds,
+                                                   now, self.max_attempts))
+        except sqlite3.Error as e:
+            # Sin tabla de reclamos se prefiere un posible duplicado a perder el ID
+            logger.warning(f"Error al reclamar el ID {business_id}: {e}")
+            return True
+        claimed = cursor.rowcount == 1
+        self.stats['claimed' if claimed else 'rejected'] += 1
+        return claimed
+
+    def _set_status(self, business_ids: Iterable[str], status: str, any_owner: bool = False) -> None:
+        """Cambia el estado de IDs reclamados (por este proceso, salvo any_owner) en una sola transacción."""
+        rows = [(status, time.time(), str(business_id), int(any_owner), self.owner) for business_id in business_ids]
+        if not rows:
+            return
+        try:
+            self.conn.execute('BEGIN IMMEDIATE')
+            self.conn.executemany(
+                'UPDATE claims SET status = ?, lease_until = NULL, updated_at = ? '
+                "WHERE id_negocio = ? AND (? OR owner = ?) AND status = 'leased'", rows)
+            self.conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            logger.warning(f"Error al marcar {len(rows)} IDs como '{status}': {e}")
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK')
+
+    def mark_done(self, business_ids: Iterable[str], any_owner: bool = False) -> None:
+        """
+        Marca IDs como procesados; ningún worker los vuelve a reclamar.
+
+        Con any_owner=True los cierra aunque los haya reclamado otro proceso (p. ej. el
+        escritor del CSV, que confirma los registros que le entregan los workers).
+        """
+        self._set_status(business_ids, 'done', any_owner)
+
+    def mark_failed(self, business_ids: Iterable[str]) -> None:
+        """Marca IDs como fallidos; se pueden reintentar hasta max_attempts veces."""
+        self._set_status(business_ids, 'failed')
+
+    def release(self, business_ids: Iterable[str]) -> None:
+        """
+        Libera los leases pendientes de estos IDs (reclamados por este proceso) para que
+        otro worker los tome sin esperar. Solo se deben pasar los IDs que no se terminaron:
+        los que esperan a que otro proceso los confirme con mark_done conservan su lease.
+        """
+        rows = [(str(business_id), self.owner) for business_id in business_ids]
+        if not rows:
+            return
+        try:
+            self.conn.executemany("UPDATE claims SET lease_until = 0 "
+                                  "WHERE id_negocio = ? AND owner = ? AND status = 'leased'", rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Error al liberar {len(rows)} reclamos de {self.owner}: {e}")
+
+    def reset_attempts(self) -> int:
+        """
+        Vuelve a cero los intentos de los IDs fallidos, para que una corrida nueva (no
+        retomada) los reintente en lugar de heredar los fallos de corridas anteriores.
+
+        Returns:
+            int: Cantidad de IDs reiniciados.
+        """
+        try:
+            return self.conn.execute("UPDATE claims SET attempts = 0 WHERE status = 'failed'").rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Error al reiniciar los intentos de los IDs fallidos: {e}")
+            return 0
+
+    def release_dead_owners(self) -> int:
+        """
+        Libera los leases de procesos de este host que ya no existen (p. ej. los workers
+        de una corrida que se cortó), para retomarla sin esperar a que venzan.
+
+        Returns:
+            int: Cantidad de IDs liberados.
+        """
+        host = socket.gethostname()
+        released = 0
+        try:
+            owners = [row[0] for row in self.conn.execute(
+                "SELECT DISTINCT owner FROM claims WHERE status = 'leased' AND lease_until > 0")]
+            for owner in owners:
+                owner_host, _, pid = owner.rpartition(':')
+                if owner_host != host or not pid.isdigit() or _process_exists(int(pid)):
+                    continue
+                released += self.conn.execute("UPDATE claims SET lease_until = 0 WHERE owner = ? AND status = 'leased'",
+                                              (owner,)).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Error al liberar los reclamos de procesos terminados: {e}")
+        if released:
+            logger.info(f"Liberados {released} IDs reclamados por procesos que ya no existen")
+        return released
+
+    def close(self) -> None:
+        """Cierra la conexión del proceso actual."""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+        self._conn_pid = None
+
+
+def _process_exists(pid: int) -> bool:
+    """Indica si hay un proceso con ese PID en este host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True # Existe, pero es de otro usuario
+    return True
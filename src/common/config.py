@@ -75,7 +75,127 @@ EXTRACTOR_CONFIG = {
         'chunk_size': 100,
         'max_workers': 4,
         'timeout': 30,
+        'driver_max_pages': 200,  # Páginas por driver antes de reciclarlo (0 = sin límite)
+        'driver_max_rss_mb': 1024,  # RSS máximo del árbol de Chrome antes de reciclarlo (0 = sin límite)
+        'engine': 'http',  # Motor para páginas de detalle: 'http', 'async', 'selenium' o 'tabs'
+        'selenium_fallback': True,  # Reintentar con Selenium las páginas sin contenido por HTTP
+        'extraction': 'soup',  # Con navegador: 'soup' (page_source + BeautifulSoup, guarda la página en la caché) o 'js' (campos extraídos en la página, sin caché)
+        'max_in_flight_per_worker': 4,  # Tareas de Selenium pendientes por worker (ventana de envío)
+        'density': {
+            'bitmap_path': str(DATA_DIR / 'cache' / 'bulk_ids.bitmap'),  # IDs consultados y vivos
+            'block_size': 100,  # IDs por bloque del modelo de densidad
+            'probes_per_block': 5,  # Sondeos por bloque sin información antes de recorrerlo completo
+            'frontier': 2000,  # IDs por encima del mayor vivo conocido que se consultan en cada refresco
+            'reprobe_ratio': 0.05  # Fracción de bloques muertos que se vuelve a sondear en cada pasada
+        },
+        'frontier_probe': {
+            'state_path': str(DATA_DIR / 'cache' / 'bulk_state.json'),  # High-water mark de la última corrida
+            'window': 20,  # IDs consecutivos por sondeo (el espacio de IDs tiene huecos)
+            'initial_step': 64,  # Salto inicial del sondeo exponencial
+            'retries': 3,  # Reintentos de los IDs de una ventana cuya descarga falló (timeout, 429, 5xx)
+            'retry_delay': 2.0  # Segundos de espera antes del primer reintento (crece con cada intento)
+        },
         'base_url': 'https://www.guiacores.com.ar/index.php?r=search/detail&id='
+    },
+    'http': {
+        'pool_size': 16,  # Conexiones keep-alive por host
+        'max_concurrency': 16,  # Descargas simultáneas
+        'timeout': 15,
+        'retries': 2,
+        'backoff_factor': 0.5
+    },
+    'rate_limit': {
+        'enabled': True,  # Token bucket global compartido por todos los procesos de la corrida
+        'initial_rate': 5.0,  # Requests por segundo al empezar
+        'min_rate': 0.5,
+        'max_rate': 50.0,
+        'burst': 10,
+        'window': 50,  # Respuestas observadas entre ajustes AIMD
+        'additive_increase': 0.5,  # req/s que se suman tras una ventana sana
+        'multiplicative_decrease': 0.5,  # Factor aplicado tras una ventana con errores o lenta
+        'max_error_rate': 0.05,  # Proporción de 429/5xx/timeouts que dispara la reducción
+        'latency_target': 3.0  # Latencia media (s) que dispara la reducción
+    },
+    'async': {
+        'max_in_flight': 200,  # Requests simultáneos del crawler asyncio
+        'rate_per_host': 50,  # Requests por segundo por host (token bucket)
+        'burst': 100,
+        'request_deadline': 20,  # Segundos máximos por request
+        'max_retries': 3,
+        'backoff_base': 0.5,  # Backoff exponencial con jitter entre reintentos
+        'backoff_max': 10,
+        'io_workers': 4  # Hilos para el parsing, la caché de páginas y la entrega de registros (fuera del event loop)
+    },
+    'sequential': {
+        'batch_size': 2,  # URLs por lote enviado a un worker persistente (lotes chicos = sin cola larga al final)
+        'collectors': 1,  # Drivers (o sesiones HTTP) que recolectan combinaciones rubro/localidad en paralelo
+        'url_queue_size': 1000,  # URLs pendientes entre la recolección y el scraping antes de frenar al collector
+        'driver_max_pages': 200,  # Páginas por driver antes de reciclarlo (0 = sin límite)
+        'driver_max_rss_mb': 1024  # RSS máximo del árbol de Chrome antes de reciclarlo (0 = sin límite)
+    },
+    'driver': {
+        'page_load_strategy': 'eager',  # driver.get retorna en DOMContentLoaded ('normal' espera todos los recursos)
+        'detail_profile': 'lean',  # Perfil de las páginas de detalle: sin imágenes, fuentes, CSS ni terceros
+        'search_profile': 'interactive',  # Perfil de la búsqueda con clics: conserva el CSS
+        'window_size': '1920,1080',
+        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'third_party_hosts': [  # Hosts de terceros que no aportan datos (analytics, anuncios, mapas, fuentes)
+            'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+            'fonts.googleapis.com', 'fonts.gstatic.com', 'maps.googleapis.com', 'maps.gstatic.com',
+            'connect.facebook.net', 'facebook.com/tr', 'hotjar.com', 'tile.openstreetmap.org'
+        ]
+    },
+    'tabs': {
+        'per_driver': 4,  # Pestañas cargando a la vez en cada driver (motor 'tabs')
+        'timeout': 30,  # Segundos máximos de carga por página
+        'poll_interval': 0.05,  # Pausa entre vueltas de sondeo de las pestañas
+        'chunk_size': 32  # URLs por tarea enviada a un worker de Bulk
+    },
+    'watchdog': {
+        'hang_timeout': 90,  # Segundos sin progreso en una operación del driver antes de matarlo (0 = deshabilitado)
+        'check_interval': 5,  # Cada cuántos segundos revisa el watchdog
+        'retries': 1  # Reintentos de la URL en curso con un driver nuevo tras matar uno colgado
+    },
+    'pacing': {
+        'detail_min_interval': 0.5,  # Segundos mínimos entre páginas de detalle, por worker
+        'search_min_interval': 1.0,  # Segundos mínimos entre cargas de "Ver más" / páginas de resultados
+        'jitter': 0.25  # Fracción aleatoria que se suma al intervalo
+    },
+    'waits': {
+        'poll_interval': 0.05,  # Sondeo de WebDriverWait (Selenium usa 0.5s por defecto)
+        'dom_quiet_ms': 150  # Milisegundos sin mutaciones para considerar el DOM estable
+    },
+    'page_store': {
+        'enabled': True,  # Consultar la caché de HTML crudo antes de descargar una página de detalle
+        'path': str(DATA_DIR / 'cache' / 'pages.sqlite3'),
+        'ttl': 7 * 24 * 3600,  # Segundos antes de volver a descargar una página cacheada
+        'max_mb': 2048  # Tope de tamaño de la caché (se descartan las páginas menos usadas)
+    },
+    'catalog': {
+        'path': str(DATA_DIR / 'cache' / 'search_catalog.json'),  # Valores R=/L= de rubros y localidades
+        'ttl': 7 * 24 * 3600  # Segundos antes de volver a descargar el catálogo
+    },
+    'processed_index': {
+        'path': str(DATA_DIR / 'cache' / 'processed_ids.bitmap'),  # Un bit por id_negocio ya guardado
+        'csv_path': 'data/guiaCores_leads.csv'  # CSV del que se construye el índice la primera vez
+    },
+    'claims': {
+        'path': str(DATA_DIR / 'cache' / 'claims.sqlite3'),  # Reclamos de IDs compartidos entre procesos
+        'lease_seconds': 900,  # Tiempo tras el cual el ID de un worker caído se puede volver a reclamar
+        'max_attempts': 3  # Intentos por ID antes de dejar de reintentar los fallidos
+    },
+    'journal': {
+        'dir': str(DATA_DIR / 'cache' / 'journal'),  # Un subdirectorio por modo (bulk, sequential)
+        'segment_mb': 64,  # Tamaño a partir del cual se abre un segmento nuevo
+        'fsync_every': 100  # Registros entre fsync (cada línea se vuelca al SO de inmediato)
+    },
+    'csv_writer': {
+        'path': 'data/guiaCores_leads.csv',  # CSV de leads que escribe el único escritor del modo Sequential
+        'queue_size': 5000,  # Registros en espera antes de frenar a los productores (backpressure)
+        'batch_size': 200,  # Registros por escritura
+        'flush_interval': 1.0,  # Segundos máximos que un lote incompleto espera antes de escribirse
+        'fsync': 'interval',  # 'always' (cada lote), 'interval' o 'never'
+        'fsync_interval': 5.0  # Segundos entre fsync con la política 'interval'
     }
 }
 
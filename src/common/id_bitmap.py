@@ -0,0 +1,100 @@
+import logging
+import os
+import struct
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IdBitmap:
+    """
+    Bitmap persistente de IDs de negocio.
+
+    Guarda dos bits por ID: si ya se consultó (`probed`) y si la página existía (`live`).
+    Para 100k IDs ocupa unos 25 KB en disco.
+    """
+
+    MAGIC = b'IDBM'
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.probed = bytearray()
+        self.live = bytearray()
+        self.load()
+
+    def _ensure(self, business_id: int) -> None:
+        """Agranda los bitsets para que entre el ID."""
+        size = (business_id >> 3) + 1
+        if size > len(self.probed):
+            self.probed.extend(bytes(size - len(self.probed)))
+            self.live.extend(bytes(size - len(self.live)))
+
+    def mark(self, business_id: int, live: bool) -> None:
+        """Registra el resultado de consultar un ID."""
+        self._ensure(business_id)
+        byte, bit = business_id >> 3, 1 << (business_id & 7)
+        self.probed[byte] |= bit
+        if live:
+            self.live[byte] |= bit
+        else:
+            self.live[byte] &= ~bit & 0xFF
+
+    def is_probed(self, business_id: int) -> bool:
+        """Indica si el ID ya se consultó alguna vez."""
+        byte = business_id >> 3
+        return byte < len(self.probed) and bool(self.probed[byte] & (1 << (business_id & 7)))
+
+    def is_live(self, business_id: int) -> bool:
+        """Indica si el ID existía la última vez que se consultó."""
+        byte = business_id >> 3
+        return byte < len(self.live) and bool(self.live[byte] & (1 << (business_id & 7)))
+
+    def iter_live(self, start_id: int = 0, end_id: Optional[int] = None) -> Iterator[int]:
+        """Recorre los IDs vivos del rango, salteando de a bytes los tramos vacíos."""
+        last = len(self.live) * 8 - 1 if end_id is None else min(end_id, len(self.live) * 8 - 1)
+        business_id = max(0, start_id)
+        while business_id <= last:
+            if not self.live[business_id >> 3]:
+                business_id = ((business_id >> 3) + 1) << 3
+                continue
+            if self.is_live(business_id):
+                yield business_id
+            business_id += 1
+
+    def max_live(self) -> Optional[int]:
+        """Mayor ID vivo registrado, o None si no hay ninguno."""
+        for byte in range(len(self.live) - 1, -1, -1):
+            if self.live[byte]:
+                return (byte << 3) + self.live[byte].bit_length() - 1
+        return None
+
+    def count_live(self) -> int:
+        """Cantidad de IDs vivos registrados."""
+        return sum(bin(byte).count('1') for byte in self.live)
+
+    def load(self) -> None:
+        """Carga el bitmap desde disco, si existe."""
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(12)
+                magic, version, size = struct.unpack('<4sII', header)
+                if magic != self.MAGIC or version != self.VERSION:
+                    logger.warning(f"Formato de bitmap desconocido en {self.path}. Se inicia vacío.")
+                    return
+                self.probed = bytearray(f.read(size))
+                self.live = bytearray(f.read(size))
+        except FileNotFoundError:
+            return
+        except (OSError, struct.error) as e:
+            logger.warning(f"No se pudo leer el bitmap de IDs {self.path}: {e}. Se inicia vacío.")
+
+    def save(self) -> None:
+        """Guarda el bitmap de forma atómica."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(struct.pack('<4sII', self.MAGIC, self.VERSION, len(self.probed)))
+            f.write(self.probed)
+            f.write(self.live)
+        os.replace(tmp_path, self.path)
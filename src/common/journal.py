@@ -0,0 +1,138 @@
+import glob
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = 'segment-{:06d}.jsonl'
+# Ruta del archivo de salida de la corrida, para que una reanudación siga escribiendo en él
+OUTPUT_MARKER = 'output.txt'
+
+
+class ResultJournal:
+    """
+    Journal de escritura anticipada de los resultados de una corrida.
+
+    Cada registro (o cada ID inexistente) se agrega como una línea JSON apenas llega,
+    en segmentos que rotan al superar `segment_mb`. Si la corrida se corta, `replay()`
+    recupera los registros ya obtenidos y los IDs terminados para no repetirlos.
+    Una línea truncada por un corte a mitad de escritura se descarta.
+    """
+
+    def __init__(self, config: dict, name: str, directory: Optional[str] = None):
+        self.journal_config = config['extractor'].get('journal', {})
+        base_dir = self.journal_config.get('dir', 'data/cache/journal')
+        self.directory = directory or os.path.join(base_dir, name)
+        self.segment_bytes = self.journal_config.get('segment_mb', 64) * 1024 * 1024
+        self.fsync_every = self.journal_config.get('fsync_every', 100)
+        self._lock = threading.Lock()
+        self._file = None
+        self._segment = 0
+        self._unsynced = 0
+
+    def _segments(self) -> List[str]:
+        """Segmentos existentes, en orden de escritura."""
+        return sorted(glob.glob(os.path.join(self.directory, SEGMENT_PATTERN.replace('{:06d}', '*'))))
+
+    def _open_segment(self) -> None:
+        """Abre el siguiente segmento para agregar líneas."""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        if not self._segment:
+            existing = self._segments()
+            self._segment = int(os.path.basename(existing[-1])[8:14]) if existing else 0
+        self._segment += 1
+        self._file = open(os.path.join(self.directory, SEGMENT_PATTERN.format(self._segment)), 'a', encoding='utf-8')
+
+    def _sync(self) -> None:
+        """Fuerza a disco lo escrito desde el último fsync."""
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def _append(self, entry: Dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._file is None or self._file.tell() >= self.segment_bytes:
+                self._open_segment()
+            self._file.write(line)
+            # flush en cada línea: un crash del proceso no pierde nada; fsync periódico para cortes de energía
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                self._sync()
+
+    def append_record(self, record: Dict) -> None:
+        """Agrega un registro extraído."""
+        self._append({'id': str(record.get('id_negocio', '')), 'record': record})
+
+    def append_miss(self, business_id) -> None:
+        """Agrega un ID consultado que no existe (no hace falta volver a consultarlo)."""
+        self._append({'id': str(business_id), 'miss': True})
+
+    def replay(self) -> Tuple[List[Dict], Set[str]]:
+        """
+        Lee todos los segmentos.
+
+        Returns:
+            Tuple[List[Dict], Set[str]]: Registros recuperados (el último por ID) e IDs terminados.
+        """
+        records: Dict[str, Dict] = {}
+        completed: Set[str] = set()
+        discarded = 0
+        for segment in self._segments():
+            with open(segment, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        discarded += 1
+                        continue
+                    business_id = entry.get('id')
+                    if not business_id:
+                        continue
+                    completed.add(business_id)
+                    if 'record' in entry:
+                        records[business_id] = entry['record']
+        if discarded:
+            logger.warning(f"Se descartaron {discarded} líneas incompletas del journal {self.directory}")
+        logger.info(f"Journal {self.directory}: {len(records)} registros y {len(completed)} IDs terminados recuperados")
+        return list(records.values()), completed
+
+    def set_output_file(self, path) -> None:
+        """Registra el archivo de salida de la corrida."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, OUTPUT_MARKER), 'w', encoding='utf-8') as f:
+            f.write(str(path))
+
+    def output_file(self) -> Optional[str]:
+        """Archivo de salida registrado por la corrida interrumpida, si lo hay."""
+        try:
+            with open(os.path.join(self.directory, OUTPUT_MARKER), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def reset(self) -> None:
+        """Borra los segmentos y el archivo de salida registrado (al empezar una corrida nueva o al terminar una con éxito)."""
+        self.close()
+        for segment in self._segments():
+            os.remove(segment)
+        marker = os.path.join(self.directory, OUTPUT_MARKER)
+        if os.path.exists(marker):
+            os.remove(marker)
+        self._segment = 0
+
+    def close(self) -> None:
+        """Fuerza a disco y cierra el segmento abierto."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
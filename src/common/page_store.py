@@ -0,0 +1,212 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Aciertos acumulados antes de escribir sus last_access en una sola transacción
+ACCESS_FLUSH_EVERY = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    html BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id_negocio TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access);
+CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages (content_hash);
+"""
+
+
+class PageStore:
+    """
+    Caché en disco del HTML crudo de las páginas de detalle, compartida por todos los modos.
+
+    Cada página se guarda por `id_negocio` con su URL, fecha de descarga y hash del
+    contenido. El HTML se guarda comprimido con zlib y direccionado por su hash, por lo
+    que dos IDs con el mismo contenido comparten el blob. Las entradas vencen por TTL y,
+    al superar el tope de tamaño, se descartan las menos usadas recientemente (LRU).
+
+    Usa SQLite en modo WAL: varios procesos worker pueden leer y escribir a la vez.
+    Cada proceso e hilo abre su propia conexión (p. ej. el hilo productor de cada
+    pasada de BulkScraper.scrape_iter).
+    Las lecturas no escriben: el last_access de los aciertos se acumula en memoria y
+    se vuelca por lotes (cada ACCESS_FLUSH_EVERY aciertos, al depurar y al cerrar),
+    para no competir por el lock de escritura con los `put` de los otros workers.
+    """
+
+    def __init__(self, config: dict, path: Optional[str] = None, ttl: Optional[int] = None,
+                 max_mb: Optional[int] = None):
+        self.store_config = config['extractor'].get('page_store', {})
+        self.enabled = self.store_config.get('enabled', True)
+        self.path = path or self.store_config.get('path', 'data/cache/pages.sqlite3')
+        self.ttl = ttl if ttl is not None else self.store_config.get('ttl', 7 * 24 * 3600)
+        self.max_bytes = (max_mb if max_mb is not None else self.store_config.get('max_mb', 2048)) * 1024 * 1024
+        self._local = threading.local() # conexión (y PID que la abrió) de cada hilo
+        self._puts_since_evict = 0
+        self._pending_access: Dict[str, float] = {} # id_negocio -> último acceso aún no escrito
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'writes': 0, 'evicted': 0}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Conexión propia del proceso e hilo actuales (las conexiones SQLite no se comparten entre ellos)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, business_id: str, include_expired: bool = False) -> Optional[str]:
+        """
+        Retorna el HTML cacheado de un negocio, o None si no está o venció.
+
+        Args:
+            business_id: ID del negocio.
+            include_expired: Si es True, retorna la página aunque haya superado el TTL.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            row = self.conn.execute(
+                'SELECT p.fetched_at, b.html FROM pages p JOIN blobs b ON b.content_hash = p.content_hash '
+                'WHERE p.id_negocio = ?', (str(business_id),)).fetchone()
+            if row is None or (not include_expired and self.ttl and time.time() - row[0] > self.ttl):
+                self.stats['misses'] += 1
+                return None
+
+            self.stats['hits'] += 1
+            self._pending_access[str(business_id)] = time.time()
+            if len(self._pending_access) >= ACCESS_FLUSH_EVERY:
+                self.flush_access()
+            return zlib.decompress(row[1]).decode('utf-8')
+        except sqlite3.Error as e:
+            logger.warning(f"Error al leer la página {business_id} de la caché: {e}")
+            return None
+
+    def put(self, business_id: str, url: str, html: str) -> None:
+        """Guarda (o reemplaza) el HTML de un negocio."""
+        if not self.enabled or not html:
+            return
+
+        data = html.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        try:
+            with self.conn:
+                self.conn.execute('BEGIN IMMEDIATE')
+                exists = self.conn.execute('SELECT 1 FROM blobs WHERE content_hash = ?', (content_hash,)).fetchone()
+                if not exists:
+                    compressed = zlib.compress(data, 6)
+                    self.conn.execute('INSERT INTO blobs (content_hash, html, size) VALUES (?, ?, ?)',
+                                      (content_hash, compressed, len(compressed)))
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO pages (id_negocio, url, content_hash, fetched_at, last_access) '
+                    'VALUES (?, ?, ?, ?, ?)', (str(business_id), url, content_hash, now, now))
+            self.stats['writes'] += 1
+        except sqlite3.Error as e:
+            logger.warning(f"Error al guardar la página {business_id} en la caché: {e}")
+            return
+
+        # El tope de tamaño se revisa cada tanto, no en cada escritura
+        self._puts_since_evict += 1
+        if self._puts_since_evict >= 500:
+            self._puts_since_evict = 0
+            self.evict()
+
+    def flush_access(self) -> None:
+        """Escribe en una sola transacción los last_access acumulados por los aciertos."""
+        pending, self._pending_access = self._pending_access, {}
+        if not pending:
+            return
+        try:
+            with self.conn:
+                self.conn.execute('BEGIN IMMEDIATE')
+                self.conn.executemany('UPDATE pages SET last_access = ? WHERE id_negocio = ? AND last_access < ?',
+                                      ((accessed_at, business_id, accessed_at)
+                                       for business_id, accessed_at in pending.items()))
+        except sqlite3.Error as e:
+            # Solo afecta el orden de descarte LRU: no vale la pena reintentar
+            logger.debug(f"No se pudieron registrar {len(pending)} accesos a la caché de páginas: {e}")
+
+    def iter_pages(self, include_expired: bool = True) -> Iterator[Tuple[str, str, str, float]]:
+        """
+        Recorre las páginas cacheadas sin tocar la red.
+
+        Yields:
+            Tuple[str, str, str, float]: id_negocio, url, HTML y fecha de descarga (epoch).
+        """
+        query = ('SELECT p.id_negocio, p.url, b.html, p.fetched_at FROM pages p '
+                 'JOIN blobs b ON b.content_hash = p.content_hash')
+        params: tuple = ()
+        if not include_expired and self.ttl:
+            query += ' WHERE p.fetched_at >= ?'
+            params = (time.time() - self.ttl,)
+        for business_id, url, html, fetched_at in self.conn.execute(query, params):
+            yield business_id, url, zlib.decompress(html).decode('utf-8'), fetched_at
+
+    def evict(self) -> int:
+        """
+        Elimina las páginas vencidas y, si se supera el tope de tamaño, las menos usadas.
+
+        Returns:
+            int: Cantidad de páginas eliminadas.
+        """
+        removed = 0
+        # El orden LRU tiene que ver los accesos acumulados
+        self.flush_access()
+        try:
+            with self.conn:
+                self.conn.execute('BEGIN IMMEDIATE')
+                if self.ttl:
+                    removed += self.conn.execute('DELETE FROM pages WHERE fetched_at < ?',
+                                                 (time.time() - self.ttl,)).rowcount
+                self._delete_orphan_blobs()
+
+                total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+                while total > self.max_bytes:
+                    # Descartar por lotes las páginas con acceso más antiguo
+                    batch = self.conn.execute(
+                        'SELECT id_negocio FROM pages ORDER BY last_access LIMIT 200').fetchall()
+                    if not batch:
+                        break
+                    self.conn.executemany('DELETE FROM pages WHERE id_negocio = ?', batch)
+                    removed += len(batch)
+                    self._delete_orphan_blobs()
+                    total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Error al depurar la caché de páginas: {e}")
+
+        if removed:
+            self.stats['evicted'] += removed
+            logger.info(f"Caché de páginas: {removed} páginas eliminadas por TTL o tamaño.")
+        return removed
+
+    def _delete_orphan_blobs(self) -> None:
+        """Elimina los blobs que ya no referencia ninguna página."""
+        self.conn.execute('DELETE FROM blobs WHERE content_hash NOT IN (SELECT content_hash FROM pages)')
+
+    def close(self) -> None:
+        """Vuelca los accesos pendientes y cierra la conexión del hilo actual."""
+        self.flush_access()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.conn = None
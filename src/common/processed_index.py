@@ -0,0 +1,134 @@
+import fcntl
+import logging
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessedIdIndex:
+    """
+    Índice persistente de IDs de negocio ya procesados: un bit por ID en un archivo
+    mapeado en memoria.
+
+    Abrirlo es O(1) sin importar el tamaño del historial, y todos los procesos worker
+    comparten las mismas páginas a través del mmap. Las escrituras se hacen bajo un
+    lock exclusivo (flock) y solo encienden bits, por lo que un lector nunca ve un
+    estado intermedio inconsistente.
+    """
+
+    def __init__(self, config: dict, path: Optional[str] = None, csv_path: Optional[str] = None):
+        index_config = config['extractor'].get('processed_index', {})
+        self.path = path or index_config.get('path', 'data/cache/processed_ids.bitmap')
+        self.csv_path = csv_path or index_config.get('csv_path', 'data/guiaCores_leads.csv')
+        self.lock_path = f"{self.path}.lock"
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+        if not os.path.exists(self.path):
+            self._bootstrap_from_csv()
+        self._remap()
+
+    @contextmanager
+    def _locked(self):
+        """Lock exclusivo entre procesos para modificar el índice."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _remap(self) -> None:
+        """(Re)mapea el archivo del índice en modo solo lectura."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _bootstrap_from_csv(self) -> None:
+        """Construye el índice una única vez a partir del CSV de leads existente."""
+        with self._locked():
+            if os.path.exists(self.path):
+                return # Otro proceso lo construyó mientras esperábamos el lock
+            ids = []
+            if os.path.exists(self.csv_path):
+                try:
+                    df = pd.read_csv(self.csv_path, usecols=['id_negocio'], dtype={'id_negocio': str})
+                    ids = list(df['id_negocio'].dropna())
+                except (pd.errors.EmptyDataError, ValueError) as e:
+                    logger.warning(f"No se pudieron leer IDs de {self.csv_path}: {e}")
+            self._write_bits(ids)
+            logger.info(f"Índice de IDs procesados creado en {self.path} a partir de {len(ids)} filas de {self.csv_path}")
+
+    @staticmethod
+    def _as_int(business_id) -> Optional[int]:
+        """Convierte el ID a entero; los IDs no numéricos no se indexan."""
+        try:
+            value = int(str(business_id).strip())
+            return value if value >= 0 else None
+        except (TypeError, ValueError):
+            return None
+
+    def contains(self, business_id) -> bool:
+        """Indica si el ID ya fue procesado."""
+        value = self._as_int(business_id)
+        if value is None:
+            return False
+        byte = value >> 3
+        if self._map is None or byte >= len(self._map):
+            # El índice pudo crecer desde que se mapeó
+            if os.path.exists(self.path) and (self._map is None or os.path.getsize(self.path) > len(self._map)):
+                self._remap()
+            if self._map is None or byte >= len(self._map):
+                return False
+        return bool(self._map[byte] & (1 << (value & 7)))
+
+    __contains__ = contains
+
+    def add_many(self, business_ids: Iterable) -> None:
+        """Marca IDs como procesados de forma atómica respecto de otros procesos."""
+        with self._locked():
+            self._write_bits(business_ids)
+        self._remap()
+
+    def _write_bits(self, business_ids: Iterable) -> None:
+        """Enciende los bits de los IDs en el archivo (el llamador debe tener el lock)."""
+        values = [v for v in (self._as_int(b) for b in business_ids) if v is not None]
+        if not values and os.path.exists(self.path):
+            return
+
+        needed = (max(values) >> 3) + 1 if values else 0
+        mode = 'r+b' if os.path.exists(self.path) else 'w+b'
+        with open(self.path, mode) as f:
+            size = os.fstat(f.fileno()).st_size
+            if needed > size:
+                f.truncate(needed)
+                size = needed
+            if not size:
+                return
+            with mmap.mmap(f.fileno(), size) as bitmap:
+                for value in values:
+                    bitmap[value >> 3] |= 1 << (value & 7)
+                bitmap.flush()
+
+    def close(self) -> None:
+        """Libera el mapeo del archivo."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,172 @@
+import logging
+import multiprocessing as mp
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Respuestas que indican que el sitio nos está frenando (además de los timeouts)
+CONGESTION_STATUSES = {429, 500, 502, 503, 504}
+
+
+def is_congestion(status_code: Optional[int]) -> bool:
+    """Indica si una respuesta (o None, por timeout o error de red) es una señal de congestión."""
+    return status_code is None or status_code in CONGESTION_STATUSES
+
+
+class SharedRateLimiter:
+    """
+    Token bucket global compartido por todos los procesos de una corrida, con control AIMD.
+
+    El estado (tokens, tasa y contadores de la ventana) vive en memoria compartida de
+    multiprocessing, así que el límite de requests por segundo es uno solo para el
+    proceso principal y todos los workers. Se pasa a los workers por el initializer
+    del pool (ver install_rate_limiter).
+
+    Cada `window` respuestas observadas se ajusta la tasa:
+    - si la proporción de errores (429, 5xx, timeouts) supera max_error_rate o la
+      latencia media supera latency_target, la tasa se multiplica por multiplicative_decrease;
+    - si no, se suma additive_increase.
+    Así cada corrida converge sola a la mayor tasa que el sitio tolera.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, min_rate: float = 0.5, max_rate: float = 50.0,
+                 window: int = 50, additive_increase: float = 0.5, multiplicative_decrease: float = 0.5,
+                 max_error_rate: float = 0.05, latency_target: float = 3.0):
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.window = max(1, window)
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.max_error_rate = max_error_rate
+        self.latency_target = latency_target
+
+        self._lock = mp.Lock()
+        self._rate = mp.RawValue('d', min(max(rate, min_rate), max_rate))
+        self._tokens = mp.RawValue('d', float(self.burst))
+        self._updated_at = mp.RawValue('d', time.monotonic())
+        self._observed = mp.RawValue('i', 0)
+        self._errors = mp.RawValue('i', 0)
+        self._latency_sum = mp.RawValue('d', 0.0)
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['SharedRateLimiter']:
+        """Crea el limitador desde EXTRACTOR_CONFIG['rate_limit'], o None si está deshabilitado."""
+        limit_config = config['extractor'].get('rate_limit', {})
+        if not limit_config.get('enabled', True):
+            return None
+        return cls(
+            rate=limit_config.get('initial_rate', 5.0),
+            burst=limit_config.get('burst', 10),
+            min_rate=limit_config.get('min_rate', 0.5),
+            max_rate=limit_config.get('max_rate', 50.0),
+            window=limit_config.get('window', 50),
+            additive_increase=limit_config.get('additive_increase', 0.5),
+            multiplicative_decrease=limit_config.get('multiplicative_decrease', 0.5),
+            max_error_rate=limit_config.get('max_error_rate', 0.05),
+            latency_target=limit_config.get('latency_target', 3.0),
+        )
+
+    @property
+    def rate(self) -> float:
+        """Tasa actual en requests por segundo."""
+        return self._rate.value
+
+    def acquire(self) -> None:
+        """Espera hasta que haya un token disponible en el bucket global y lo consume."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                rate = self._rate.value
+                tokens = min(self.burst, self._tokens.value + (now - self._updated_at.value) * rate)
+                self._updated_at.value = now
+                if tokens >= 1:
+                    self._tokens.value = tokens - 1
+                    return
+                self._tokens.value = tokens
+                delay = (1 - tokens) / rate
+            time.sleep(delay)
+
+    def record(self, latency: float, status_code: Optional[int]) -> None:
+        """
+        Registra el resultado de un request y ajusta la tasa al completar una ventana.
+
+        Args:
+            latency: Segundos que tardó el request.
+            status_code: Código HTTP, o None si hubo timeout o error de red.
+        """
+        with self._lock:
+            self._observed.value += 1
+            self._latency_sum.value += latency
+            if is_congestion(status_code):
+                self._errors.value += 1
+            if self._observed.value >= self.window:
+                self._adjust()
+
+    def _adjust(self) -> None:
+        """Aplica AIMD sobre la ventana observada (el llamador debe tener el lock)."""
+        observed = self._observed.value
+        error_rate = self._errors.value / observed
+        mean_latency = self._latency_sum.value / observed
+        rate = self._rate.value
+
+        if error_rate > self.max_error_rate or mean_latency > self.latency_target:
+            new_rate = max(self.min_rate, rate * self.multiplicative_decrease)
+            logger.info(f"Rate limit: {rate:.2f} -> {new_rate:.2f} req/s "
+                        f"(errores {error_rate:.0%}, latencia media {mean_latency:.2f}s)")
+        else:
+            new_rate = min(self.max_rate, rate + self.additive_increase)
+            logger.debug(f"Rate limit: {rate:.2f} -> {new_rate:.2f} req/s "
+                         f"(errores {error_rate:.0%}, latencia media {mean_latency:.2f}s)")
+
+        self._rate.value = new_rate
+        self._observed.value = 0
+        self._errors.value = 0
+        self._latency_sum.value = 0.0
+
+
+# --- Limitador del proceso ---
+# El proceso principal crea el limitador y lo pasa a los workers en el initializer
+# del pool; cada proceso lo registra aquí para que HttpFetcher y los scrapers lo usen.
+
+_process_limiter: Optional[SharedRateLimiter] = None
+
+
+def install_rate_limiter(limiter: Optional[SharedRateLimiter]) -> None:
+    """Registra el limitador compartido en el proceso actual."""
+    global _process_limiter
+    _process_limiter = limiter
+
+
+def get_rate_limiter(config: Optional[dict] = None) -> Optional[SharedRateLimiter]:
+    """
+    Retorna el limitador del proceso. Si no hay uno y se pasa config, lo crea y lo
+    registra (pensado para el proceso principal, antes de crear los pools).
+    """
+    global _process_limiter
+    if _process_limiter is None and config is not None:
+        _process_limiter = SharedRateLimiter.from_config(config)
+    return _process_limiter
+
+
+@contextmanager
+def throttled() -> Iterator[None]:
+    """
+    Envuelve una carga de página (p. ej. driver.get) con el limitador del proceso:
+    espera un token antes y registra la latencia después. Si el bloque lanza una
+    excepción (timeout de carga, error del driver) se registra como congestión.
+    """
+    limiter = get_rate_limiter()
+    if limiter is None:
+        yield
+        return
+    limiter.acquire()
+    started = time.monotonic()
+    status_code = None
+    try:
+        yield
+        status_code = 200
+    finally:
+        limiter.record(time.monotonic() - started, status_code)
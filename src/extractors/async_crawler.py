@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from ..common.rate_limiter import get_rate_limiter
+from .bulk_scraper import ScrapeCancelled
+from .http_fetcher import DEFAULT_USER_AGENT, has_detail_content, is_confirmed_miss
+
+logger = logging.getLogger(__name__)
+
+# Respuestas ante las que conviene reintentar la descarga
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket para asyncio: limita la tasa de requests a `rate` por segundo con ráfagas de hasta `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Espera hasta que haya un token disponible y lo consume."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncDetailCrawler:
+    """
+    Crawler asíncrono de páginas de detalle para el modo bulk.
+
+    Mantiene cientos de requests en vuelo desde un único proceso, con un token
+    bucket por host, deadline por request y reintentos con backoff aleatorio.
+    El HTML se parsea con los helpers `_extract_*` de BulkScraper. Todo lo que bloquea
+    (parsing, caché de páginas en SQLite, journal y entrega de registros) corre en un
+    pool de hilos para no frenar el event loop.
+    """
+
+    def __init__(self, config: dict, scraper):
+        """
+        Args:
+            config: Configuración del proyecto.
+            scraper: Instancia de BulkScraper cuyos helpers de parsing se reutilizan.
+        """
+        self.config = config
+        self.scraper = scraper
+        self.async_config = self.config['extractor'].get('async', {})
+        self.max_in_flight = self.async_config.get('max_in_flight', 200)
+        self.rate_per_host = self.async_config.get('rate_per_host', 50)
+        self.burst = self.async_config.get('burst', 100)
+        self.request_deadline = self.async_config.get('request_deadline', 20)
+        self.max_retries = self.async_config.get('max_retries', 3)
+        self.backoff_base = self.async_config.get('backoff_base', 0.5)
+        self.backoff_max = self.async_config.get('backoff_max', 10)
+        self.io_workers = self.async_config.get('io_workers', 4)
+        self.user_agent = self.config['extractor'].get('http', {}).get('user_agent', DEFAULT_USER_AGENT)
+        # El limitador global aporta el control AIMD: la tasa de cada host sigue a la suya
+        self.rate_limiter = get_rate_limiter(config)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._deliver_lock = threading.Lock()  # journal, sink y stats del scraper se tocan de a un hilo
+        self.stats = {
+            'requests': 0,
+            'cached': 0,
+            'retries': 0,
+            'timeouts': 0,
+            'missing': 0,
+            'failed': 0,
+            'records': 0,
+        }
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        """Retorna el token bucket del host de la URL."""
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return self._buckets[host]
+
+    def _backoff(self, attempt: int) -> float:
+        """Backoff exponencial con jitter completo."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _observe(self, bucket: TokenBucket, latency: float, status_code: Optional[int]) -> None:
+        """Informa el resultado al limitador global y ajusta la tasa del host a la que este decida."""
+        if self.rate_limiter is None:
+            return
+        self.rate_limiter.record(latency, status_code)
+        bucket.rate = min(self.rate_per_host, self.rate_limiter.rate)
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        """
+        Descarga una página respetando el rate limit del host y el deadline por request.
+
+        Returns:
+            Optional[str]: HTML de la página, '' si no existe, o None si falló o se agotaron los reintentos.
+        """
+        bucket = self._bucket_for(url)
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._backoff(attempt))
+
+            await bucket.acquire()
+            self.stats['requests'] += 1
+            started = time.monotonic()
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.request_deadline)) as response:
+                    self._observe(bucket, time.monotonic() - started, response.status)
+                    if response.status in (404, 410):
+                        return ''
+                    if response.status in RETRYABLE_STATUSES:
+                        logger.debug(f"HTTP {response.status} en {url} (intento {attempt + 1})")
+                        continue
+                    if response.status >= 400:
+                        logger.warning(f"HTTP {response.status} al descargar {url}")
+                        self.stats['failed'] += 1
+                        return None
+                    return await response.text()
+            except asyncio.TimeoutError:
+                self.stats['timeouts'] += 1
+                self._observe(bucket, time.monotonic() - started, None)
+                logger.debug(f"Deadline de {self.request_deadline}s superado en {url} (intento {attempt + 1})")
+            except aiohttp.ClientError as e:
+                self._observe(bucket, time.monotonic() - started, None)
+                logger.debug(f"Error de red en {url} (intento {attempt + 1}): {e}")
+
+        logger.warning(f"Reintentos agotados para {url}")
+        self.stats['failed'] += 1
+        return None
+
+    def _process_page(self, url: str, business_id: str, html: str, from_cache: bool, results: List[Dict]) -> str:
+        """
+        Parsea una página descargada (o de la caché) y entrega el registro o el ID inexistente.
+        Corre en el pool de hilos: bloquea en BeautifulSoup, SQLite y el sink.
+
+        Returns:
+            str: 'records', 'missing' o 'failed', la estadística que corresponde a la página.
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        if not has_detail_content(soup):
+            # _fetch da '' solo ante 404/410; cualquier otra página sin datos debe tener el encabezado del sitio
+            if not is_confirmed_miss(404 if not html else 200, soup):
+                logger.warning(f"Página sin datos del negocio ni encabezado del sitio: {url}")
+                return 'failed'
+            with self._deliver_lock:
+                self.scraper._add_miss(url)
+            return 'missing'
+
+        if not from_cache:
+            self.scraper.page_store.put(business_id, url, html)
+        record = self.scraper._build_business_info(soup, url)
+        with self._deliver_lock:
+            self.scraper._add_result(results, record)
+        return 'records'
+
+    async def _worker(self, session: aiohttp.ClientSession, queue: asyncio.Queue, results: List[Dict]) -> None:
+        """Consume URLs de la cola y descarga cada página; el resto del trabajo va al pool de hilos."""
+        loop = asyncio.get_running_loop()
+        while True:
+            url = await queue.get()
+            try:
+                if url is None:
+                    return
+                business_id = self.scraper._business_id_from_url(url)
+                html = await loop.run_in_executor(self._executor, self.scraper.page_store.get, business_id)
+                from_cache = html is not None
+                if from_cache:
+                    self.stats['cached'] += 1
+                else:
+                    html = await self._fetch(session, url)
+                    if html is None:
+                        continue
+
+                outcome = await loop.run_in_executor(
+                    self._executor, self._process_page, url, business_id, html, from_cache, results)
+                self.stats[outcome] += 1
+            except ScrapeCancelled:
+                raise
+            except Exception as e:
+                logger.error(f"Error procesando {url}: {e}", exc_info=True)
+                self.stats['failed'] += 1
+            finally:
+                queue.task_done()
+
+    async def crawl(self, urls: Iterable[str]) -> List[Dict]:
+        """Descarga y parsea todas las URLs con hasta max_in_flight requests simultáneos."""
+        results: List[Dict] = []
+        # Cola acotada: las URLs se encolan a medida que hay lugar, sin materializar el rango completo
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_in_flight * 2)
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, ttl_dns_cache=300)
+        headers = {
+            'User-Agent': self.user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'es-AR,es;q=0.9',
+        }
+
+        self._executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix='async-io')
+        try:
+            async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+                workers = [asyncio.create_task(self._worker(session, queue, results))
+                           for _ in range(self.max_in_flight)]
+
+                async def feed() -> None:
+                    for url in urls:
+                        await queue.put(url)
+                    for _ in workers:
+                        await queue.put(None)
+
+                # Si un worker falla (p. ej. ScrapeCancelled) gather lo propaga enseguida;
+                # asyncio.run cancela luego las tareas que sigan pendientes
+                await asyncio.gather(feed(), *workers)
+        finally:
+            # Sin esperar: tras una cancelación puede haber entregas bloqueadas en un sink que ya no consume nadie
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        return results
+
+    def run(self, urls: Iterable[str]) -> List[Dict]:
+        """Ejecuta el crawl en un event loop nuevo y retorna los registros extraídos."""
+        start = time.monotonic()
+        results = asyncio.run(self.crawl(urls))
+        elapsed = time.monotonic() - start
+        logger.info(
+            f"Crawl asíncrono finalizado en {elapsed:.1f}s: {self.stats['records']} registros, "
+            f"{self.stats['cached']} desde caché, {self.stats['requests']} requests, {self.stats['retries']} reintentos, "
+            f"{self.stats['timeouts']} timeouts, {self.stats['missing']} inexistentes, {self.stats['failed']} fallidos")
+        return results
@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import Iterable, Iterator, List
 from ..common.config import get_config
 
 # Configurar logging
@@ -24,6 +24,30 @@ class BulkCollector:
         self.chunk_size = self.bulk_config['chunk_size']
         self.base_url = self.bulk_config['base_url']
         
+    def iter_urls(self) -> Iterator[str]:
+        """
+        Genera las URLs del rango de IDs de forma perezosa, sin materializar la lista completa.
+
+        Returns:
+            Iterator[str]: URLs de detalle de cada ID del rango
+        """
+        logger.info(f"Generando URLs para IDs desde {self.start_id} hasta {self.end_id} ({self.count()} IDs)")
+        return self.urls_for_ids(range(self.start_id, self.end_id + 1))
+
+    def urls_for_ids(self, ids: Iterable[int]) -> Iterator[str]:
+        """
+        Genera de forma perezosa las URLs de detalle de una secuencia arbitraria de IDs
+
+        Yields:
+            str: URL de detalle de cada ID
+        """
+        for business_id in ids:
+            yield f"{self.base_url}{business_id}"
+
+    def count(self) -> int:
+        """Cantidad de IDs del rango"""
+        return max(0, self.end_id - self.start_id + 1)
+
     def generate_urls(self) -> List[str]:
         """
         Genera una lista de URLs basadas en un rango de IDs
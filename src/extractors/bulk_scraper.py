@@ -1,20 +1,27 @@
-import time
-import random
 import logging
-from typing import List, Dict, Optional
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import queue
+import threading
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 import urllib.parse
 import re
 from datetime import datetime
 
+from ..common.journal import ResultJournal
+from ..common.page_store import PageStore
+from ..common.rate_limiter import SharedRateLimiter, get_rate_limiter, install_rate_limiter, throttled
+from .driver_factory import create_driver
+from .driver_pool import init_worker_driver, get_worker_driver
+from .multi_tab import DETAIL_READY_SELECTOR, TabPool, tab_pool_for
+from .http_fetcher import SITE_LAYOUT_SELECTOR, HttpFetcher, has_detail_content, is_confirmed_miss
+from .js_extractor import extract_record, page_is_missing
+from .waits import DEFAULT_POLL_INTERVAL, PacingPolicy, wait_for_dom_settle, wait_for_selector
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,86 +33,167 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Instancia de BulkScraper propia de cada proceso worker (creada por _init_worker)
+_worker_scraper: Optional['BulkScraper'] = None
+
+
+class ScrapeCancelled(Exception):
+    """El consumidor de scrape_iter abandonó el generador: los motores deben dejar de enviar trabajo."""
+
+
+class PageMissing(Exception):
+    """La página de detalle cargada en el navegador confirma que el negocio no existe."""
+
 
 class BulkScraper:
     """Scraper para el modo bulk que procesa URLs en paralelo"""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, engine: Optional[str] = None):
         self.config = config
         self.bulk_config = self.config['extractor']['bulk']
         self.max_workers = self.bulk_config.get('max_workers', 4)
         self.timeout = self.bulk_config.get('timeout', 30)
+        self.driver_max_pages = self.bulk_config.get('driver_max_pages', 0)
+        self.driver_max_rss_mb = self.bulk_config.get('driver_max_rss_mb', 0)
+        # Motor de descarga de páginas de detalle: 'http' (por defecto), 'async', 'selenium' o 'tabs'
+        self.engine = engine or self.bulk_config.get('engine', 'http')
+        self.tabs_config = self.config['extractor'].get('tabs', {})
+        # Pestañas del driver del worker (motor 'tabs'); se recrean si el driver se recicla
+        self._tabs: Optional[TabPool] = None
+        self.selenium_fallback = self.bulk_config.get('selenium_fallback', True)
+        # Extracción en los motores con navegador: 'soup' (page_source + BeautifulSoup) o 'js' (en la página)
+        self.extraction = self.bulk_config.get('extraction', 'soup')
+        self.waits_config = self.config['extractor'].get('waits', {})
+        self.pacing = PacingPolicy.from_config(self.config, 'detail')
+        self.page_store = PageStore(self.config)
+        # Journal de resultados (opcional): cada registro se escribe a disco apenas llega
+        self.journal: Optional[ResultJournal] = None
+        # Destino de los registros en modo streaming (scrape_iter); None acumula en listas
+        self._sink: Optional[Callable[[Dict], None]] = None
+        # Receptor opcional de los IDs inexistentes confirmados (ver scrape_iter)
+        self._miss_sink: Optional[Callable[[str], None]] = None
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        """Estadísticas de una ejecución de scrape_urls"""
+        return {
+            'urls': 0,
+            'records': 0,
+            'http_pages': 0,
+            'cached_pages': 0,
+            'selenium_fallbacks': 0,
+            'drivers_started': 0,
+            'pages_served': 0,
+        }
 
     def _setup_driver(self) -> webdriver.Chrome:
         """Configura y retorna un driver de Chrome para el worker"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-notifications')
-            chrome_options.add_argument('--disable-infobars')
-            chrome_options.add_argument('--disable-popup-blocking')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-            service = Service()
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            driver.set_page_load_timeout(self.timeout)
-            return driver
+            profile = self.config['extractor'].get('driver', {}).get('detail_profile', 'lean')
+            return create_driver(self.config, profile, page_load_timeout=self.timeout,
+                                 multi_tab=self.engine == 'tabs')
 
         except Exception as e:
             logger.error(f"Error al configurar el driver de Chrome: {e}")
             raise
 
+    @staticmethod
+    def _business_id_from_url(url: str) -> str:
+        """Obtiene el ID del negocio a partir de su URL de detalle"""
+        return url.split('id=')[-1] if 'id=' in url else url.split('/')[-1]
+
+    def parse_business_html(self, html: str, url: str) -> Dict:
+        """Construye el registro de un negocio a partir del HTML de su página de detalle"""
+        return self._build_business_info(BeautifulSoup(html, 'html.parser'), url)
+
+    def _build_business_info_in_browser(self, driver: webdriver.Chrome, url: str) -> Dict:
+        """
+        Construye el registro extrayendo los campos en el navegador (js_extractor), sin
+        transferir page_source ni parsearlo. Da los mismos campos que _build_business_info.
+        """
+        info = {
+            'id_negocio': self._business_id_from_url(url),
+            'url': url,
+            'fecha_extraccion': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        info.update(extract_record(driver))
+        return info
+
+    def _build_business_info(self, soup: BeautifulSoup, url: str) -> Dict:
+        """Construye el registro de un negocio a partir de la página de detalle ya parseada"""
+        business_id = self._business_id_from_url(url)
+
+        # Extraer información básica
+        info = {
+            'id_negocio': business_id,
+            'url': url,
+            'fecha_extraccion': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'nombre': self._extract_text(soup, 'a.search-result-name h1'),
+            'direccion': self._extract_text(soup, 'span.search-result-address'),
+            'telefonos': self._extract_phones(soup),
+            'whatsapp': self._extract_whatsapp(soup),
+            'sitio_web': self._extract_website(soup),
+            'email': self._extract_email(soup),
+            'facebook': self._extract_social(soup, 'facebook.com'),
+            'instagram': self._extract_social(soup, 'instagram.com'),
+            'horarios': self._extract_hours(soup),
+            'rubros': self._extract_categories(soup),
+            'descripcion': self._extract_text(soup, 'div.search-result-description'),
+            'servicios': 'N/A',  # Placeholder
+            'latitud': self._extract_coordinates(soup, 'data-lat'),
+            'longitud': self._extract_coordinates(soup, 'data-lng')
+        }
+
+        logger.info(f"Información extraída para ID {business_id}: {info['nombre']}")
+        return info
+
     def _extract_business_info(self, driver: webdriver.Chrome, url: str) -> Optional[Dict]:
-        """Extrae información de un negocio desde su URL"""
+        """
+        Extrae información de un negocio desde su URL
+
+        Raises:
+            PageMissing: Si la página confirma que el negocio no existe (ver is_confirmed_miss).
+        """
         try:
-            driver.get(url)
-            business_id = url.split('id=')[-1] if 'id=' in url else url.split('/')[
-                -1]
+            business_id = self._business_id_from_url(url)
+            cached_html = self.page_store.get(business_id)
+            if cached_html is not None:
+                return self.parse_business_html(cached_html, url)
+
+            self.pacing.wait()
+            with throttled():
+                driver.get(url)
 
-            # Esperar elementos clave
+            # Esperar elementos clave, o el encabezado del sitio: una página inexistente no espera el timeout
             try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'a.search-result-name h1, span.search-result-address')))
+                wait_for_selector(driver, f"{DETAIL_READY_SELECTOR}, {SITE_LAYOUT_SELECTOR}", 10,
+                                  self.waits_config.get('poll_interval', DEFAULT_POLL_INTERVAL))
             except TimeoutException:
                 logger.warning(
                     f"Timeout o elementos clave no encontrados para ID {business_id}")
                 return None
 
-            # Pequeña pausa aleatoria
-            time.sleep(random.uniform(1, 2))
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            # Extraer información básica
-            info = {
-                'id_negocio': business_id,
-                'url': url,
-                'fecha_extraccion': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'nombre': self._extract_text(soup, 'a.search-result-name h1'),
-                'direccion': self._extract_text(soup, 'span.search-result-address'),
-                'telefonos': self._extract_phones(soup),
-                'whatsapp': self._extract_whatsapp(soup),
-                'sitio_web': self._extract_website(soup),
-                'email': self._extract_email(soup),
-                'facebook': self._extract_social(soup, 'facebook.com'),
-                'instagram': self._extract_social(soup, 'instagram.com'),
-                'horarios': self._extract_hours(soup),
-                'rubros': self._extract_categories(soup),
-                'descripcion': self._extract_text(soup, 'div.search-result-description'),
-                'servicios': 'N/A',  # Placeholder
-                'latitud': self._extract_coordinates(soup, 'data-lat'),
-                'longitud': self._extract_coordinates(soup, 'data-lng')
-            }
-
-            logger.info(f"Información extraída para ID {business_id}: {info['nombre']}")
-            return info
+            # Esperar a que termine de renderizarse el contenido dinámico
+            wait_for_dom_settle(driver, self.waits_config.get('dom_quiet_ms', 150))
 
+            if not driver.find_elements(By.CSS_SELECTOR, DETAIL_READY_SELECTOR):
+                if page_is_missing(driver):
+                    raise PageMissing(url)
+                logger.warning(f"Página sin datos del negocio para ID {business_id}")
+                return None
+
+            if self.extraction == 'js':
+                # Sin HTML no hay nada que guardar en la caché de páginas
+                return self._build_business_info_in_browser(driver, url)
+
+            html = driver.page_source
+            self.page_store.put(business_id, url, html)
+            return self.parse_business_html(html, url)
+
+        except (WebDriverException, PageMissing):
+            # Errores del propio driver (timeout de carga, sesión caída): el worker debe reciclarlo
+            raise
         except Exception as e:
             logger.error(f"Error al extraer información de {url}: {e}")
             return None
@@ -192,74 +280,409 @@ class BulkScraper:
         return map_element.get(attr, 'N/A') if map_element else 'N/A'
 
     @staticmethod
-    def _scrape_single_url_worker(url: str, config: dict) -> Optional[Dict]:
-        """Procesa una única URL, extrayendo información y manejando el driver."""
-        driver = None
-        try:
-            # Configurar el driver para este worker
-            chrome_options = Options()
-            chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-notifications')
-            chrome_options.add_argument('--disable-infobars')
-            chrome_options.add_argument('--disable-popup-blocking')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-            service = Service()
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-
-            # BulkScraper instance for _extract_business_info
-            scraper = BulkScraper(config)  # Pass config to BulkScraper
-
-            info = scraper._extract_business_info(driver, url)
-            return info
+    def _init_worker(config: dict, rate_limiter: Optional[SharedRateLimiter] = None,
+                     engine: Optional[str] = None) -> None:
+        """Initializer del pool: prepara el scraper, el driver persistente y el limitador compartido del proceso worker."""
+        global _worker_scraper
+        install_rate_limiter(rate_limiter)
+        _worker_scraper = BulkScraper(config, engine=engine)
+        watchdog_config = config['extractor'].get('watchdog', {})
+        init_worker_driver(
+            _worker_scraper._setup_driver,
+            max_pages=_worker_scraper.driver_max_pages,
+            max_rss_mb=_worker_scraper.driver_max_rss_mb,
+            hang_timeout=watchdog_config.get('hang_timeout', 0),
+            check_interval=watchdog_config.get('check_interval', 5)
+        )
+
+    @staticmethod
+    def _scrape_single_url_worker(url: str) -> Tuple[Optional[Dict], bool, int, int]:
+        """
+        Procesa una única URL reutilizando el driver persistente del worker.
 
+        Returns:
+            Tuple[Optional[Dict], bool, int, int]: Información extraída (o None), si la
+            página confirmó que el negocio no existe, drivers iniciados y páginas servidas
+            durante esta tarea.
+        """
+        managed = get_worker_driver()
+        started_before = managed.stats['drivers_started']
+        served_before = managed.stats['pages_served']
+        info = None
+        missing = False
+
+        try:
+            # Si el driver se cuelga, el watchdog lo mata y la URL se reintenta con uno nuevo
+            info = managed.run(lambda driver: _worker_scraper._extract_business_info(driver, url), label=url,
+                               retries=_worker_scraper.config['extractor'].get('watchdog', {}).get('retries', 1))
+        except PageMissing:
+            managed.page_served()
+            missing = True
         except Exception as e:
             logger.error(f"Worker failed to process {url}: {e}", exc_info=True)
-            return None
-        finally:
-            if driver:
-                driver.quit()
-                logger.info("Worker finished and quit driver")
+            # El driver puede haber quedado en mal estado: se descarta y el próximo get() crea otro
+            managed.recycle()
+
+        return (info, missing,
+                managed.stats['drivers_started'] - started_before,
+                managed.stats['pages_served'] - served_before)
+
+    @staticmethod
+    def _scrape_tabs_chunk_worker(urls: List[str]) -> Tuple[List[Dict], List[str], List[str], int, int]:
+        """
+        Procesa un trozo de URLs en varias pestañas del driver persistente del worker.
+
+        Returns:
+            Tuple[List[Dict], List[str], List[str], int, int]: Registros extraídos, URLs de
+            páginas inexistentes (ver js_extractor.page_is_missing), URLs que quedaron sin
+            procesar (timeout o página de error en la pestaña, driver colgado o caído), drivers iniciados y
+            páginas servidas.
+        """
+        managed = get_worker_driver()
+        started_before = managed.stats['drivers_started']
+        served_before = managed.stats['pages_served']
+        results = []
+        misses = []
+        remaining = dict.fromkeys(urls)
+
+        try:
+            # Las páginas vigentes en la caché se parsean sin navegar
+            for url in urls:
+                cached_html = _worker_scraper.page_store.get(_worker_scraper._business_id_from_url(url))
+                if cached_html is not None:
+                    results.append(_worker_scraper.parse_business_html(cached_html, url))
+                    del remaining[url]
+
+            if remaining:
+                driver = managed.get()
+                tabs = _worker_scraper._tabs = tab_pool_for(driver, _worker_scraper.config, _worker_scraper._tabs)
+                in_browser = _worker_scraper.extraction == 'js'
+                # Con extracción 'js' cada pestaña entrega el registro ya armado en lugar del HTML
+                harvest = _worker_scraper._build_business_info_in_browser if in_browser else None
+                with managed.operation():
+                    for url, page in tabs.scrape(list(remaining), harvest=harvest):
+                        del remaining[url]
+                        managed.progress()
+                        managed.page_served()
+                        if page is None:
+                            misses.append(url)
+                            continue
+                        if in_browser:
+                            results.append(page)
+                            continue
+                        _worker_scraper.page_store.put(_worker_scraper._business_id_from_url(url), url, page)
+                        results.append(_worker_scraper.parse_business_html(page, url))
+        except Exception as e:
+            logger.error(f"Worker failed to process {len(remaining)} URLs in tabs: {e}", exc_info=True)
+            # El driver (o alguna pestaña) puede haber quedado en mal estado: el próximo trozo usa uno nuevo
+            managed.recycle()
+
+        return (results, misses, list(remaining),
+                managed.stats['drivers_started'] - started_before,
+                managed.stats['pages_served'] - served_before)
 
-    def scrape_urls(self, urls: List[str]) -> List[Dict]:
+    def scrape_urls(self, urls: Iterable[str]) -> List[Dict]:
         """
-        Procesa una lista de URLs en paralelo usando múltiples workers
+        Procesa URLs en paralelo usando múltiples workers
 
         Args:
-            urls (List[str]): Lista de URLs a procesar
+            urls (Iterable[str]): URLs a procesar. Puede ser un generador: se consume
+                a medida que se liberan lugares, sin materializar el rango completo.
 
         Returns:
             List[Dict]: Lista de diccionarios con la información extraída
         """
         try:
-            logger.info(
-                f"Iniciando scraping de {len(urls)} URLs con {self.max_workers} workers")
+            return self._run_engine(urls)
+        except Exception as e:
+            logger.error(f"Error en el proceso de scraping: {e}", exc_info=True)
+            return []
+
+    def _run_engine(self, urls: Iterable[str]) -> List[Dict]:
+        """Procesa las URLs con el motor configurado. A diferencia de scrape_urls, propaga los errores."""
+        logger.info(f"Iniciando scraping (motor: {self.engine})")
+
+        self.stats = self._empty_stats()
+        urls = self._counted(urls)
+
+        if self.engine == 'selenium':
+            all_results = self._scrape_with_selenium(urls)
+        elif self.engine == 'tabs':
+            all_results = self._scrape_with_tabs(urls)
+        elif self.engine == 'async':
+            all_results = self._scrape_with_async(urls)
+        else:
+            all_results = self._scrape_with_http(urls)
+
+        logger.info(
+            f"Scraping completado. Se extrajeron {self.stats['records']} registros de {self.stats['urls']} URLs. "
+            f"Páginas desde caché: {self.stats['cached_pages']}, "
+            f"páginas HTTP: {self.stats['http_pages']}, fallbacks a Selenium: {self.stats['selenium_fallbacks']}, "
+            f"drivers iniciados: {self.stats['drivers_started']}, páginas servidas por drivers: {self.stats['pages_served']}")
+        return all_results
+
+    def scrape_iter(self, urls: Iterable[str], buffer_size: int = 1000,
+                    on_miss: Optional[Callable[[str], None]] = None) -> Iterator[Dict]:
+        """
+        Versión streaming de scrape_urls: entrega cada registro apenas se extrae.
 
-            all_results = []
-            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                # Enviar cada URL individual como una tarea
-                futures = {executor.submit(BulkScraper._scrape_single_url_worker, url, self.config): url for url in urls}
+        El scraping corre en un hilo aparte y deja los registros en una cola acotada:
+        si el consumidor se atrasa, el scraping se frena. La memoria queda acotada
+        por buffer_size en lugar de crecer con la corrida.
 
-                for future in as_completed(futures):
-                    url = futures[future]
+        Args:
+            urls (Iterable[str]): URLs a procesar (puede ser un generador).
+            buffer_size (int): Registros en espera entre el scraping y el consumidor.
+            on_miss (Callable[[str], None]): Recibe el ID de cada página inexistente
+                confirmada (404/410 o sin datos del negocio). Las descargas fallidas no se informan.
+
+        Yields:
+            Dict: Registros con el mismo esquema que scrape_urls.
+
+        Raises:
+            Exception: El error que cortó el scraping (p. ej. BrokenProcessPool), una vez
+                entregados los registros previos: el consumidor no debe tomarlo como un fin normal.
+        """
+        done = object()
+        records: "queue.Queue" = queue.Queue(maxsize=buffer_size)
+        cancelled = threading.Event()
+        errors: List[BaseException] = []
+
+        def sink(record: Dict) -> None:
+            # put con timeout para notar si el consumidor abandonó el generador
+            while not cancelled.is_set():
+                try:
+                    records.put(record, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+            raise ScrapeCancelled("scrape_iter cancelado por el consumidor")
+
+        def produce() -> None:
+            try:
+                self._run_engine(urls)
+            except BaseException as exc:
+                if not cancelled.is_set():
+                    logger.error(f"Error en el proceso de scraping: {exc}", exc_info=True)
+                    errors.append(exc)
+            finally:
+                self._sink = None
+                self._miss_sink = None
+                records.put(done)
+
+        self._sink = sink
+        self._miss_sink = on_miss
+        producer = threading.Thread(target=produce, name='bulk-scrape-iter', daemon=True)
+        producer.start()
+        try:
+            while True:
+                record = records.get()
+                if record is done:
+                    break
+                yield record
+        finally:
+            cancelled.set()
+            # Liberar lugar por si el productor quedó bloqueado en el put final
+            while producer.is_alive():
+                try:
+                    records.get(timeout=0.5)
+                except queue.Empty:
+                    pass
+            producer.join()
+        if errors:
+            raise errors[0]
+
+    def _add_result(self, results: List[Dict], record: Dict) -> None:
+        """Escribe el registro al journal (si hay) y lo agrega a los resultados o lo entrega al consumidor en modo streaming"""
+        self.stats['records'] += 1
+        if self.journal is not None:
+            self.journal.append_record(record)
+        if self._sink is not None:
+            self._sink(record)
+        else:
+            results.append(record)
+
+    def _add_miss(self, url: str) -> None:
+        """Registra en el journal un ID que no existe, para no volver a consultarlo al retomar"""
+        business_id = self._business_id_from_url(url)
+        if self.journal is not None:
+            self.journal.append_miss(business_id)
+        if self._miss_sink is not None:
+            self._miss_sink(business_id)
+
+    def _counted(self, urls: Iterable[str]) -> Iterator[str]:
+        """Recorre las URLs contando en stats['urls'] las que se consumen"""
+        for url in urls:
+            self.stats['urls'] += 1
+            yield url
+
+    def _scrape_with_http(self, urls: Iterable[str]) -> List[Dict]:
+        """
+        Descarga las páginas de detalle por HTTP con una sesión keep-alive y las parsea
+        directamente. Las inexistentes confirmadas (ver is_confirmed_miss) se registran como
+        tales; el resto de las páginas sin el nombre del negocio se reintentan con Selenium.
+        """
+        results = []
+        fallback_urls = []
+
+        def pending_urls() -> Iterator[str]:
+            # Las páginas vigentes en la caché se parsean sin tocar la red
+            for url in urls:
+                cached_html = self.page_store.get(self._business_id_from_url(url))
+                if cached_html is None:
+                    yield url
+                else:
+                    self._add_result(results, self.parse_business_html(cached_html, url))
+                    self.stats['cached_pages'] += 1
+
+        with HttpFetcher(self.config) as fetcher:
+            logger.info(f"Descargando por HTTP con concurrencia {fetcher.max_concurrency}")
+            for url, response in fetcher.fetch_many(pending_urls()):
+                status_code = response.status_code if response is not None else None
+                soup = BeautifulSoup(response.text, 'html.parser') if status_code == 200 else None
+
+                if is_confirmed_miss(status_code, soup):
+                    # Inexistente confirmado: no se paga una carga de Selenium para volver a verlo
+                    logger.info(f"Página inexistente (HTTP {status_code}): {url}")
+                    self._add_miss(url)
+                    continue
+
+                if soup is None or not has_detail_content(soup):
+                    fallback_urls.append(url)
+                    continue
+
+                self.page_store.put(self._business_id_from_url(url), url, response.text)
+                self._add_result(results, self._build_business_info(soup, url))
+                self.stats['http_pages'] += 1
+
+        if fallback_urls:
+            if self.selenium_fallback:
+                logger.info(f"{len(fallback_urls)} páginas sin contenido por HTTP. Reintentando con Selenium.")
+                self.stats['selenium_fallbacks'] = len(fallback_urls)
+                results.extend(self._scrape_with_selenium(fallback_urls))
+            else:
+                logger.info(f"{len(fallback_urls)} páginas sin contenido por HTTP (fallback a Selenium deshabilitado).")
+
+        return results
+
+    def _scrape_with_async(self, urls: Iterable[str]) -> List[Dict]:
+        """Descarga y parsea las páginas con el crawler asíncrono desde un único proceso."""
+        from .async_crawler import AsyncDetailCrawler
+
+        crawler = AsyncDetailCrawler(self.config, self)
+        results = crawler.run(urls)
+        self.stats['http_pages'] = crawler.stats['records']
+        return results
+
+    def _scrape_with_selenium(self, urls: Iterable[str]) -> List[Dict]:
+        """
+        Procesa las URLs con un pool de procesos, cada uno con su driver persistente.
+        Solo se mantiene una ventana acotada de tareas en vuelo (max_in_flight por worker).
+        """
+        window = self.max_workers * self.bulk_config.get('max_in_flight_per_worker', 4)
+        logger.info(f"Scraping con Selenium con {self.max_workers} workers y hasta {window} tareas en vuelo")
+        results = []
+        url_iter = iter(urls)
+
+        # Cada worker crea su driver una sola vez en el initializer y lo reutiliza
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=BulkScraper._init_worker,
+                                 initargs=(self.config, get_rate_limiter(self.config))) as executor:
+            # Cada URL es una tarea, pero solo se envían las que entran en la ventana
+            futures = {executor.submit(BulkScraper._scrape_single_url_worker, url): url
+                       for url in islice(url_iter, window)}
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = futures.pop(future)
                     try:
-                        result = future.result()
-                        if result:
-                            all_results.append(result)
+                        result, missing, drivers_started, pages_served = future.result()
                     except Exception as exc:
                         logger.error(
                             f'An exception occurred while processing {url}: {exc}')
-
-            logger.info(
-                f"Scraping completado. Se extrajeron {len(all_results)} registros")
-            return all_results
-
-        except Exception as e:
-            logger.error(f"Error en el proceso de scraping: {e}", exc_info=True)
-            return []
+                        continue
+                    self.stats['drivers_started'] += drivers_started
+                    self.stats['pages_served'] += pages_served
+                    if missing:
+                        self._add_miss(url)
+                    if result:
+                        try:
+                            self._add_result(results, result)
+                        except ScrapeCancelled:
+                            # No esperar a las tareas encoladas: solo terminan las que ya corren
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            raise
+
+                for url in islice(url_iter, len(done)):
+                    futures[executor.submit(BulkScraper._scrape_single_url_worker, url)] = url
+
+        return results
+
+    def _scrape_with_tabs(self, urls: Iterable[str]) -> List[Dict]:
+        """
+        Procesa las URLs con un pool de procesos en el que cada driver carga varias
+        páginas a la vez en pestañas (ver multi_tab.TabPool). Se envían trozos de
+        chunk_size URLs; las que un worker no llegó a procesar (incluidas las que agotaron
+        el timeout de la pestaña) se reencolan.
+        """
+        chunk_size = max(1, self.tabs_config.get('chunk_size', 32))
+        window = self.max_workers * 2
+        retries = self.config['extractor'].get('watchdog', {}).get('retries', 1)
+        logger.info(f"Scraping en pestañas con {self.max_workers} workers de "
+                    f"{self.tabs_config.get('per_driver', 4)} pestañas y trozos de {chunk_size} URLs")
+        results = []
+        url_iter = iter(urls)
+        attempts: Dict[str, int] = {}
+        requeued: List[str] = []
+
+        def next_chunk() -> List[str]:
+            chunk = requeued[:chunk_size]
+            del requeued[:len(chunk)]
+            chunk.extend(islice(url_iter, chunk_size - len(chunk)))
+            return chunk
+
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=BulkScraper._init_worker,
+                                 initargs=(self.config, get_rate_limiter(self.config), 'tabs')) as executor:
+            futures = {}
+            for _ in range(window):
+                chunk = next_chunk()
+                if not chunk:
+                    break
+                futures[executor.submit(BulkScraper._scrape_tabs_chunk_worker, chunk)] = chunk
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = futures.pop(future)
+                    try:
+                        chunk_results, misses, remaining, drivers_started, pages_served = future.result()
+                    except Exception as exc:
+                        logger.error(f'An exception occurred while processing a chunk of {len(chunk)} URLs: {exc}')
+                        continue
+                    self.stats['drivers_started'] += drivers_started
+                    self.stats['pages_served'] += pages_served
+                    try:
+                        for result in chunk_results:
+                            if result:
+                                self._add_result(results, result)
+                    except ScrapeCancelled:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
+                    for url in misses:
+                        self._add_miss(url)
+                    for url in remaining:
+                        attempts[url] = attempts.get(url, 0) + 1
+                        if attempts[url] <= retries:
+                            requeued.append(url)
+                        else:
+                            logger.warning(f"Se descarta {url} tras {attempts[url]} intentos fallidos en pestañas")
+
+                while len(futures) < window:
+                    chunk = next_chunk()
+                    if not chunk:
+                        break
+                    futures[executor.submit(BulkScraper._scrape_tabs_chunk_worker, chunk)] = chunk
+
+        return results
@@ -0,0 +1,139 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+# Recursos que se bloquean según el perfil (patrones de Network.setBlockedURLs; '*' es comodín)
+IMAGE_PATTERNS = ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*', '*.bmp*']
+FONT_PATTERNS = ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*']
+MEDIA_PATTERNS = ['*.mp4*', '*.webm*', '*.mp3*', '*.ogg*']
+CSS_PATTERNS = ['*.css*']
+
+# Con varias pestañas por driver, las de fondo no deben frenarse: headless igual las trata como ocultas
+BACKGROUND_TAB_ARGUMENTS = [
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+# Qué bloquea cada perfil:
+# - 'lean': páginas de detalle, donde solo se lee el DOM (sin estilos, imágenes ni terceros)
+# - 'interactive': búsqueda con clics en "Ver más" y el formulario avanzado; conserva el CSS
+#   porque la visibilidad de botones, modales e indicador de carga depende de los estilos
+# - 'full': sin bloqueos (para depurar)
+PROFILES: Dict[str, Dict[str, bool]] = {
+    'lean': {'images': True, 'fonts': True, 'media': True, 'css': True, 'third_party': True},
+    'interactive': {'images': True, 'fonts': True, 'media': True, 'css': False, 'third_party': True},
+    'full': {'images': False, 'fonts': False, 'media': False, 'css': False, 'third_party': False},
+}
+
+
+def blocked_url_patterns(config: Dict[str, Any], profile: str) -> List[str]:
+    """Patrones de URL a bloquear con el perfil indicado."""
+    rules = PROFILES.get(profile, PROFILES['full'])
+    driver_config = config['extractor'].get('driver', {})
+    patterns: List[str] = []
+    if rules['images']:
+        patterns += IMAGE_PATTERNS
+    if rules['fonts']:
+        patterns += FONT_PATTERNS
+    if rules['media']:
+        patterns += MEDIA_PATTERNS
+    if rules['css']:
+        patterns += CSS_PATTERNS
+    if rules['third_party']:
+        patterns += [f"*{host}*" for host in driver_config.get('third_party_hosts', [])]
+    return patterns
+
+
+def build_options(config: Dict[str, Any], profile: str = 'lean', binary_location: Optional[str] = None,
+                  multi_tab: bool = False) -> Options:
+    """Opciones de Chrome headless comunes a todos los modos, más las del perfil."""
+    driver_config = config['extractor'].get('driver', {})
+    rules = PROFILES.get(profile, PROFILES['full'])
+
+    options = Options()
+    if binary_location:
+        options.binary_location = binary_location
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f"--window-size={driver_config.get('window_size', '1920,1080')}")
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-notifications')
+    options.add_argument('--disable-infobars')
+    options.add_argument('--disable-popup-blocking')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument(f"--user-agent={driver_config.get('user_agent', DEFAULT_USER_AGENT)}")
+    # 'eager': driver.get retorna en DOMContentLoaded, sin esperar imágenes ni subrecursos;
+    # las esperas por selector se encargan del resto
+    options.page_load_strategy = driver_config.get('page_load_strategy', 'eager')
+    if multi_tab:
+        # Varias pestañas (ver multi_tab.TabPool): las navegaciones no deben bloquear al
+        # driver; cada pestaña se sondea hasta que su página está lista
+        options.page_load_strategy = 'none'
+        for argument in BACKGROUND_TAB_ARGUMENTS:
+            options.add_argument(argument)
+
+    if rules['images']:
+        # Content settings: además del bloqueo por red, Chrome ni siquiera intenta decodificar imágenes
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+    return options
+
+
+def apply_network_blocking(driver: webdriver.Chrome, patterns: List[str]) -> None:
+    """
+    Bloquea por CDP los requests cuyo URL coincide con algún patrón. Se aplica a la
+    pestaña actual y se mantiene entre navegaciones; las pestañas nuevas lo necesitan de nuevo.
+    """
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except Exception as e:
+        # Sin CDP el driver sigue sirviendo, solo que descarga todo
+        logger.warning(f"No se pudo configurar el bloqueo de recursos por CDP: {e}")
+
+
+def create_driver(config: Dict[str, Any], profile: str = 'lean', binary_location: Optional[str] = None,
+                  service: Optional[Service] = None, page_load_timeout: Optional[float] = None,
+                  multi_tab: bool = False) -> webdriver.Chrome:
+    """
+    Crea un driver de Chrome headless con el perfil indicado ('lean', 'interactive' o 'full').
+
+    Args:
+        config: Configuración del proyecto (EXTRACTOR_CONFIG['driver']).
+        profile: Perfil de bloqueo de recursos.
+        binary_location: Ruta al binario de Chrome/Chromium, si no es el del PATH.
+        service: Servicio de chromedriver; por defecto, el que resuelve Selenium.
+        page_load_timeout: Tiempo máximo de carga de página en segundos.
+        multi_tab: Preparar el driver para manejar varias pestañas a la vez (ver multi_tab.TabPool).
+    """
+    if profile not in PROFILES:
+        logger.warning(f"Perfil de driver desconocido '{profile}'. Se usa 'full'.")
+        profile = 'full'
+
+    driver = webdriver.Chrome(service=service or Service(),
+                              options=build_options(config, profile, binary_location, multi_tab))
+    try:
+        if page_load_timeout:
+            driver.set_page_load_timeout(page_load_timeout)
+        apply_network_blocking(driver, blocked_url_patterns(config, profile))
+    except Exception:
+        driver.quit()
+        raise
+    logger.debug(f"Driver de Chrome creado con perfil '{profile}'")
+    return driver
@@ -0,0 +1,311 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import util as mp_util
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+from selenium import webdriver
+
+try:
+    import psutil
+except ImportError:  # psutil es opcional: sin él no se controla el RSS de Chrome
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class HungDriverError(RuntimeError):
+    """El driver se colgó (y el watchdog lo mató) en todos los intentos de una operación."""
+
+
+class ManagedDriver:
+    """
+    Driver de Chrome persistente que se reutiliza entre URLs y se recicla
+    al superar un número de páginas servidas o un tope de memoria RSS.
+
+    Con hang_timeout > 0 un hilo watchdog vigila las operaciones en curso (ver
+    `operation()` y `run()`): si una pasa más de hang_timeout segundos sin progreso,
+    mata el árbol de procesos de chromedriver. La llamada colgada (p. ej. driver.get
+    tras un crash del renderer) falla enseguida y `run()` reintenta la operación
+    con un driver nuevo.
+    """
+
+    def __init__(self, factory: Callable[[], webdriver.Chrome], max_pages: int = 0, max_rss_mb: int = 0,
+                 hang_timeout: float = 0, check_interval: float = 5.0):
+        """
+        Args:
+            factory: Función sin argumentos que crea un driver nuevo.
+            max_pages: Páginas a servir antes de reciclar el driver (0 = sin límite).
+            max_rss_mb: RSS máximo en MB del árbol de procesos de Chrome (0 = sin límite).
+            hang_timeout: Segundos sin progreso en una operación antes de matar el driver (0 = sin watchdog).
+            check_interval: Cada cuántos segundos revisa el watchdog.
+        """
+        self.factory = factory
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.hang_timeout = hang_timeout
+        self.check_interval = check_interval
+        self.driver: Optional[webdriver.Chrome] = None
+        self.pages_since_start = 0
+        self.generation = 0 # Aumenta cada vez que el driver activo se descarta
+        self.last_progress = time.monotonic()
+        self._busy = False
+        self._lock = threading.Lock()
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats: Dict[str, int] = {
+            'drivers_started': 0,
+            'pages_served': 0,
+            'recycles': 0,
+            'kills': 0,
+        }
+
+        if self.max_rss_mb and psutil is None:
+            logger.warning("psutil no está instalado: el reciclado por RSS queda deshabilitado.")
+
+    @classmethod
+    def from_config(cls, factory: Callable[[], webdriver.Chrome], config: dict, section: str) -> 'ManagedDriver':
+        """Crea el driver gestionado con los topes de EXTRACTOR_CONFIG[section] y el watchdog de EXTRACTOR_CONFIG['watchdog']."""
+        section_config = config['extractor'].get(section, {})
+        watchdog_config = config['extractor'].get('watchdog', {})
+        return cls(
+            factory,
+            max_pages=section_config.get('driver_max_pages', 0),
+            max_rss_mb=section_config.get('driver_max_rss_mb', 0),
+            hang_timeout=watchdog_config.get('hang_timeout', 0),
+            check_interval=watchdog_config.get('check_interval', 5.0),
+        )
+
+    def get(self) -> webdriver.Chrome:
+        """Retorna el driver activo, creándolo o reciclándolo si corresponde."""
+        if self.driver is not None and self._needs_recycle():
+            self.recycle()
+
+        if self.driver is None:
+            driver = self.factory()
+            with self._lock:
+                self.driver = driver
+                self.pages_since_start = 0
+                self.last_progress = time.monotonic()
+            self.stats['drivers_started'] += 1
+            logger.info(f"Driver de Chrome iniciado (total iniciados en este worker: {self.stats['drivers_started']})")
+
+        return self.driver
+
+    @contextmanager
+    def operation(self) -> Iterator[None]:
+        """
+        Marca una operación en curso sobre el driver. Mientras dure, el watchdog mata
+        el driver si pasan hang_timeout segundos sin llamar a `progress()`.
+        """
+        self._start_watchdog()
+        self.last_progress = time.monotonic()
+        self._busy = True
+        try:
+            yield
+        finally:
+            self._busy = False
+            self.last_progress = time.monotonic()
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """
+        Suspende el watchdog dentro de una operación mientras se espera algo ajeno al
+        driver (p. ej. una cola llena aguas abajo): esa espera no cuenta como cuelgue.
+        """
+        busy = self._busy
+        self._busy = False
+        try:
+            yield
+        finally:
+            self.last_progress = time.monotonic()
+            self._busy = busy
+
+    def progress(self) -> None:
+        """Registra progreso dentro de una operación larga (p. ej. cada carga de resultados)."""
+        self.last_progress = time.monotonic()
+
+    def run(self, action: Callable[[webdriver.Chrome], T], label: str = '', retries: int = 1) -> T:
+        """
+        Ejecuta action(driver) bajo el watchdog y cuenta una página servida.
+
+        Si el watchdog mata el driver durante la operación, la operación se vuelve a
+        encolar con un driver nuevo hasta `retries` veces. Los errores propios de la
+        página (sin que el driver se haya matado) se propagan sin reintentar.
+
+        Raises:
+            HungDriverError: Si el driver se colgó en todos los intentos.
+        """
+        for attempt in range(retries + 1):
+            driver = self.get()
+            generation = self.generation
+            try:
+                with self.operation():
+                    result = action(driver)
+            except Exception:
+                if generation == self.generation:
+                    raise
+            else:
+                if generation == self.generation:
+                    self.page_served()
+                    return result
+            logger.warning(f"Driver reiniciado por el watchdog durante {label or 'una operación'}; "
+                           f"reintentando con un driver nuevo (intento {attempt + 1} de {retries + 1})")
+        raise HungDriverError(f"El driver se colgó en todos los intentos: {label}")
+
+    def page_served(self) -> None:
+        """Registra una página servida por el driver activo."""
+        self.pages_since_start += 1
+        self.stats['pages_served'] += 1
+
+    def _needs_recycle(self) -> bool:
+        """Indica si el driver superó el límite de páginas o de memoria."""
+        if self.max_pages and self.pages_since_start >= self.max_pages:
+            logger.info(f"Driver alcanzó {self.pages_since_start} páginas. Reciclando.")
+            return True
+
+        if self.max_rss_mb:
+            rss_mb = self.rss_mb()
+            if rss_mb is not None and rss_mb >= self.max_rss_mb:
+                logger.info(f"Driver alcanzó {rss_mb:.0f} MB de RSS (tope {self.max_rss_mb} MB). Reciclando.")
+                return True
+
+        return False
+
+    def rss_mb(self) -> Optional[float]:
+        """Suma el RSS de chromedriver y de todos sus procesos hijos (Chrome, renderers)."""
+        if psutil is None or self.driver is None:
+            return None
+
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / (1024 * 1024)
+        except Exception as e:
+            logger.debug(f"No se pudo medir el RSS del driver: {e}")
+            return None
+
+    def recycle(self) -> None:
+        """Cierra el driver actual; el próximo get() creará uno nuevo."""
+        self.quit()
+        self.stats['recycles'] += 1
+
+    def _detach(self) -> Optional[webdriver.Chrome]:
+        """Desvincula el driver activo (el próximo get() creará otro) y lo retorna."""
+        with self._lock:
+            driver = self.driver
+            if driver is not None:
+                self.driver = None
+                self.pages_since_start = 0
+                self.generation += 1
+            return driver
+
+    def quit(self) -> None:
+        """Cierra el driver si está activo."""
+        driver = self._detach()
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error al cerrar el driver: {e}")
+
+    def kill(self, reason: str = '') -> None:
+        """
+        Mata chromedriver y todos sus procesos hijos sin pasar por el protocolo de
+        WebDriver (que no responde si la sesión está colgada).
+        """
+        driver = self._detach()
+        if driver is None:
+            return
+        self.stats['kills'] += 1
+        logger.warning(f"Matando driver colgado{f' ({reason})' if reason else ''}")
+
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        if process is None:
+            return
+        if psutil is not None:
+            try:
+                for child in psutil.Process(process.pid).children(recursive=True):
+                    try:
+                        child.kill()
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
+            except psutil.Error as e:
+                logger.debug(f"No se pudieron listar los procesos hijos de chromedriver: {e}")
+        try:
+            process.kill()
+            process.wait(timeout=10) # Evitar que chromedriver quede zombie
+        except Exception as e:
+            logger.debug(f"Error al matar chromedriver: {e}")
+
+    def _start_watchdog(self) -> None:
+        """Arranca el hilo watchdog la primera vez que se necesita."""
+        if self.hang_timeout and self._watchdog is None:
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name='driver-watchdog', daemon=True)
+            self._watchdog.start()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            stalled = time.monotonic() - self.last_progress
+            if self._busy and self.driver is not None and stalled > self.hang_timeout:
+                try:
+                    self.kill(f"{stalled:.0f}s sin progreso")
+                except Exception as e:
+                    logger.error(f"Error del watchdog al matar el driver: {e}", exc_info=True)
+
+    def close(self) -> None:
+        """Cierra el driver y detiene el watchdog."""
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.check_interval + 1)
+            self._watchdog = None
+        self.quit()
+
+
+# --- Driver por proceso worker ---
+# Cada proceso de un ProcessPoolExecutor mantiene su propio ManagedDriver,
+# creado por el initializer del pool y cerrado al apagarse el proceso.
+
+_worker_driver: Optional[ManagedDriver] = None
+
+
+def init_worker_driver(factory: Callable[[], webdriver.Chrome], max_pages: int = 0, max_rss_mb: int = 0,
+                       hang_timeout: float = 0, check_interval: float = 5.0) -> None:
+    """
+    Inicializa el driver gestionado del proceso worker actual.
+    Pensado para llamarse desde el `initializer` de un ProcessPoolExecutor.
+    """
+    global _worker_driver
+    _worker_driver = ManagedDriver(factory, max_pages=max_pages, max_rss_mb=max_rss_mb,
+                                   hang_timeout=hang_timeout, check_interval=check_interval)
+    # Los workers del pool no ejecutan atexit; Finalize sí corre al terminar el proceso.
+    mp_util.Finalize(None, shutdown_worker_driver, exitpriority=10)
+
+
+def get_worker_driver() -> ManagedDriver:
+    """Retorna el driver gestionado del proceso worker actual."""
+    if _worker_driver is None:
+        raise RuntimeError("Driver del worker no inicializado. Use init_worker_driver como initializer del pool.")
+    return _worker_driver
+
+
+def shutdown_worker_driver() -> None:
+    """Cierra el driver del proceso worker actual, si existe."""
+    global _worker_driver
+    if _worker_driver is not None:
+        stats = _worker_driver.stats
+        _worker_driver.close()
+        logger.info(
+            f"Worker finalizado: {stats['drivers_started']} drivers iniciados, "
+            f"{stats['pages_served']} páginas servidas, {stats['kills']} drivers colgados reiniciados")
+        _worker_driver = None
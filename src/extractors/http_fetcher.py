@@ -0,0 +1,162 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+from ..common.rate_limiter import CONGESTION_STATUSES, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Mismo User-Agent que usan los drivers de Chrome del proyecto
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Elemento que indica que la página de detalle llegó renderizada desde el servidor
+DETAIL_READY_SELECTOR = 'a.search-result-name h1'
+
+# Enlace a la búsqueda avanzada del encabezado del sitio: solo está en las páginas que arma
+# la aplicación, no en las de error de Chrome, los 5xx del proxy ni las pantallas de bloqueo
+SITE_LAYOUT_SELECTOR = 'a[data-target="#formBusquedaAvazada"]'
+
+# Respuestas con las que el sitio indica que el ID no existe
+MISSING_STATUSES = (404, 410)
+
+
+def has_detail_content(soup: BeautifulSoup) -> bool:
+    """Indica si el HTML de una página de detalle contiene el nombre del negocio."""
+    return soup.select_one(DETAIL_READY_SELECTOR) is not None
+
+
+def is_confirmed_miss(status_code: Optional[int], soup: Optional[BeautifulSoup]) -> bool:
+    """
+    Indica si una página de detalle confirma que el negocio no existe: 404/410, o una
+    página normal del sitio (status 200 con el encabezado) sin los datos del negocio.
+
+    Todo lo demás (timeouts, 429/5xx, páginas de error o de bloqueo) es un fallo
+    transitorio: el ID se reintenta en lugar de marcarse como inexistente.
+    Es el único criterio de inexistencia de todos los motores.
+    """
+    if status_code in MISSING_STATUSES:
+        return True
+    if status_code != 200 or soup is None:
+        return False
+    return not has_detail_content(soup) and soup.select_one(SITE_LAYOUT_SELECTOR) is not None
+
+
+class HttpFetcher:
+    """
+    Cliente HTTP con sesión persistente (keep-alive), pool de conexiones,
+    compresión gzip y concurrencia acotada para descargar páginas de detalle.
+    Cada request consulta el limitador global de la corrida (ver common.rate_limiter),
+    incluidos los reintentos, que por eso se hacen aquí y no en el adaptador de urllib3.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.http_config = self.config['extractor'].get('http', {})
+        self.timeout = self.http_config.get('timeout', 15)
+        self.max_concurrency = self.http_config.get('max_concurrency', 16)
+        pool_size = self.http_config.get('pool_size', self.max_concurrency)
+        self.retries = self.http_config.get('retries', 2)
+        self.backoff_factor = self.http_config.get('backoff_factor', 0.5)
+        self.rate_limiter = get_rate_limiter(config)
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': self.http_config.get('user_agent', DEFAULT_USER_AGENT),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Language': 'es-AR,es;q=0.9',
+            'Connection': 'keep-alive',
+        })
+
+    def fetch(self, url: str, params: Optional[Dict[str, str]] = None,
+              headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """
+        Descarga una URL reutilizando la sesión. Los errores de red y las respuestas de
+        congestión (429, 5xx) se reintentan hasta `retries` veces con backoff exponencial;
+        cada intento pasa por el limitador, así que los reintentos también frenan la tasa.
+
+        Returns:
+            Optional[requests.Response]: La respuesta (la del último intento si se agotaron
+            los reintentos), o None si el último intento falló por un error de red.
+        """
+        response = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self._backoff(attempt, response))
+            response = self._fetch_once(url, params, headers)
+            if response is not None and response.status_code not in CONGESTION_STATUSES:
+                break
+            logger.debug(f"Intento {attempt + 1} de {self.retries + 1} fallido para {url}")
+
+        if response is None:
+            logger.warning(f"Error de red al descargar {url}")
+        elif response.status_code >= 400:
+            logger.warning(f"HTTP {response.status_code} al descargar {url}")
+        return response
+
+    def _fetch_once(self, url: str, params: Optional[Dict[str, str]],
+                    headers: Optional[Dict[str, str]]) -> Optional[requests.Response]:
+        """Hace un único request, consumiendo un token del limitador y registrando el resultado."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        started = time.monotonic()
+        status_code = None
+        try:
+            response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            status_code = response.status_code
+            return response
+        except requests.RequestException as e:
+            logger.debug(f"Error de red al descargar {url}: {e}")
+            return None
+        finally:
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(time.monotonic() - started, status_code)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Espera antes del reintento: el Retry-After del servidor si lo indica, si no backoff exponencial con jitter."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, self.backoff_factor * (2 ** attempt))
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[requests.Response]]]:
+        """
+        Descarga varias URLs en paralelo con concurrencia acotada a max_concurrency.
+        Las URLs se consumen del iterable a medida que se liberan lugares, por lo que
+        nunca hay más de 2 * max_concurrency descargas pendientes en memoria.
+
+        Yields:
+            Tuple[str, Optional[requests.Response]]: URL y su respuesta, a medida que terminan.
+        """
+        url_iter = iter(urls)
+        window = self.max_concurrency * 2
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = {executor.submit(self.fetch, url): url for url in islice(url_iter, window)}
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = futures.pop(future)
+                    yield url, future.result()
+                for url in islice(url_iter, len(done)):
+                    futures[executor.submit(self.fetch, url)] = url
+
+    def close(self) -> None:
+        """Cierra la sesión y libera las conexiones del pool."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
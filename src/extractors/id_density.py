@@ -0,0 +1,143 @@
+import logging
+import random
+from typing import Iterable, Iterator, Optional, Set, Tuple
+
+from ..common.id_bitmap import IdBitmap
+
+logger = logging.getLogger(__name__)
+
+
+class IdDensityModel:
+    """
+    Modelo de densidad del espacio de IDs para los barridos bulk.
+
+    Divide el rango en bloques de `block_size` IDs y usa el bitmap persistente de
+    aciertos y fallos para decidir qué consultar:
+    - bloques con IDs vivos: se consultan sus IDs vivos y los que nunca se consultaron;
+    - bloques sin información: se sondean con `probes_per_block` IDs espaciados;
+    - bloques sondeados sin ningún acierto: se saltean, salvo una fracción `reprobe_ratio`
+      por pasada que se vuelve a sondear en otras posiciones (pueden aparecer IDs nuevos).
+    Solo se registran fallos confirmados (404/410 o página sin datos del negocio): un ID
+    cuya descarga falló queda sin consultar y se vuelve a intentar en la próxima pasada.
+    Los bloques donde el sondeo encuentra un acierto se refinan consultándolos completos,
+    junto con sus bloques vecinos (un grupo de IDs vivos puede cruzar el borde del bloque).
+    """
+
+    def __init__(self, config: dict, bitmap: Optional[IdBitmap] = None):
+        self.density_config = config['extractor']['bulk'].get('density', {})
+        self.block_size = max(1, self.density_config.get('block_size', 100))
+        self.probes_per_block = max(1, min(self.block_size, self.density_config.get('probes_per_block', 5)))
+        self.frontier = self.density_config.get('frontier', 2000)
+        self.reprobe_ratio = self.density_config.get('reprobe_ratio', 0.05)
+        self.bitmap = bitmap or IdBitmap(self.density_config.get('bitmap_path', 'data/cache/bulk_ids.bitmap'))
+
+    def _blocks(self, start_id: int, end_id: int) -> Iterator[Tuple[int, int]]:
+        """Recorre los bloques (inicio, fin) alineados a block_size que cubren el rango."""
+        block_start = start_id - (start_id % self.block_size)
+        while block_start <= end_id:
+            yield max(block_start, start_id), min(block_start + self.block_size - 1, end_id)
+            block_start += self.block_size
+
+    def _block_state(self, start_id: int, end_id: int) -> str:
+        """Clasifica un bloque como 'live', 'dead' o 'unknown' según el bitmap."""
+        probed = 0
+        for business_id in range(start_id, end_id + 1):
+            if self.bitmap.is_live(business_id):
+                return 'live'
+            if self.bitmap.is_probed(business_id):
+                probed += 1
+        return 'dead' if probed >= min(self.probes_per_block, end_id - start_id + 1) else 'unknown'
+
+    def _probe_ids(self, start_id: int, end_id: int, reprobe: bool = False) -> Iterator[int]:
+        """
+        IDs espaciados para sondear un bloque sin información. Al re-sondear un bloque
+        muerto se usan posiciones desplazadas al azar y se incluyen IDs ya consultados.
+        """
+        size = end_id - start_id + 1
+        step = max(1, size // self.probes_per_block)
+        offset = random.randrange(step) if reprobe else step // 2
+        for business_id in range(start_id + offset, end_id + 1, step):
+            if reprobe or not self.bitmap.is_probed(business_id):
+                yield business_id
+
+    def _unprobed_ids(self, start_id: int, end_id: int) -> Iterator[int]:
+        """IDs vivos y nunca consultados de un bloque."""
+        for business_id in range(start_id, end_id + 1):
+            if self.bitmap.is_live(business_id) or not self.bitmap.is_probed(business_id):
+                yield business_id
+
+    def coarse_ids(self, start_id: int, end_id: int) -> Iterator[int]:
+        """
+        Primera pasada sobre un rango: IDs de bloques vivos más un sondeo grueso
+        de los bloques sin información. Los bloques muertos se saltean, salvo los
+        que toca re-sondear en esta pasada.
+        """
+        skipped = reprobed = 0
+        for block_start, block_end in self._blocks(start_id, end_id):
+            state = self._block_state(block_start, block_end)
+            if state == 'live':
+                yield from self._unprobed_ids(block_start, block_end)
+            elif state == 'unknown':
+                yield from self._probe_ids(block_start, block_end)
+            elif random.random() < self.reprobe_ratio:
+                reprobed += 1
+                yield from self._probe_ids(block_start, block_end, reprobe=True)
+            else:
+                skipped += 1
+        if skipped or reprobed:
+            logger.info(f"Salteados {skipped} bloques de {self.block_size} IDs sin aciertos previos "
+                        f"({reprobed} re-sondeados)")
+
+    def refine_ids(self, hit_blocks: Iterable[int], start_id: int, end_id: int) -> Iterator[int]:
+        """
+        Segunda pasada: IDs aún no consultados de los bloques donde el sondeo encontró
+        aciertos y de sus vecinos, dentro del rango.
+        """
+        blocks = set()
+        for block_start in hit_blocks:
+            blocks.update((block_start - self.block_size, block_start, block_start + self.block_size))
+        for block_start in sorted(blocks):
+            first, last = max(block_start, start_id), min(block_start + self.block_size - 1, end_id)
+            yield from (business_id for business_id in range(first, last + 1)
+                        if not self.bitmap.is_probed(business_id))
+
+    def default_ids(self) -> Iterator[int]:
+        """IDs por defecto de un refresco: todos los vivos conocidos más la frontera por encima del mayor."""
+        max_live = self.bitmap.max_live()
+        if max_live is None:
+            return
+        yield from self.bitmap.iter_live()
+        yield from range(max_live + 1, max_live + self.frontier + 1)
+
+    def has_history(self) -> bool:
+        """Indica si el bitmap ya tiene IDs vivos registrados."""
+        return self.bitmap.max_live() is not None
+
+    def record(self, live_ids: Iterable[int], dead_ids: Iterable[int]) -> Set[int]:
+        """
+        Registra aciertos y fallos confirmados de una pasada. Los IDs que no están en
+        ninguno de los dos (la descarga falló) no se marcan.
+
+        Args:
+            live_ids: IDs con página de detalle.
+            dead_ids: IDs inexistentes (404/410 o página sin datos del negocio).
+
+        Returns:
+            Set[int]: Inicio de los bloques que estaban sin información o muertos y tuvieron aciertos.
+        """
+        live_ids = set(live_ids)
+        block_starts = {business_id - (business_id % self.block_size) for business_id in live_ids}
+        # El estado de cada bloque se evalúa antes de marcar los resultados de la pasada
+        new_hit_blocks = {block_start for block_start in block_starts
+                          if self._block_state(block_start, block_start + self.block_size - 1) != 'live'}
+        for business_id in dead_ids:
+            if business_id not in live_ids:
+                self.bitmap.mark(business_id, False)
+        for business_id in live_ids:
+            self.bitmap.mark(business_id, True)
+        return new_hit_blocks
+
+    def save(self) -> None:
+        """Persiste el bitmap."""
+        self.bitmap.save()
+        logger.info(f"Bitmap de IDs guardado: {self.bitmap.count_live()} IDs vivos, máximo {self.bitmap.max_live()}")
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup
+
+from .http_fetcher import HttpFetcher, has_detail_content, is_confirmed_miss
+
+logger = logging.getLogger(__name__)
+
+
+class FrontierProbeError(Exception):
+    """Una ventana del sondeo no se pudo resolver: quedaron IDs sin respuesta tras los reintentos."""
+
+
+class FrontierProber:
+    """
+    Descubre el mayor ID vivo actual por sondeo exponencial y búsqueda binaria.
+
+    Como el espacio de IDs tiene huecos, cada sondeo consulta una ventana de
+    `window` IDs consecutivos: la ventana está "viva" si alguno existe, y "vacía"
+    solo si todos responden 404/410 o una página sin datos del negocio. Los IDs cuya
+    descarga falla (timeout, 429, 5xx) se reintentan; si no se resuelven, el sondeo
+    falla con FrontierProbeError en lugar de subestimar el máximo.
+    """
+
+    def __init__(self, config: dict, fetcher: Optional[HttpFetcher] = None):
+        self.config = config
+        self.probe_config = config['extractor']['bulk'].get('frontier_probe', {})
+        self.window = max(1, self.probe_config.get('window', 20))
+        self.initial_step = max(self.window, self.probe_config.get('initial_step', 64))
+        self.retries = self.probe_config.get('retries', 3)
+        self.retry_delay = self.probe_config.get('retry_delay', 2.0)
+        self.base_url = config['extractor']['bulk']['base_url']
+        self.fetcher = fetcher
+        self.probes = 0
+
+    def _window_max_live(self, start_id: int) -> Optional[int]:
+        """
+        Retorna el mayor ID vivo de la ventana que empieza en start_id, o None si no hay ninguno.
+
+        Raises:
+            FrontierProbeError: Si tras los reintentos quedan IDs sin respuesta por encima
+                del mayor vivo encontrado (podrían ser el máximo).
+        """
+        pending = {f"{self.base_url}{business_id}": business_id
+                   for business_id in range(start_id, start_id + self.window)}
+        live = []
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.retry_delay * attempt)
+            failed = {}
+            for url, response in self.fetcher.fetch_many(pending):
+                self.probes += 1
+                status_code = response.status_code if response is not None else None
+                soup = BeautifulSoup(response.text, 'html.parser') if status_code == 200 else None
+                if soup is not None and has_detail_content(soup):
+                    live.append(pending[url])
+                elif not is_confirmed_miss(status_code, soup):
+                    failed[url] = pending[url]
+            best = max(live) if live else None
+            # Los fallos por debajo del mayor vivo no cambian el resultado de la ventana
+            pending = {url: business_id for url, business_id in failed.items() if best is None or business_id > best}
+            if not pending:
+                return best
+            logger.info(f"Ventana {start_id}-{start_id + self.window - 1}: {len(pending)} IDs sin respuesta "
+                        f"(intento {attempt + 1} de {self.retries + 1})")
+        raise FrontierProbeError(f"La ventana {start_id}-{start_id + self.window - 1} quedó con "
+                                 f"{len(pending)} IDs sin respuesta tras {self.retries} reintentos")
+
+    def find_max_live(self, known_live: int) -> int:
+        """
+        Busca el mayor ID vivo a partir de uno que se sabe vivo (o del último high-water mark).
+
+        Returns:
+            int: Mayor ID vivo encontrado (known_live si no hay IDs nuevos).
+        """
+        own_fetcher = self.fetcher is None
+        if own_fetcher:
+            self.fetcher = HttpFetcher(self.config)
+        try:
+            best = known_live
+
+            # Fase exponencial: duplicar el salto hasta encontrar una ventana sin IDs vivos
+            step = self.initial_step
+            low = known_live
+            while True:
+                found = self._window_max_live(low + step)
+                if found is None:
+                    high = low + step
+                    break
+                best = max(best, found)
+                low = found
+                step *= 2
+            logger.info(f"Sondeo exponencial: último vivo {best}, primera ventana vacía en {high}")
+
+            # Fase binaria: acotar entre el último vivo y la ventana vacía
+            while high - low > self.window:
+                middle = (low + high) // 2
+                found = self._window_max_live(middle)
+                if found is None:
+                    high = middle
+                else:
+                    best = max(best, found)
+                    low = found
+
+            # Últimos IDs entre el vivo y la ventana vacía
+            found = self._window_max_live(low + 1)
+            if found is not None:
+                best = max(best, found)
+
+            logger.info(f"Mayor ID vivo encontrado: {best} ({self.probes} páginas consultadas)")
+            return best
+        finally:
+            if own_fetcher:
+                self.fetcher.close()
+                self.fetcher = None
+
+
+class HighWaterMark:
+    """Último ID cubierto por una corrida bulk, persistido entre ejecuciones."""
+
+    def __init__(self, config: dict, path: Optional[str] = None):
+        probe_config = config['extractor']['bulk'].get('frontier_probe', {})
+        self.path = path or probe_config.get('state_path', 'data/cache/bulk_state.json')
+
+    def load(self) -> Optional[int]:
+        """Retorna el high-water mark guardado, o None si no hay uno."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return int(json.load(f)['high_water_mark'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"No se pudo leer el high-water mark {self.path}: {e}")
+            return None
+
+    def save(self, high_water_mark: int) -> None:
+        """Guarda el high-water mark de forma atómica."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        state: Dict = {'high_water_mark': high_water_mark, 'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
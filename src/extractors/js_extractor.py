@@ -0,0 +1,230 @@
+import logging
+from typing import Any, Dict
+
+from bs4 import BeautifulSoup
+from selenium import webdriver
+
+from .http_fetcher import is_confirmed_miss
+
+logger = logging.getLogger(__name__)
+
+# Campos de la página de detalle, en el orden de BulkScraper._build_business_info
+RECORD_FIELDS = (
+    'nombre', 'direccion', 'telefonos', 'whatsapp', 'sitio_web', 'email', 'facebook', 'instagram',
+    'horarios', 'rubros', 'descripcion', 'servicios', 'latitud', 'longitud',
+)
+
+# Réplica en JavaScript de los _extract_* de BulkScraper. Corre en la página y retorna solo
+# los campos, sin transferir el HTML ni parsearlo en Python. Reproduce la semántica de
+# BeautifulSoup que importa para que ambos caminos den lo mismo campo por campo:
+# - get_text(strip=True): cada string descendiente recortado con str.strip() de Python
+#   (que también recorta \x1c-\x1f y \x85, a diferencia de trim()), sin los vacíos,
+#   concatenados sin separador y sin el contenido de <script>/<style>/<template>;
+# - atributos crudos (getAttribute), no las URLs resueltas por el navegador;
+# - parse_qs de urllib (separador '&', valores vacíos descartados, '+' como espacio,
+#   %XX como UTF-8) y \d / str.isdigit() con dígitos Unicode.
+EXTRACT_SCRIPT = r"""
+var PY_WS = '\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000';
+var LEADING_WS = new RegExp('^[' + PY_WS + ']+'), TRAILING_WS = new RegExp('[' + PY_WS + ']+$');
+var SKIPPED_TAGS = {SCRIPT: true, STYLE: true, TEMPLATE: true};
+// str.isdigit(): dígitos decimales más los de Numeric_Type=Digit (superíndices, dígitos en círculo, ...)
+var PY_ISDIGIT = /[\p{Nd}\u00b2\u00b3\u00b9\u2070\u2074-\u2079\u2080-\u2089\u2460-\u2468\u2474-\u247c\u2488-\u2490\u24ea\u24f5-\u24fd\u24ff\u2776-\u277e\u2780-\u2788\u278a-\u2792\u1369-\u1371\u19da]/u;
+
+function pyStrip(s) { return s.replace(LEADING_WS, '').replace(TRAILING_WS, ''); }
+
+function getText(el) {
+    var parts = [], walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT), node;
+    while ((node = walker.nextNode())) {
+        var skipped = false;
+        for (var p = node.parentNode; p && p !== el; p = p.parentNode) {
+            if (SKIPPED_TAGS[p.nodeName]) { skipped = true; break; }
+        }
+        if (skipped) continue;
+        var text = pyStrip(node.data);
+        if (text) parts.push(text);
+    }
+    return parts.join('');
+}
+
+function attr(el, name) { return el && el.hasAttribute(name) ? el.getAttribute(name) : 'N/A'; }
+
+function extractText(selector) {
+    var el = document.querySelector(selector);
+    return el ? getText(el) : 'N/A';
+}
+
+function unquotePlus(s) {
+    return s.replace(/\+/g, ' ').replace(/(%[0-9A-Fa-f]{2})+/g, function (run) {
+        var bytes = new Uint8Array(run.length / 3);
+        for (var i = 0; i < bytes.length; i++) bytes[i] = parseInt(run.substr(i * 3 + 1, 2), 16);
+        return new TextDecoder('utf-8').decode(bytes);
+    });
+}
+
+function parseQs(href) {
+    var url = href.replace(/[\t\r\n]/g, ''), cut = url.indexOf('#');
+    if (cut >= 0) url = url.slice(0, cut);
+    cut = url.indexOf('?');
+    var query = cut >= 0 ? url.slice(cut + 1) : '', params = {};
+    query.split('&').forEach(function (field) {
+        var eq = field.indexOf('=');
+        if (eq < 0 || eq === field.length - 1) return;
+        var name = unquotePlus(field.slice(0, eq));
+        (params[name] = params[name] || []).push(unquotePlus(field.slice(eq + 1)));
+    });
+    return params;
+}
+
+function extractPhones() {
+    var phones = Array.prototype.map.call(document.querySelectorAll('a[href^="tel:"]'), getText);
+    return phones.length ? phones.join(', ') : 'N/A';
+}
+
+function extractWhatsapp() {
+    var link = document.querySelector('a[href^="https://api.whatsapp.com/send?"]');
+    if (!link) return 'N/A';
+    try {
+        var params = parseQs(link.getAttribute('href'));
+        if (params.phone) return params.phone[0];
+        if (params.text) {
+            var match = params.text[0].match(/\p{Nd}+/u);
+            return match ? match[0] : 'N/A';
+        }
+    } catch (e) {}
+    var text = getText(link);
+    return PY_ISDIGIT.test(text) ? text : 'N/A';
+}
+
+function extractWebsite() {
+    return attr(document.querySelector('a[itemprop="url"]') ||
+                document.querySelector('i.fa.fa-cloud + a.search-result-link'), 'href');
+}
+
+function extractEmail() {
+    var link = document.querySelector('a[onclick="irContacto()"]') ||
+               document.querySelector('i.fa.fa-envelope + a.search-result-link');
+    // El respaldo 'i.fa.fa-envelope + text' de Python no coincide con ningún elemento HTML: da 'N/A'
+    if (!link) return 'N/A';
+    var text = getText(link);
+    return text.indexOf('@') >= 0 ? text : 'N/A';
+}
+
+function extractSocial(domain) {
+    return attr(document.querySelector('a[href*="' + domain + '"]'), 'href');
+}
+
+function extractHours() {
+    var icon = document.querySelector('i.far.fa-clock');
+    if (!icon) return 'N/A';
+    // find_next: el primer span/div con la clase que sigue al ícono en el orden del documento
+    var candidates = document.querySelectorAll('span.search-result-address, div.search-result-address');
+    for (var i = 0; i < candidates.length; i++) {
+        if (icon.compareDocumentPosition(candidates[i]) & Node.DOCUMENT_POSITION_FOLLOWING) {
+            var text = getText(candidates[i]).split('Cerrado').join('').split('Abierto').join('');
+            return pyStrip(text) || 'N/A';
+        }
+    }
+    return 'N/A';
+}
+
+function extractCategories() {
+    var items = document.querySelector('div#yw0.list-view div.items');
+    if (items) {
+        var rubros = Array.prototype.map.call(items.querySelectorAll('a.search-result-link'), getText);
+        return rubros.length ? rubros.join(', ') : 'N/A';
+    }
+    return extractText('span.search-result-category');
+}
+
+var map = document.querySelector('div.map');
+return {
+    nombre: extractText('a.search-result-name h1'),
+    direccion: extractText('span.search-result-address'),
+    telefonos: extractPhones(),
+    whatsapp: extractWhatsapp(),
+    sitio_web: extractWebsite(),
+    email: extractEmail(),
+    facebook: extractSocial('facebook.com'),
+    instagram: extractSocial('instagram.com'),
+    horarios: extractHours(),
+    rubros: extractCategories(),
+    descripcion: extractText('div.search-result-description'),
+    servicios: 'N/A',
+    latitud: attr(map, 'data-lat'),
+    longitud: attr(map, 'data-lng')
+};
+"""
+
+
+# Código HTTP de la navegación actual (Chrome 109+); null si el navegador no lo expone
+NAVIGATION_STATUS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+return nav && nav.responseStatus ? nav.responseStatus : null;
+"""
+
+
+def page_is_missing(driver: webdriver.Chrome) -> bool:
+    """
+    Indica si la página cargada en el driver confirma que el negocio no existe, con el
+    mismo criterio que los motores HTTP (ver http_fetcher.is_confirmed_miss).
+    """
+    status_code = driver.execute_script(NAVIGATION_STATUS_SCRIPT)
+    # Sin el código (Chrome viejo) se decide solo por el contenido: las páginas de error no tienen el encabezado del sitio
+    return is_confirmed_miss(status_code or 200, BeautifulSoup(driver.page_source, 'html.parser'))
+
+
+def extract_record(driver: webdriver.Chrome) -> Dict[str, Any]:
+    """
+    Extrae los campos de la página de detalle cargada en el driver ejecutando
+    EXTRACT_SCRIPT en el navegador.
+
+    Returns:
+        Dict[str, Any]: Los campos de RECORD_FIELDS, en ese orden.
+    """
+    raw = driver.execute_script(EXTRACT_SCRIPT) or {}
+    return {field: raw.get(field, 'N/A') for field in RECORD_FIELDS}
+
+
+def diff_against_soup(driver: webdriver.Chrome, scraper, url: str) -> Dict[str, Any]:
+    """
+    Compara, sobre la página cargada en el driver, la extracción en el navegador con la
+    de BeautifulSoup (scraper.parse_business_html sobre page_source).
+
+    Returns:
+        Dict[str, Any]: {campo: (valor_js, valor_soup)} de los campos que difieren.
+    """
+    js_record = extract_record(driver)
+    soup_record = scraper.parse_business_html(driver.page_source, url)
+    return {field: (js_record[field], soup_record.get(field))
+            for field in RECORD_FIELDS if js_record[field] != soup_record.get(field)}
+
+
+# Verificación sobre un corpus de páginas guardadas:
+#   python -m src.extractors.js_extractor data/archive/detail_pages
+if __name__ == "__main__":
+    import glob
+    import os
+    import sys
+
+    from ..common.config import get_config
+    from .bulk_scraper import BulkScraper
+    from .driver_factory import create_driver
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    fixtures_dir = sys.argv[1] if len(sys.argv) > 1 else 'data/archive/detail_pages'
+    config = get_config()
+    scraper = BulkScraper(config)
+    driver = create_driver(config, 'full')
+    mismatches = 0
+    try:
+        paths = sorted(glob.glob(os.path.join(fixtures_dir, '*.html')))
+        for path in paths:
+            driver.get('file://' + os.path.abspath(path))
+            diff = diff_against_soup(driver, scraper, path)
+            if diff:
+                mismatches += 1
+                logger.warning(f"{path}: {diff}")
+        logger.info(f"{len(paths)} páginas comparadas, {mismatches} con diferencias")
+    finally:
+        driver.quit()
+    sys.exit(1 if mismatches else 0)
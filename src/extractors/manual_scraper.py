@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os
@@ -9,8 +8,11 @@ import psycopg2
 from psycopg2.extras import execute_values
 from datetime import datetime
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..common.versioning import DataVersioning
+from ..common.page_store import PageStore
+from ..common.utils import extract_id_from_url
+from .http_fetcher import HttpFetcher, has_detail_content
 
 # Configurar logging
 logging.basicConfig(
@@ -400,19 +402,59 @@ if __name__ == "__main__":
 class ManualScraper:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.page_store = PageStore(self.config)
         
     def scrape_single_url(self, url: str) -> List[Dict[str, Any]]:
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            data = parse_detail_page(soup)
+            business_id = extract_id_from_url(url)
+            html_content = self.page_store.get(business_id) if business_id else None
+
+            if html_content is None:
+                with HttpFetcher(self.config) as fetcher:
+                    response = fetcher.fetch(url)
+
+                if response is not None and response.ok and has_detail_content(BeautifulSoup(response.text, 'html.parser')):
+                    html_content = response.text
+                else:
+                    # La página no llegó renderizada por HTTP: se recurre a Selenium
+                    logger.info(f"La respuesta HTTP no contiene el detalle del negocio. Reintentando con Selenium: {url}")
+                    html_content = self._fetch_with_selenium(url)
+
+                if html_content is None:
+                    return []
+                if business_id:
+                    self.page_store.put(business_id, url, html_content)
+            else:
+                logger.info(f"Página de detalle obtenida de la caché: {url}")
+
+            data = parse_detail_page(html_content)
             data['URL'] = url
             return [data]
         except Exception as e:
             logger.error(f"Error scraping URL {url}: {e}")
             return []
 
+    def _fetch_with_selenium(self, url: str) -> Optional[str]:
+        """Obtiene el HTML renderizado de una URL usando un driver de Chrome efímero"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from .bulk_scraper import BulkScraper
+
+        driver = None
+        try:
+            driver = BulkScraper(self.config)._setup_driver()
+            driver.get(url)
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'a.search-result-name h1, span.search-result-address')))
+            return driver.page_source
+        except Exception as e:
+            logger.error(f"Error obteniendo {url} con Selenium: {e}")
+            return None
+        finally:
+            if driver:
+                driver.quit()
+
 def save_leads(leads: List[Dict[str, Any]], output_file: str = 'data/raw/csv/estudiosContables_leads.csv') -> None:
     """
     Guarda los leads en un archivo CSV.
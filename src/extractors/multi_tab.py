@@ -0,0 +1,183 @@
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from selenium import webdriver
+
+from ..common.rate_limiter import get_rate_limiter
+from .driver_factory import apply_network_blocking, blocked_url_patterns
+from .js_extractor import page_is_missing
+
+logger = logging.getLogger(__name__)
+
+# Selector que indica que la página de detalle ya tiene los datos del negocio
+DETAIL_READY_SELECTOR = 'a.search-result-name h1, span.search-result-address'
+
+# Marca el documento actual como viejo y navega sin esperar: el driver queda libre
+# para atender otras pestañas mientras esta carga
+NAVIGATE_SCRIPT = """
+document.documentElement.setAttribute('data-tab-stale', '1');
+window.location.href = arguments[0];
+"""
+
+# 'ready' si la página nueva terminó de cargar y tiene el selector, 'empty' si terminó sin él
+# (el negocio no existe o es una página de error: lo decide page_is_missing),
+# null mientras siga cargando (o mientras el documento visible sea el anterior)
+READY_SCRIPT = """
+var root = document.documentElement;
+if (!root || root.hasAttribute('data-tab-stale') || document.readyState !== 'complete') return null;
+return document.querySelector(arguments[0]) ? 'ready' : 'empty';
+"""
+
+
+class TabPool:
+    """
+    K pestañas de un mismo driver de Chrome cargando páginas a la vez.
+
+    Se lanza una navegación en cada pestaña sin esperar la carga y luego se recorren
+    las pestañas sondeando cuál terminó: cada página lista se entrega apenas termina
+    y su pestaña recibe la URL siguiente. Se obtiene concurrencia K con la memoria
+    de un solo navegador.
+
+    El driver debe crearse con create_driver(..., multi_tab=True) (estrategia de carga
+    'none' y pestañas de fondo sin throttling). Cada navegación consume un token del
+    limitador compartido del proceso.
+    """
+
+    def __init__(self, driver: webdriver.Chrome, tabs: int = 4, blocked_patterns: Optional[List[str]] = None,
+                 ready_selector: str = DETAIL_READY_SELECTOR, timeout: float = 30, poll_interval: float = 0.05):
+        """
+        Args:
+            driver: Driver sobre el que se abren las pestañas.
+            tabs: Cantidad de pestañas cargando a la vez.
+            blocked_patterns: Patrones de URL a bloquear en cada pestaña nueva (CDP es por pestaña).
+            ready_selector: Selector CSS que indica que la página tiene contenido.
+            timeout: Segundos máximos de carga por página.
+            poll_interval: Pausa entre vueltas de sondeo cuando ninguna pestaña terminó.
+        """
+        self.driver = driver
+        self.tabs = max(1, tabs)
+        self.blocked_patterns = blocked_patterns or []
+        self.ready_selector = ready_selector
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.handles: List[str] = []
+        self.unresolved: List[str] = []  # URLs del último scrape() a reintentar (timeout o página de error)
+
+    @classmethod
+    def from_config(cls, driver: webdriver.Chrome, config: Dict[str, Any]) -> 'TabPool':
+        """Crea el pool con EXTRACTOR_CONFIG['tabs'] y el perfil de las páginas de detalle."""
+        tabs_config = config['extractor'].get('tabs', {})
+        profile = config['extractor'].get('driver', {}).get('detail_profile', 'lean')
+        return cls(
+            driver,
+            tabs=tabs_config.get('per_driver', 4),
+            blocked_patterns=blocked_url_patterns(config, profile),
+            timeout=tabs_config.get('timeout', 30),
+            poll_interval=tabs_config.get('poll_interval', 0.05),
+        )
+
+    def open(self) -> None:
+        """Abre las pestañas que falten (la primera es la ventana actual del driver)."""
+        if self.handles:
+            return
+        self.handles = [self.driver.current_window_handle]
+        for _ in range(self.tabs - 1):
+            self.driver.switch_to.new_window('tab')
+            apply_network_blocking(self.driver, self.blocked_patterns)
+            self.handles.append(self.driver.current_window_handle)
+        self.driver.switch_to.window(self.handles[0])
+        logger.info(f"{len(self.handles)} pestañas abiertas en el driver")
+
+    def close(self) -> None:
+        """Cierra las pestañas extra y deja el driver en la primera."""
+        if not self.handles:
+            return
+        try:
+            for handle in self.handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(self.handles[0])
+        except Exception as e:
+            logger.debug(f"Error al cerrar las pestañas: {e}")
+        self.handles = []
+
+    def scrape(self, urls: Iterable[str],
+               harvest: Optional[Callable[[webdriver.Chrome, str], Any]] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Carga las URLs en las pestañas y entrega cada resultado a medida que termina.
+
+        Args:
+            urls: URLs a cargar.
+            harvest: Función (driver, url) que obtiene el resultado de la pestaña lista
+                (activa en el driver). Por defecto, el HTML de la página.
+
+        Yields:
+            Tuple[str, Any]: URL y resultado de `harvest`, o None si la página confirma que
+            el negocio no existe (ver js_extractor.page_is_missing). Las páginas que no
+            cargaron dentro del timeout y las que terminaron sin datos pero no son la página
+            del sitio (errores de red, 5xx, interstitials) no se entregan: quedan en
+            `unresolved` para reintentarlas.
+        """
+        self.open()
+        self.unresolved = []
+        url_iter = iter(urls)
+        limiter = get_rate_limiter()
+        in_flight: Dict[str, Tuple[str, float]] = {} # pestaña -> (URL, inicio de la carga)
+
+        def navigate(handle: str) -> None:
+            url = next(url_iter, None)
+            if url is None:
+                return
+            if limiter is not None:
+                limiter.acquire()
+            self.driver.switch_to.window(handle)
+            self.driver.execute_script(NAVIGATE_SCRIPT, url)
+            in_flight[handle] = (url, time.monotonic())
+
+        for handle in self.handles:
+            navigate(handle)
+
+        while in_flight:
+            finished_any = False
+            for handle in list(in_flight):
+                url, started = in_flight[handle]
+                self.driver.switch_to.window(handle)
+                state = self.driver.execute_script(READY_SCRIPT, self.ready_selector)
+                elapsed = time.monotonic() - started
+                if state is None and elapsed < self.timeout:
+                    continue
+
+                del in_flight[handle]
+                finished_any = True
+
+                if state is None:
+                    logger.warning(f"Tiempo de carga agotado en una pestaña ({self.timeout}s): {url}")
+                    self.driver.execute_script('window.stop();')
+                elif state == 'empty' and not page_is_missing(self.driver):
+                    logger.warning(f"La pestaña terminó sin datos del negocio ni página del sitio, se reintenta: {url}")
+                    state = None
+
+                if limiter is not None:
+                    limiter.record(elapsed, 200 if state is not None else None)
+                if state is None:
+                    self.unresolved.append(url)
+                else:
+                    result = None
+                    if state == 'ready':
+                        result = harvest(self.driver, url) if harvest is not None else self.driver.page_source
+                    yield url, result
+                navigate(handle)
+
+            if not finished_any:
+                time.sleep(self.poll_interval)
+
+
+def tab_pool_for(driver: webdriver.Chrome, config: Dict[str, Any], current: Optional[TabPool] = None) -> TabPool:
+    """
+    Retorna `current` si sigue atado a `driver`; si el driver se recicló, crea un pool
+    nuevo (las pestañas mueren con su navegador).
+    """
+    if current is not None and current.driver is driver:
+        return current
+    return TabPool.from_config(driver, config)
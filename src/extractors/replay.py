@@ -0,0 +1,101 @@
+import gzip
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from bs4 import BeautifulSoup
+
+from . import bulk_scraper
+from .bulk_scraper import BulkScraper
+from .http_fetcher import has_detail_content
+
+logger = logging.getLogger(__name__)
+
+# Extensiones de las páginas de detalle archivadas
+ARCHIVE_SUFFIXES = ('.html', '.htm', '.html.gz')
+
+# Instancia de BulkScraper propia de cada proceso worker (creada por _init_replay_worker)
+_replay_scraper: Optional[BulkScraper] = None
+
+
+def iter_archive(archive_dir: str) -> Iterator[str]:
+    """Recorre recursivamente las páginas archivadas de un directorio, en orden estable."""
+    for root, dirs, files in os.walk(archive_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(ARCHIVE_SUFFIXES):
+                yield os.path.join(root, name)
+
+
+def _init_replay_worker(config: dict) -> None:
+    """Initializer del pool: crea el scraper del proceso worker."""
+    global _replay_scraper
+    _replay_scraper = BulkScraper(config)
+    # Un log INFO por registro frena el re-parseo de cientos de miles de páginas
+    bulk_scraper.logger.setLevel(logging.WARNING)
+
+
+def _parse_archived_page(path: str) -> Optional[Dict]:
+    """
+    Parsea una página archivada con los mismos helpers `_extract_*` del modo bulk.
+    Las páginas sin datos del negocio (errores, placeholders) se descartan, como en el modo bulk.
+    """
+    try:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+            html = f.read()
+
+        # El nombre del archivo es el id_negocio (p. ej. 12345.html)
+        business_id = Path(path).name.split('.')[0]
+        url = f"{_replay_scraper.bulk_config['base_url']}{business_id}"
+        soup = BeautifulSoup(html, 'html.parser')
+        if not has_detail_content(soup):
+            logger.debug(f"Página archivada sin datos del negocio, se descarta: {path}")
+            return None
+        record = _replay_scraper._build_business_info(soup, url)
+        # La fecha de extracción es la del archivo, no la del re-parseo
+        record['fecha_extraccion'] = datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d %H:%M:%S')
+        return record
+    except Exception as e:
+        logger.error(f"Error al re-parsear {path}: {e}")
+        return None
+
+
+def replay_archive(archive_dir: str, config: dict, max_workers: Optional[int] = None,
+                   chunksize: int = 64) -> List[Dict]:
+    """
+    Re-parsea un corpus de páginas de detalle archivadas usando todos los núcleos.
+
+    Args:
+        archive_dir: Directorio con páginas `<id_negocio>.html` (o `.htm`, `.html.gz`).
+        config: Configuración del proyecto.
+        max_workers: Procesos del pool (por defecto, uno por núcleo).
+        chunksize: Páginas enviadas a cada worker por tarea.
+
+    Returns:
+        List[Dict]: Registros con el mismo esquema que el modo bulk.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    logger.info(f"Re-parseando el archivo {archive_dir} con {max_workers} procesos")
+
+    records: List[Dict] = []
+    pages = 0
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_replay_worker,
+                             initargs=(config,)) as executor:
+        for record in executor.map(_parse_archived_page, iter_archive(archive_dir), chunksize=chunksize):
+            pages += 1
+            if record:
+                records.append(record)
+            if pages % 10000 == 0:
+                elapsed = time.monotonic() - start
+                logger.info(f"{pages} páginas re-parseadas ({pages / elapsed:.0f} páginas/s)")
+
+    elapsed = time.monotonic() - start
+    rate = pages / elapsed if elapsed else 0.0
+    logger.info(f"Replay finalizado: {pages} páginas, {len(records)} registros en {elapsed:.1f}s ({rate:.0f} páginas/s)")
+    return records
@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup
+
+from .http_fetcher import HttpFetcher
+
+logger = logging.getLogger(__name__)
+
+# Ruta por defecto del catálogo cacheado de opciones de búsqueda
+CATALOG_PATH = 'data/cache/search_catalog.json'
+
+# URL base de búsqueda avanzada con opción de email (por defecto)
+DEFAULT_SEARCH_URL = "https://www.guiacores.com.ar/index.php?r=search%2Findex&b=&R=&L=&Tm=1"
+
+# Dropdowns del formulario de búsqueda avanzada (también los usa SequentialCollector)
+RUBRO_SELECT_SELECTOR = '#ddlRubroFilter'
+LOCALIDAD_SELECT_SELECTOR = '#ddlLocalidadFilter2'
+
+
+def normalize_option_text(text: str) -> str:
+    """Normaliza el texto de una opción quitando el conteo entre paréntesis."""
+    return re.sub(r'\s*\(.*\)\s*$', '', text).strip().lower()
+
+
+class SearchCatalog:
+    """
+    Catálogo de los valores de rubro (R=) y localidad (L=) del formulario de búsqueda
+    avanzada, cacheado en disco con TTL para construir las URLs de búsqueda directamente.
+    """
+
+    def __init__(self, config: dict, path: Optional[str] = None, ttl: Optional[int] = None):
+        self.config = config
+        self.catalog_config = self.config['extractor'].get('catalog', {})
+        self.path = path or self.catalog_config.get('path', CATALOG_PATH)
+        self.ttl = ttl if ttl is not None else self.catalog_config.get('ttl', 7 * 24 * 3600)
+        self.search_url = self.catalog_config.get('search_url', DEFAULT_SEARCH_URL)
+        self.data: Optional[Dict] = None
+
+    def load(self, driver=None) -> Dict:
+        """
+        Retorna el catálogo desde la caché si está vigente; si no, lo regenera.
+
+        Args:
+            driver: Driver de Selenium opcional, usado si la página no trae las opciones por HTTP.
+        """
+        if self.data is not None:
+            return self.data
+
+        cached = self._read_cache()
+        if cached and time.time() - cached.get('fetched_at', 0) < self.ttl:
+            logger.info(f"Catálogo de búsqueda cargado desde {self.path} "
+                        f"({len(cached['rubros'])} rubros, {len(cached['localidades'])} localidades)")
+            self.data = cached
+            return self.data
+
+        return self.refresh(driver=driver)
+
+    def refresh(self, driver=None) -> Dict:
+        """Descarga las opciones de los dropdowns y actualiza la caché en disco."""
+        logger.info("Actualizando catálogo de rubros y localidades...")
+        with HttpFetcher(self.config) as fetcher:
+            response = fetcher.fetch(self.search_url)
+        html = response.text if response is not None and response.ok else ''
+        data = self._parse_options(html)
+
+        if (not data['rubros'] or not data['localidades']) and driver is not None:
+            logger.info("Las opciones no llegaron por HTTP. Leyéndolas desde el navegador.")
+            driver.get(self.search_url)
+            data = self._parse_options(driver.page_source)
+
+        if not data['rubros'] and not data['localidades']:
+            logger.warning("No se pudieron obtener las opciones de búsqueda. El catálogo queda vacío.")
+            self.data = data
+            return self.data
+
+        self._write_cache(data)
+        logger.info(f"Catálogo actualizado: {len(data['rubros'])} rubros, {len(data['localidades'])} localidades")
+        self.data = data
+        return self.data
+
+    def resolve_rubro(self, text: str) -> Optional[str]:
+        """Retorna el valor R= del rubro, o None si no está en el catálogo."""
+        return self.load().get('rubros', {}).get(normalize_option_text(text))
+
+    def resolve_localidad(self, text: str) -> Optional[str]:
+        """Retorna el valor L= de la localidad, o None si no está en el catálogo."""
+        return self.load().get('localidades', {}).get(normalize_option_text(text))
+
+    @staticmethod
+    def _parse_options(html: str) -> Dict:
+        """Extrae {texto normalizado: valor} de los dropdowns de rubro y localidad."""
+        soup = BeautifulSoup(html or '', 'html.parser')
+        data = {'fetched_at': time.time(), 'rubros': {}, 'localidades': {}}
+        for key, selector in (('rubros', RUBRO_SELECT_SELECTOR), ('localidades', LOCALIDAD_SELECT_SELECTOR)):
+            select = soup.select_one(selector)
+            for option in (select.find_all('option') if select else []):
+                if option.get('value'):
+                    data[key][normalize_option_text(option.get_text())] = option['value']
+        return data
+
+    def _read_cache(self) -> Optional[Dict]:
+        """Lee el catálogo cacheado, si existe y es válido."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"No se pudo leer el catálogo cacheado {self.path}: {e}")
+            return None
+
+    def _write_cache(self, data: Dict) -> None:
+        """Guarda el catálogo de forma atómica."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -1,7 +1,4 @@
-import time
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
@@ -19,11 +16,22 @@ import logging
 import json
 import os
 from datetime import datetime
-import random
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable
 import re
 import sys # Para salir del script en caso de error crítico
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from ..common.config import get_config
 from ..common.versioning import DataVersioning
+from .driver_factory import create_driver
+from .driver_pool import ManagedDriver
+from .http_fetcher import HttpFetcher
+from .search_catalog import (DEFAULT_SEARCH_URL, LOCALIDAD_SELECT_SELECTOR, RUBRO_SELECT_SELECTOR, SearchCatalog,
+                             normalize_option_text)
+from .waits import (DEFAULT_POLL_INTERVAL, PacingPolicy, wait_for_dom_settle, wait_for_new_items,
+                    wait_for_selector, wait_until)
 
 # Configuración básica de logging
 logging.basicConfig(
@@ -40,8 +48,8 @@ logger = logging.getLogger(__name__)
 OUTPUT_DIR = 'data/raw/json_collected_urls'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# URL base de búsqueda avanzada con opción de email (por defecto)
-DEFAULT_SEARCH_URL = "https://www.guiacores.com.ar/index.php?r=search%2Findex&b=&R=&L=&Tm=1"
+# Parámetro de paginación que usa el botón "Ver más" para pedir la siguiente página de resultados
+SEARCH_PAGE_PARAM = 'page'
 
 # Selectores CSS (AJUSTADOS SEGÚN EL HTML PROPORCIONADO)
 BUSINESS_ITEM_SELECTOR = '.card-mobile, .gc-item' # Selector para cada elemento de negocio
@@ -51,29 +59,75 @@ LOADING_INDICATOR_SELECTOR = '#cargando-pagina' # Selector para el indicador de
 # Selectores para la búsqueda avanzada (AJUSTADOS SEGÚN EL HTML PROPORCIONADO)
 BUSQUEDA_AVANZADA_BUTTON_SELECTOR = 'a[data-target="#formBusquedaAvazada"]' # Selector para el enlace/botón que abre la búsqueda avanzada
 BUSQUEDA_AVANZADA_MODAL_SELECTOR = '#formBusquedaAvazada' # Selector para el modal de búsqueda avanzada
-RUBRO_SELECT_SELECTOR = '#ddlRubroFilter' # Selector para el dropdown de rubro
-LOCALIDAD_SELECT_SELECTOR = '#ddlLocalidadFilter2' # Selector para el dropdown de localidad
 ADVANCED_SEARCH_SUBMIT_BUTTON_SELECTOR = '#botonBuscarAvanzada' # Selector para el botón de buscar dentro del formulario avanzado
 
+# Script que retorna solo los hrefs de detalle de los elementos agregados a partir de `offset`,
+# para no transferir ni re-parsear la página completa después de cada "Ver más"
+HARVEST_NEW_ITEMS_SCRIPT = """
+var items = document.querySelectorAll(arguments[0]);
+var offset = arguments[1] <= items.length ? arguments[1] : 0;
+var hrefs = [];
+for (var i = offset; i < items.length; i++) {
+    var link = items[i].querySelector('a[href*="r=search/detail"]');
+    hrefs.push(link ? link.getAttribute('href') : null);
+}
+return {total: items.length, offset: offset, hrefs: hrefs};
+"""
+
 
 class SequentialCollector:
     """Colector para procesar URLs secuencialmente con carga dinámica, con o sin filtros."""
 
-    def __init__(self, rubros: Union[str, List[str]] = None, localidades: Union[str, List[str]] = None):
+    def __init__(self, rubros: Union[str, List[str]] = None, localidades: Union[str, List[str]] = None,
+                 collection_mode: str = 'browser', start_page: int = 1, collectors: Optional[int] = None,
+                 url_sink: Optional[Callable[[str, str], None]] = None):
+        """
+        Args:
+            rubros: Rubro o lista de rubros a recorrer.
+            localidades: Localidad o lista de localidades a recorrer.
+            collection_mode: 'browser' simula los clics en "Ver más" con Selenium;
+                'http' pide las páginas de resultados directamente, sin navegador.
+            start_page: Página desde la que retomar la recolección en modo 'http'. Se aplica
+                solo a la primera combinación (la que se cortó); las demás empiezan en la 1.
+            collectors: Cantidad de colectores (drivers o sesiones HTTP) que procesan
+                combinaciones en paralelo. Por defecto se toma de la configuración.
+            url_sink: Función opcional (id, url) que recibe cada URL nueva apenas se
+                descubre, para que el scraping empiece antes de terminar la recolección.
+        """
         self.logger = logger
         self.config = {
             'load_timeout': 30, # Tiempo máximo de espera para cargar elementos o botón
-            'click_delay': 1, # Pausa después de hacer clic en "Ver más"
             'search_url': DEFAULT_SEARCH_URL,
             'business_selector': BUSINESS_ITEM_SELECTOR,
             'button_selector': VER_MAS_BUTTON_SELECTOR,
             'loading_indicator_selector': LOADING_INDICATOR_SELECTOR,
+            'page_param': SEARCH_PAGE_PARAM,
         }
+        self.collection_mode = collection_mode
+        self.last_page: Optional[int] = None # Última página de resultados procesada (modo 'http')
+        self.fetcher: Optional[HttpFetcher] = None
+        self.catalog = SearchCatalog(get_config())
+        self.waits_config = get_config()['extractor'].get('waits', {})
+        self.poll_interval = self.waits_config.get('poll_interval', DEFAULT_POLL_INTERVAL)
+        self.pacing = PacingPolicy.from_config(get_config(), 'search') # Pausa de cortesía entre cargas de resultados
+        if collectors is None:
+            collectors = get_config()['extractor'].get('sequential', {}).get('collectors', 1)
+        self.collectors = max(1, collectors)
+        self.url_sink = url_sink
 
         self.rubros = self._normalize_list(rubros)
         self.localidades = self._normalize_list(localidades)
-        self.driver: Optional[webdriver.Chrome] = None
+        # Página inicial por combinación (rubro, localidad); compartido con los colectores en paralelo
+        self.start_pages: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        if start_page > 1:
+            first_combination = (self.rubros[0] if self.rubros else None,
+                                 self.localidades[0] if self.localidades else None)
+            self.start_pages[first_combination] = start_page
+        # Driver persistente entre combinaciones: se recicla por RSS y el watchdog mata las sesiones colgadas
+        self.managed = ManagedDriver.from_config(self._create_driver, get_config(), 'sequential')
+        self.hang_retries = get_config()['extractor'].get('watchdog', {}).get('retries', 1)
         self.collected_urls: Dict[str, str] = {} # Diccionario {id: url} para almacenar URLs únicas
+        self._harvest_offset = 0 # Cantidad de elementos de resultados ya procesados en la página actual
         self.versioner = DataVersioning(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
     def _normalize_list(self, value: Union[str, List[str], None]) -> List[str]:
@@ -86,98 +140,59 @@ class SequentialCollector:
             return [value]
         return [str(item).strip() for item in value if item is not None and str(item).strip()]
 
+    @property
+    def driver(self) -> Optional[webdriver.Chrome]:
+        """Driver activo (None si todavía no se creó o se recicló)."""
+        return self.managed.driver
+
+    def _create_driver(self) -> webdriver.Chrome:
+        """Crea un driver de Chrome headless nuevo (factory del ManagedDriver)."""
+        profile = get_config()['extractor'].get('driver', {}).get('search_profile', 'interactive')
+        driver = create_driver(get_config(), profile, page_load_timeout=self.config['load_timeout'])
+        self.logger.info(f"Driver de Chrome configurado exitosamente (perfil '{profile}').")
+        return driver
+
     def setup_driver(self) -> bool:
         """Configura el navegador Selenium en modo headless."""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-notifications')
-            chrome_options.add_argument('--disable-infobars')
-            chrome_options.add_argument('--disable-popup-blocking')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-            service = Service()
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.set_page_load_timeout(self.config['load_timeout'])
-            self.logger.info("Driver de Chrome configurado exitosamente.")
+            self.managed.get()
             return True
 
         except SessionNotCreatedException as e:
             self.logger.critical(f"Error CRÍTICO al iniciar la sesión del navegador. Asegúrate de tener Chrome/Chromium instalado y un chromedriver compatible en tu PATH. Error: {e}")
-            self.driver = None
             return False
         except Exception as e:
             self.logger.critical(f"Error CRÍTICO al configurar el driver de Chrome: {e}")
-            if self.driver:
-                try:
-                    self.driver.quit()
-                except:
-                    pass
-            self.driver = None
+            self.managed.quit()
             return False
 
     def collect_urls(self, progress_callback=None) -> Dict[str, str]:
         """
         Procesa URLs secuencialmente para las combinaciones de rubro/localidad.
         Retorna un diccionario {id: url} de todas las URLs únicas recolectadas.
+        Con collectors > 1 las combinaciones se reparten entre varios colectores en paralelo.
         
         Args:
             progress_callback: Función opcional para reportar progreso (current_count, total_count, message)
         """
-        if not self.setup_driver():
+        combinations_to_process = self._build_combinations()
+        if not combinations_to_process:
+            self.logger.warning("No hay combinaciones válidas para procesar.")
+            return {}
+
+        if self.collectors > 1 and len(combinations_to_process) > 1:
+            return self._collect_parallel(combinations_to_process, progress_callback)
+
+        if not self._open_session():
             self.logger.error("No se pudo configurar el driver. Abortando recolección.")
             return {}
 
         all_collected_urls: Dict[str, str] = {} # Diccionario para acumular URLs de todas las combinaciones
 
         try:
-            combinations_to_process: List[Tuple[Optional[str], Optional[str]]] = []
-
-            # Construir la lista de combinaciones a procesar
-            if not self.rubros and not self.localidades:
-                combinations_to_process.append((None, None))
-                self.logger.info("No se especificaron rubros ni localidades. Procesando la búsqueda por defecto.")
-            elif self.rubros and not self.localidades:
-                 combinations_to_process.extend([(r, None) for r in self.rubros])
-                 self.logger.info(f"Procesando los siguientes rubros: {self.rubros}")
-            elif not self.rubros and self.localidades:
-                 combinations_to_process.extend([(None, l) for l in self.localidades])
-                 self.logger.info(f"Procesando las siguientes localidades: {self.localidades}")
-            else:
-                combinations_to_process.extend([(r, l) for r in self.rubros for l in self.localidades])
-                self.logger.info(f"Procesando las siguientes combinaciones (Rubro, Localidad): {combinations_to_process}")
-
-            if not combinations_to_process:
-                 self.logger.warning("No hay combinaciones válidas para procesar.")
-                 return {}
-
-
             # Procesar cada combinación secuencialmente
             for rubro, localidad in combinations_to_process:
-                self.logger.info("="*50)
-                self.logger.info(f"Iniciando recolección para Rubro: {rubro if rubro else 'Por defecto'}, Localidad: {localidad if localidad else 'Por defecto'}")
-                self.logger.info("="*50)
-
-                # Resetear las URLs recolectadas para esta combinación
-                self.collected_urls = {}
-
-                try:
-                    self._process_search(rubro, localidad, progress_callback)
-                    self.logger.info(f"Recolección finalizada para Rubro: {rubro if rubro else 'Por defecto'}, Localidad: {localidad if localidad else 'Por defecto'}.")
-                    self.logger.info(f"URLs únicas recolectadas en esta combinación: {len(self.collected_urls)}")
-
-                    # Añadir las URLs recolectadas en esta combinación al acumulado total
-                    all_collected_urls.update(self.collected_urls)
-
-                except Exception as e:
-                    self.logger.error(f"Error al procesar la combinación (Rubro: {rubro}, Localidad: {localidad}): {e}")
-                    # Continuar con la siguiente combinación si hay un error en una
+                all_collected_urls.update(self._collect_combination(rubro, localidad, progress_callback))
 
             self.logger.info("="*50)
             self.logger.info(f"Proceso de recolección de todas las combinaciones finalizado.")
@@ -193,6 +208,178 @@ class SequentialCollector:
         finally:
             self.cleanup()
 
+    def _build_combinations(self) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Construye la lista de combinaciones (rubro, localidad) a procesar."""
+        combinations_to_process: List[Tuple[Optional[str], Optional[str]]] = []
+
+        if not self.rubros and not self.localidades:
+            combinations_to_process.append((None, None))
+            self.logger.info("No se especificaron rubros ni localidades. Procesando la búsqueda por defecto.")
+        elif self.rubros and not self.localidades:
+            combinations_to_process.extend([(r, None) for r in self.rubros])
+            self.logger.info(f"Procesando los siguientes rubros: {self.rubros}")
+        elif not self.rubros and self.localidades:
+            combinations_to_process.extend([(None, l) for l in self.localidades])
+            self.logger.info(f"Procesando las siguientes localidades: {self.localidades}")
+        else:
+            combinations_to_process.extend([(r, l) for r in self.rubros for l in self.localidades])
+            self.logger.info(f"Procesando las siguientes combinaciones (Rubro, Localidad): {combinations_to_process}")
+
+        return combinations_to_process
+
+    def _open_session(self) -> bool:
+        """Abre la sesión HTTP o el driver según el modo de recolección."""
+        if self.collection_mode == 'http':
+            self.fetcher = HttpFetcher(get_config())
+            return True
+        return self.setup_driver()
+
+    def _collect_combination(self, rubro: Optional[str], localidad: Optional[str], progress_callback=None) -> Dict[str, str]:
+        """
+        Recolecta las URLs de una combinación de rubro/localidad con la sesión ya abierta.
+        Retorna el diccionario {id: url} de la combinación (vacío si falló).
+        """
+        self.logger.info("="*50)
+        self.logger.info(f"Iniciando recolección para Rubro: {rubro if rubro else 'Por defecto'}, Localidad: {localidad if localidad else 'Por defecto'}")
+        self.logger.info("="*50)
+
+        # Resetear las URLs recolectadas para esta combinación
+        self.collected_urls = {}
+
+        try:
+            if self.collection_mode == 'http':
+                self._process_search_http(rubro, localidad, progress_callback)
+            else:
+                # Si el driver se cuelga, el watchdog lo mata y la combinación se reintenta con uno nuevo
+                # (las URLs ya recolectadas se conservan; el driver también se recicla aquí si superó sus topes)
+                self.managed.run(lambda driver: self._process_search(rubro, localidad, progress_callback),
+                                 label=f"la combinación ({rubro}, {localidad})", retries=self.hang_retries)
+            self.logger.info(f"Recolección finalizada para Rubro: {rubro if rubro else 'Por defecto'}, Localidad: {localidad if localidad else 'Por defecto'}.")
+            self.logger.info(f"URLs únicas recolectadas en esta combinación: {len(self.collected_urls)}")
+            return dict(self.collected_urls)
+
+        except Exception as e:
+            self.logger.error(f"Error al procesar la combinación (Rubro: {rubro}, Localidad: {localidad}): {e}")
+            # Continuar con la siguiente combinación si hay un error en una
+            return {}
+
+    def _collect_parallel(self, combinations: List[Tuple[Optional[str], Optional[str]]], progress_callback=None) -> Dict[str, str]:
+        """
+        Reparte las combinaciones entre `collectors` colectores, cada uno con su propio driver
+        o sesión HTTP. Las combinaciones se toman de una cola ordenada de mayor a menor tamaño
+        estimado, y los resultados se fusionan descartando IDs repetidos entre combinaciones.
+        """
+        estimates = self._estimate_combination_sizes(combinations)
+        # Las combinaciones sin estimación se programan primero: pueden ser las más grandes
+        ordered = [c for c in combinations if estimates[c] is None]
+        ordered += sorted((c for c in combinations if estimates[c] is not None), key=lambda c: estimates[c], reverse=True)
+
+        pending: "queue.Queue[Tuple[Optional[str], Optional[str]]]" = queue.Queue()
+        for combination in ordered:
+            pending.put(combination)
+
+        num_collectors = min(self.collectors, len(combinations))
+        self.logger.info(f"Recolección en paralelo de {len(combinations)} combinaciones con {num_collectors} colectores.")
+
+        lock = threading.Lock()
+        all_collected_urls: Dict[str, str] = {}
+        counts: Dict[Tuple[Optional[str], Optional[str]], int] = {c: 0 for c in combinations}
+        totals: Dict[Tuple[Optional[str], Optional[str]], Optional[int]] = dict(estimates)
+        finished: List[Tuple[Optional[str], Optional[str]]] = []
+        duplicates = 0
+
+        def combination_callback(combination):
+            """Progreso de una combinación, reportado como agregado de todas."""
+            def callback(current_count, total_count, message):
+                with lock:
+                    counts[combination] = current_count
+                    if total_count:
+                        totals[combination] = total_count
+                    if progress_callback:
+                        known_totals = [t for t in totals.values() if t]
+                        aggregate_total = sum(known_totals) if known_totals else None
+                        aggregate_count = sum(counts.values())
+                        msg = f"Recolectados {aggregate_count} URLs"
+                        if aggregate_total:
+                            msg += f" de aprox. {aggregate_total}"
+                        msg += f" ({len(finished)}/{len(combinations)} combinaciones finalizadas)"
+                        progress_callback(aggregate_count, aggregate_total, msg)
+            return callback
+
+        def run_collector(index: int) -> None:
+            nonlocal duplicates
+            worker = self._spawn_worker()
+            if not worker._open_session():
+                self.logger.error(f"El colector {index} no pudo iniciar su sesión. Sus combinaciones quedan para los demás.")
+                return
+            try:
+                while True:
+                    try:
+                        combination = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    urls = worker._collect_combination(*combination, progress_callback=combination_callback(combination))
+                    with lock:
+                        for business_id, url in urls.items():
+                            if business_id in all_collected_urls:
+                                duplicates += 1
+                            else:
+                                all_collected_urls[business_id] = url
+                        finished.append(combination)
+                    combination_callback(combination)(len(urls), totals[combination], "Combinación finalizada")
+            finally:
+                worker.cleanup()
+
+        with ThreadPoolExecutor(max_workers=num_collectors) as executor:
+            futures = [executor.submit(run_collector, i + 1) for i in range(num_collectors)]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(f"Error en un colector paralelo: {e}")
+
+        if not pending.empty():
+            self.logger.warning(f"Quedaron {pending.qsize()} combinaciones sin procesar (ningún colector disponible).")
+
+        self.collected_urls = all_collected_urls
+        self.logger.info("="*50)
+        self.logger.info(f"Proceso de recolección en paralelo finalizado ({len(finished)}/{len(combinations)} combinaciones).")
+        self.logger.info(f"Total de URLs únicas recolectadas en todas las combinaciones: {len(all_collected_urls)} ({duplicates} repetidas entre combinaciones)")
+        self.logger.info("="*50)
+        return all_collected_urls
+
+    def _spawn_worker(self) -> 'SequentialCollector':
+        """Crea un colector con la misma configuración para procesar combinaciones en paralelo."""
+        worker = SequentialCollector(collection_mode=self.collection_mode, collectors=1, url_sink=self.url_sink)
+        worker.config = dict(self.config)
+        worker.start_pages = self.start_pages
+        return worker
+
+    def _estimate_combination_sizes(self, combinations: List[Tuple[Optional[str], Optional[str]]]) -> Dict[Tuple[Optional[str], Optional[str]], Optional[int]]:
+        """
+        Estima la cantidad de resultados de cada combinación leyendo el total de coincidencias
+        de la primera página de resultados por HTTP. Retorna None para las que no se pudieron estimar.
+        """
+        estimates: Dict[Tuple[Optional[str], Optional[str]], Optional[int]] = {c: None for c in combinations}
+        urls: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for rubro, localidad in combinations:
+            rubro_value = self._resolve_filter_value('rubro', rubro) if rubro else ''
+            localidad_value = self._resolve_filter_value('localidad', localidad) if localidad else ''
+            if rubro_value is None or localidad_value is None:
+                continue # Sin el valor del filtro la URL devolvería otra búsqueda
+            urls[self._build_search_url(rubro_value, localidad_value)] = (rubro, localidad)
+
+        with HttpFetcher(get_config()) as fetcher:
+            for url, response in fetcher.fetch_many(urls):
+                if response is None or not response.ok:
+                    continue
+                total_element = BeautifulSoup(response.text, 'html.parser').select_one('h5.text-primary')
+                if total_element:
+                    estimates[urls[url]] = self._parse_total_matches(total_element.get_text())
+
+        self.logger.info(f"Tamaño estimado de las combinaciones: {estimates}")
+        return estimates
+
     def _process_search(self, rubro: Optional[str] = None, localidad: Optional[str] = None, progress_callback=None):
         """
         Navega a la página de búsqueda (con o sin filtros) y simula clics en 'Ver Más'.
@@ -202,25 +389,33 @@ class SequentialCollector:
              return
 
         try:
-            self.logger.info("Navegando a la página de búsqueda...")
-            self.driver.get(self.config['search_url'])
-            self.logger.info(f"Página cargada: {self.config['search_url']}")
-
-            # Si se especificaron filtros, interactuar con la búsqueda avanzada
-            if rubro or localidad:
-                self._apply_advanced_filters(rubro, localidad)
+            self._harvest_offset = 0
+
+            # Con los valores del catálogo se navega directo a la búsqueda filtrada;
+            # el formulario de búsqueda avanzada queda como respaldo si algún filtro no se resuelve
+            rubro_value = self._resolve_filter_value('rubro', rubro) if rubro else ''
+            localidad_value = self._resolve_filter_value('localidad', localidad) if localidad else ''
+
+            if rubro_value is not None and localidad_value is not None:
+                search_url = self._build_search_url(rubro_value, localidad_value)
+                self.logger.info(f"Navegando a la búsqueda: {search_url}")
+                self.driver.get(search_url)
+                self.managed.progress()
+                # Esperar a que carguen los primeros resultados
+                try:
+                    wait_for_selector(self.driver, self.config['business_selector'], self.config['load_timeout'], self.poll_interval)
+                    self.logger.info("Resultados iniciales cargados.")
+                except TimeoutException:
+                    self.logger.warning("Tiempo de espera agotado esperando resultados iniciales. Puede que no haya resultados para esta combinación o la página cargó diferente.")
+                except Exception as e:
+                    self.logger.error(f"Error inesperado esperando resultados iniciales: {e}")
             else:
-                # Si no hay filtros, esperar a que carguen los primeros resultados por defecto
-                 self.logger.info("Sin filtros aplicados. Esperando carga inicial de resultados por defecto.")
-                 try:
-                     WebDriverWait(self.driver, self.config['load_timeout']).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, self.config['business_selector']))
-                    )
-                     self.logger.info("Resultados iniciales por defecto cargados.")
-                 except TimeoutException:
-                     self.logger.warning("Tiempo de espera agotado esperando resultados iniciales por defecto. Puede que no haya resultados o la página cargó diferente.")
-                 except Exception as e:
-                     self.logger.error(f"Error inesperado esperando resultados iniciales por defecto: {e}")
+                self.logger.info("Navegando a la página de búsqueda...")
+                self.driver.get(self.config['search_url'])
+                self.managed.progress()
+                self.logger.info(f"Página cargada: {self.config['search_url']}")
+                self._apply_advanced_filters(rubro, localidad)
+                self.managed.progress()
 
 
             # Intentar extraer el total de coincidencias
@@ -240,6 +435,91 @@ class SequentialCollector:
             self.logger.error(f"Error inesperado durante el proceso de búsqueda inicial o aplicación de filtros: {e}")
             raise # Relanzar la excepción para que la gestione collect_urls
 
+    def _process_search_http(self, rubro: Optional[str] = None, localidad: Optional[str] = None, progress_callback=None):
+        """
+        Recorre las páginas de resultados pidiéndolas por HTTP con offsets explícitos,
+        en lugar de simular clics en 'Ver Más'. Se detiene al alcanzar el total de coincidencias,
+        al recibir una página sin resultados nuevos o al fallar una descarga.
+        """
+        # Sin navegador no hay formulario de respaldo: un filtro que no se resuelve no se aplica
+        rubro_value = (self._resolve_filter_value('rubro', rubro) or '') if rubro else ''
+        localidad_value = (self._resolve_filter_value('localidad', localidad) or '') if localidad else ''
+
+        start_page = self.start_pages.pop((rubro, localidad), 1)
+        page = start_page
+        total_matches = None
+        self.logger.info(f"Iniciando recolección por HTTP desde la página {page}.")
+
+        while True:
+            self.pacing.wait()
+            url = self._build_search_url(rubro_value, localidad_value, page)
+            # La primera página pedida se trae completa (incluye el total de coincidencias);
+            # las siguientes se piden como el AJAX de "Ver más"
+            headers = {'X-Requested-With': 'XMLHttpRequest'} if page > start_page else None
+            response = self.fetcher.fetch(url, headers=headers)
+            if response is None or not response.ok:
+                self.logger.warning(f"No se pudo obtener la página {page} de resultados de (Rubro: {rubro}, Localidad: {localidad}). "
+                                    f"Se puede retomar esa combinación con start_page={page}.")
+                break
+
+            soup = BeautifulSoup(response.text, 'html.parser')
+            if total_matches is None:
+                total_element = soup.select_one('h5.text-primary')
+                total_matches = self._parse_total_matches(total_element.get_text()) if total_element else None
+                if total_matches is not None:
+                    self.logger.info(f"Total de coincidencias encontradas: {total_matches}")
+                    if progress_callback:
+                        progress_callback(0, total_matches, f"Iniciando recolección. Total estimado: {total_matches}")
+
+            business_elements = soup.select(self.config['business_selector'])
+            newly_added_count = 0
+            for business_elem in business_elements:
+                detail_link_tag = business_elem.select_one('a[href*="r=search/detail"]')
+                if detail_link_tag and detail_link_tag.get('href') and self._register_detail_href(detail_link_tag['href']):
+                    newly_added_count += 1
+
+            self.last_page = page
+            current_element_count = len(self.collected_urls)
+            self.logger.info(f"Página {page}: {newly_added_count} URLs nuevas. Total recolectado: {current_element_count}")
+            if progress_callback:
+                msg = f"Recolectados {current_element_count} URLs"
+                if total_matches:
+                    msg += f" de aprox. {total_matches}"
+                progress_callback(current_element_count, total_matches, msg)
+
+            if not business_elements or newly_added_count == 0:
+                self.logger.info("Página sin resultados nuevos. Asumiendo fin de resultados.")
+                break
+            if total_matches is not None and current_element_count >= total_matches:
+                self.logger.info("Se alcanzó el total de coincidencias.")
+                break
+
+            page += 1
+
+    def _build_search_url(self, rubro_value: str = '', localidad_value: str = '', page: Optional[int] = None) -> str:
+        """Construye la URL de búsqueda con los valores de rubro (R), localidad (L) y página."""
+        parsed = urlparse(self.config['search_url'])
+        params = {key: values[0] for key, values in parse_qs(parsed.query, keep_blank_values=True).items()}
+        params['R'] = rubro_value
+        params['L'] = localidad_value
+        params['Tm'] = '1'
+        if page and page > 1:
+            params[self.config['page_param']] = str(page)
+        return urlunparse(parsed._replace(query=urlencode(params)))
+
+    def _resolve_filter_value(self, kind: str, text: str) -> Optional[str]:
+        """
+        Busca en el catálogo cacheado el valor de un rubro o localidad.
+        Retorna None si no hay una opción coincidente.
+        """
+        self.catalog.load(driver=self.driver)
+        value = self.catalog.resolve_rubro(text) if kind == 'rubro' else self.catalog.resolve_localidad(text)
+        if value is None:
+            self.logger.warning(f"No se encontró en el catálogo una opción coincidente para {kind} '{text}'.")
+        else:
+            self.logger.info(f"Coincidencia en el catálogo para {kind} '{text}' (Valor: {value})")
+        return value
+
     def _apply_advanced_filters(self, rubro: Optional[str], localidad: Optional[str]):
         """
         Interactúa con el formulario de búsqueda avanzada para aplicar filtros.
@@ -278,10 +558,10 @@ class SequentialCollector:
                     rubro_select = Select(rubro_select_element)
                     self.logger.info(f"Dropdown de Rubro encontrado. Buscando opción para: '{rubro}'")
 
-                    rubro_cleaned = re.sub(r'\s*\(.*\)\s*$', '', rubro).strip().lower()
+                    rubro_cleaned = normalize_option_text(rubro)
                     found_option_value = None
                     for option in rubro_select.options:
-                        option_text_cleaned = re.sub(r'\s*\(.*\)\s*$', '', option.text).strip().lower()
+                        option_text_cleaned = normalize_option_text(option.text)
                         if option_text_cleaned == rubro_cleaned:
                             found_option_value = option.get_attribute("value")
                             self.logger.info(f"Coincidencia exacta encontrada para Rubro: '{rubro}' -> '{option.text}' (Valor: {found_option_value})")
@@ -312,10 +592,10 @@ class SequentialCollector:
                     localidad_select = Select(localidad_select_element)
                     self.logger.info(f"Dropdown de Localidad encontrado. Buscando opción para: '{localidad}'")
 
-                    localidad_cleaned = re.sub(r'\s*\(.*\)\s*$', '', localidad).strip().lower()
+                    localidad_cleaned = normalize_option_text(localidad)
                     found_option_value = None
                     for option in localidad_select.options:
-                         option_text_cleaned = re.sub(r'\s*\(.*\)\s*$', '', option.text).strip().lower()
+                         option_text_cleaned = normalize_option_text(option.text)
                          if option_text_cleaned == localidad_cleaned:
                              found_option_value = option.get_attribute("value")
                              self.logger.info(f"Coincidencia exacta encontrada para Localidad: '{localidad}' -> '{option.text}' (Valor: {found_option_value})")
@@ -469,6 +749,7 @@ class SequentialCollector:
 
             # Extraer URLs de los elementos actualmente visibles en el DOM
             self._extract_urls_from_current_page()
+            self.managed.progress() # Cada carga completada cuenta como progreso para el watchdog
             current_element_count = len(self.collected_urls) # Contar elementos únicos recolectados hasta ahora
             
             self.logger.info(f"Elementos únicos recolectados hasta ahora: {current_element_count}")
@@ -495,51 +776,31 @@ class SequentialCollector:
             last_element_count = current_element_count
 
             try:
+                # Pausa de cortesía: solo se espera lo que falte desde la carga anterior
+                self.pacing.wait()
+
                 # Esperar a que el indicador de carga esté oculto antes de buscar el botón
-                WebDriverWait(self.driver, self.config['load_timeout']).until(
-                     EC.invisibility_of_element_located((By.CSS_SELECTOR, self.config['loading_indicator_selector']))
-                )
-                # self.logger.debug("Indicador de carga oculto.")
+                wait_until(self.driver, EC.invisibility_of_element_located((By.CSS_SELECTOR, self.config['loading_indicator_selector'])),
+                           self.config['load_timeout'], self.poll_interval)
 
                 # Intentar encontrar el botón 'Ver Más' y verificar si es clickeable
-                ver_mas_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, self.config['button_selector']))
-                )
-                # self.logger.debug("Botón 'Ver Más' encontrado y clickeable.")
+                ver_mas_button = wait_until(self.driver, EC.element_to_be_clickable((By.CSS_SELECTOR, self.config['button_selector'])),
+                                            5, self.poll_interval)
 
-                # Hacer scroll hasta el botón
+                # Hacer scroll hasta el botón (scrollIntoView es síncrono, no hace falta esperar)
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", ver_mas_button)
-                time.sleep(0.5)
 
                 # Hacer clic en el botón
                 ver_mas_button.click()
                 self.logger.info("Clic en 'Ver Más' realizado. Esperando nueva carga...")
 
-                # Esperar a que el indicador de carga aparezca y luego desaparezca
-                try:
-                    WebDriverWait(self.driver, 5).until(
-                        EC.visibility_of_element_located((By.CSS_SELECTOR, self.config['loading_indicator_selector']))
-                    )
-                    # self.logger.debug("Indicador de carga visible.")
-
-                    WebDriverWait(self.driver, self.config['load_timeout']).until(
-                        EC.invisibility_of_element_located((By.CSS_SELECTOR, self.config['loading_indicator_selector']))
-                    )
-                    self.logger.info("Contenido cargado (indicador de carga oculto).")
-
-                except TimeoutException:
-                    self.logger.warning("Tiempo de espera agotado esperando el ciclo de carga (indicador). Puede que no haya más contenido o un problema. Terminando bucle de clics.")
-                    # Si el indicador no aparece/desaparece, intentar extraer y salir del bucle
+                # Esperar a que se agreguen resultados nuevos al DOM (MutationObserver): retorna apenas llegan
+                item_count = wait_for_new_items(self.driver, self.config['business_selector'], self._harvest_offset, self.config['load_timeout'])
+                if item_count <= self._harvest_offset:
+                    self.logger.warning("Tiempo de espera agotado sin resultados nuevos tras el clic. Puede que no haya más contenido o un problema. Terminando bucle de clics.")
                     self._extract_urls_from_current_page()
                     break
-                except Exception as e:
-                    self.logger.error(f"Error inesperado esperando el ciclo de carga (indicador): {e}. Terminando bucle de clics.")
-                    self._extract_urls_from_current_page()
-                    break
-
-
-                # Pausa aleatoria después de la carga exitosa
-                time.sleep(random.uniform(1, 2))
+                self.logger.info(f"Contenido cargado ({item_count - self._harvest_offset} resultados nuevos).")
 
             except (NoSuchElementException, ElementNotInteractableException, ElementClickInterceptedException):
                 self.logger.info("Botón 'Ver Más' no encontrado o no interactuable. Asumiendo fin de resultados.")
@@ -549,7 +810,7 @@ class SequentialCollector:
                 break
             except StaleElementReferenceException:
                 self.logger.warning("StaleElementReferenceException: El botón 'Ver Más' se volvió obsoleto. Reintentando en la próxima iteración.")
-                time.sleep(random.uniform(2, 4))
+                wait_for_dom_settle(self.driver, self.waits_config.get('dom_quiet_ms', 150))
                 continue
             except Exception as e:
                 self.logger.error(f"Ocurrió un error inesperado durante el bucle de clics: {e}. Terminando la recolección para esta combinación.")
@@ -562,46 +823,56 @@ class SequentialCollector:
 
     def _extract_urls_from_current_page(self):
         """
-        Extrae URLs de negocios del contenido HTML actualmente cargado y las añade al diccionario.
+        Extrae las URLs de los negocios agregados al DOM desde la última extracción y las añade al diccionario.
+        Solo se transfieren los hrefs de los elementos nuevos, por lo que el costo no crece con los resultados ya cargados.
         """
         if not self.driver:
              self.logger.error("Driver no inicializado en _extract_urls_from_current_page.")
              return
 
         try:
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            harvest = self.driver.execute_script(HARVEST_NEW_ITEMS_SCRIPT, self.config['business_selector'], self._harvest_offset)
 
-            business_elements = soup.select(self.config['business_selector'])
-            # self.logger.debug(f"Encontrados {len(business_elements)} elementos de negocio en el DOM actual para extracción.")
+            if harvest['offset'] < self._harvest_offset:
+                # La lista de resultados se volvió a renderizar desde cero
+                self.logger.debug("La lista de resultados se reinició. Recorriendo desde el principio.")
+            self._harvest_offset = harvest['total']
 
             newly_added_count = 0
-            for business_elem in business_elements:
+            for href in harvest['hrefs']:
                 try: # Añadir try-except alrededor de la extracción de cada elemento por si alguno falla
-                    detail_link_tag = business_elem.select_one('a[href*="r=search/detail"]')
-                    if detail_link_tag and 'href' in detail_link_tag.attrs:
-                        detail_url = detail_link_tag['href']
-                        if not detail_url.startswith('http'):
-                             detail_url = f"https://www.guiacores.com.ar/{detail_url}"
-
-                        from urllib.parse import urlparse, parse_qs
-                        parsed_detail_url = urlparse(detail_url)
-                        detail_query_params = parse_qs(parsed_detail_url.query)
-                        business_id = detail_query_params.get('id', [None])[0]
-
-                        if business_id:
-                            if business_id not in self.collected_urls:
-                                self.collected_urls[business_id] = detail_url
-                                newly_added_count += 1
-                            # else: self.logger.debug(f"ID duplicado encontrado y omitido: {business_id}")
+                    if href and self._register_detail_href(href):
+                        newly_added_count += 1
                 except Exception as e:
                     self.logger.warning(f"Error al procesar un elemento de negocio en la página actual: {e}. Saltando este elemento.")
 
-
             # self.logger.debug(f"Nuevas URLs únicas añadidas al diccionario en esta extracción: {newly_added_count}")
 
         except Exception as e:
             self.logger.error(f"Error general al extraer URLs de la página actual: {e}")
 
+    def _register_detail_href(self, detail_url: str) -> bool:
+        """
+        Normaliza el href de una página de detalle y lo añade al diccionario si su ID es nuevo.
+        Retorna True si se añadió una URL nueva.
+        """
+        if not detail_url.startswith('http'):
+             detail_url = f"https://www.guiacores.com.ar/{detail_url}"
+
+        parsed_detail_url = urlparse(detail_url)
+        detail_query_params = parse_qs(parsed_detail_url.query)
+        business_id = detail_query_params.get('id', [None])[0]
+
+        if business_id and business_id not in self.collected_urls:
+            self.collected_urls[business_id] = detail_url
+            if self.url_sink:
+                # El sink puede bloquearse por backpressure de los scrapers: no es un driver colgado
+                with self.managed.paused():
+                    self.url_sink(business_id, detail_url)
+            return True
+        # else: self.logger.debug(f"ID duplicado encontrado y omitido: {business_id}")
+        return False
+
 
     def _extract_total_matches(self) -> Optional[int]:
         """
@@ -615,21 +886,9 @@ class SequentialCollector:
             # Buscar el elemento que contiene el texto
             # Usamos una espera corta porque debería estar visible si cargaron los resultados
             try:
-                element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "h5.text-primary"))
-                )
-                text = element.text
-                # Buscar patrón numérico antes de "coincidencias"
-                # Ejemplo: "Su búsqueda ... ha generado 735 coincidencias"
-                match = re.search(r'generado\s+(\d+)\s+coincidencias', text)
-                if match:
-                    return int(match.group(1))
-                
-                # Intento alternativo solo buscando números y "coincidencias"
-                match = re.search(r'(\d+)\s+coincidencias', text)
-                if match:
-                    return int(match.group(1))
-                    
+                element = wait_for_selector(self.driver, "h5.text-primary", 5, self.poll_interval)
+                return self._parse_total_matches(element.text)
+
             except TimeoutException:
                 self.logger.debug("No se encontró el elemento de conteo de coincidencias (h5.text-primary).")
                 
@@ -638,6 +897,22 @@ class SequentialCollector:
             
         return None
 
+    @staticmethod
+    def _parse_total_matches(text: str) -> Optional[int]:
+        """Extrae el número de coincidencias del texto del encabezado de resultados."""
+        # Buscar patrón numérico antes de "coincidencias"
+        # Ejemplo: "Su búsqueda ... ha generado 735 coincidencias"
+        match = re.search(r'generado\s+(\d+)\s+coincidencias', text)
+        if match:
+            return int(match.group(1))
+
+        # Intento alternativo solo buscando números y "coincidencias"
+        match = re.search(r'(\d+)\s+coincidencias', text)
+        if match:
+            return int(match.group(1))
+
+        return None
+
     def save_urls(self, filename_suffix: str = "") -> Optional[str]:
         """
         Guarda las URLs recolectadas en un archivo JSON con versionado.
@@ -668,14 +943,14 @@ class SequentialCollector:
             return None
 
     def cleanup(self) -> None:
-        """Cierra el driver de Selenium al finalizar."""
+        """Cierra el driver de Selenium y la sesión HTTP al finalizar."""
         if self.driver:
-            try:
-                self.driver.quit()
-                self.logger.info("Driver de Chrome cerrado.")
-            except Exception as e:
-                self.logger.debug(f"Error al cerrar el driver: {e}")
-            self.driver = None
+            self.logger.info(f"Cerrando driver de Chrome ({self.managed.stats['drivers_started']} iniciados, "
+                             f"{self.managed.stats['recycles']} reciclados, {self.managed.stats['kills']} colgados reiniciados).")
+        self.managed.close()
+        if self.fetcher:
+            self.fetcher.close()
+            self.fetcher = None
 
 # Ejemplo de uso
 if __name__ == "__main__":
@@ -1,11 +1,5 @@
-import time
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import logging
@@ -20,8 +14,21 @@ import multiprocessing
 from concurrent.futures import ProcessPoolExecutor
 import signal
 import atexit
+from multiprocessing import util as mp_util
 from typing import List, Dict, Any, Optional
 
+from ..common.config import get_config
+from ..common.claim_store import ClaimStore
+from ..common.page_store import PageStore
+from ..common.processed_index import ProcessedIdIndex
+from ..common.rate_limiter import SharedRateLimiter, install_rate_limiter, throttled
+from ..common.utils import extract_id_from_url
+from .driver_factory import create_driver
+from .driver_pool import ManagedDriver
+from .multi_tab import TabPool, tab_pool_for
+from .http_fetcher import HttpFetcher, has_detail_content
+from .waits import DEFAULT_POLL_INTERVAL, PacingPolicy, wait_for_dom_settle, wait_for_selector
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +40,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Instancia de GuiaCoresScraper propia de cada proceso worker (creada por init_sequential_worker)
+_worker_scraper: Optional['GuiaCoresScraper'] = None
+
 # --- Helper Functions (Mantener las existentes) ---
 def check_chrome_installation():
     """Verifica si Chrome o Chromium está instalado en el sistema"""
@@ -76,10 +86,21 @@ def install_chrome():
 
 
 class GuiaCoresScraper:
-    def __init__(self, start_id=None, end_id=None, resume=True, driver=None):
+    def __init__(self, start_id=None, end_id=None, resume=True, driver=None, config=None, engine='http', write_csv=True):
         self.base_url = "https://www.guiacores.com.ar/index.php"
         self.search_url = f"{self.base_url}?r=search%2Findex&b=&R=&L=&Tm=1" # Esta URL no se usa para scraping detallado por lista
-        self.driver = driver # Permite pasar un driver ya existente
+        self.config = config or get_config()
+        # Driver persistente: se recicla por páginas o RSS y el watchdog mata las sesiones colgadas
+        self.managed = ManagedDriver.from_config(self._create_driver, self.config, 'sequential')
+        self.managed.driver = driver # Permite pasar un driver ya existente
+        # Motor para las páginas de detalle: 'http' (con fallback a Selenium), 'selenium' o 'tabs'
+        self.engine = engine
+        # Pestañas del driver (motor 'tabs'); se recrean si el driver se recicla
+        self._tabs: Optional[TabPool] = None
+        self.fetcher: Optional[HttpFetcher] = None
+        self.waits_config = self.config['extractor'].get('waits', {})
+        self.pacing = PacingPolicy.from_config(self.config, 'detail')
+        self.page_store = PageStore(self.config)
         self.start_time = datetime.now()
         self.stats = {
             'pages_scraped': 0, # Estadísticas a nivel de instancia, no por chunk
@@ -90,100 +111,86 @@ class GuiaCoresScraper:
         }
         self.start_id = start_id # Estos se usarán para el modo bulk si se adapta
         self.end_id = end_id   # Estos se usarán para el modo bulk si se adapta
-        self.resume = resume # Esto se usa principalmente para cargar processed_ids
+        self.resume = resume # Si es True se saltean los IDs que ya están en el índice de procesados
 
-        self.processed_ids = set()
-
-        # Cargar IDs ya procesados si estamos resumiendo
-        if self.resume:
-            self.load_processed_ids()
+        # Índice mapeado en memoria de IDs ya guardados en el CSV: abrirlo es O(1)
+        # y se comparte entre procesos, así que no hace falta releer el CSV en cada chunk
+        self.processed_index = ProcessedIdIndex(self.config)
+        # Reclamos atómicos entre procesos: cada ID se descarga una sola vez aunque
+        # dos chunks concurrentes (o una ejecución reiniciada) lo reciban
+        self.claims = ClaimStore(self.config)
+        # Con write_csv=False los registros solo se retornan: los escribe (y confirma) el CsvWriter del proceso principal
+        self.write_csv = write_csv
 
         # El driver NO se inicializa automáticamente aquí
 
+    @property
+    def driver(self):
+        """Driver activo (None si todavía no se creó o se recicló)."""
+        return self.managed.driver
+
     def setup_driver(self):
-        """Setup Chrome driver with appropriate options"""
-        if self.driver is None:
-            try:
-                chrome_options = Options()
+        """Setup Chrome driver with appropriate options (reciclándolo si superó sus topes)"""
+        return self.managed.get()
 
-                # Configuración específica para Chromium en modo headless
-                chrome_binary = check_chrome_installation()
-                if chrome_binary:
-                     chrome_options.binary_location = chrome_binary
+    def _create_driver(self):
+        """Crea un driver de Chrome nuevo (factory del ManagedDriver)"""
+        try:
+            # Configuración específica para Chromium en modo headless
+            chrome_binary = check_chrome_installation()
+            if not chrome_binary:
+                 logger.warning("Chromium/Chrome no encontrado. Intentando instalar...")
+                 if install_chrome():
+                     chrome_binary = check_chrome_installation()
+                 else:
+                     logger.error("No se pudo instalar Chromium/Chrome. El scraping fallará.")
+                     # Decide si levantar una excepción o continuar con None y manejarlo en los métodos de scraping
+                     # Por ahora, lanzaremos una excepción ya que el scraping sin driver no es posible
+                     raise RuntimeError("Chromium/Chrome necesario para Selenium no está instalado.")
+
+            # Configurar el servicio de Chrome
+            # WebDriverManager se encargará de descargar el driver si es necesario
+            service = Service(ChromeDriverManager().install())
+
+            # Inicializar el driver con el perfil liviano de las páginas de detalle
+            profile = self.config['extractor'].get('driver', {}).get('detail_profile', 'lean')
+            driver = create_driver(self.config, profile, binary_location=chrome_binary, service=service,
+                                   multi_tab=self.engine == 'tabs')
+            logger.info(f"Driver de Chrome configurado exitosamente (perfil '{profile}')")
+
+            # Verificar que estamos en modo headless
+            try:
+                if not driver.execute_script("return navigator.webdriver"):
+                    logger.info("Modo headless activado correctamente")
                 else:
-                     logger.warning("Chromium/Chrome no encontrado. Intentando instalar...")
-                     if install_chrome():
-                         chrome_options.binary_location = check_chrome_installation()
-                     else:
-                         logger.error("No se pudo instalar Chromium/Chrome. El scraping fallará.")
-                         # Decide si levantar una excepción o continuar con None y manejarlo en los métodos de scraping
-                         # Por ahora, lanzaremos una excepción ya que el scraping sin driver no es posible
-                         raise RuntimeError("Chromium/Chrome necesario para Selenium no está instalado.")
-
-
-                chrome_options.add_argument('--headless=new')
-                chrome_options.add_argument('--disable-gpu')
-                chrome_options.add_argument('--no-sandbox')
-                chrome_options.add_argument('--disable-dev-shm-usage')
-                chrome_options.add_argument('--window-size=1920,1080')
-                chrome_options.add_argument('--disable-extensions')
-                chrome_options.add_argument('--disable-notifications')
-                chrome_options.add_argument('--disable-infobars')
-                chrome_options.add_argument('--disable-popup-blocking')
-                chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-                chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-                # Configurar el servicio de Chrome
-                # WebDriverManager se encargará de descargar el driver si es necesario
-                service = Service(ChromeDriverManager().install())
-
-                # Inicializar el driver
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                logger.info("Driver de Chrome configurado exitosamente")
-
-                # Verificar que estamos en modo headless
-                try:
-                    if not self.driver.execute_script("return navigator.webdriver"):
-                        logger.info("Modo headless activado correctamente")
-                    else:
-                        logger.warning("El modo headless podría no estar funcionando correctamente")
-                except Exception as e:
-                     logger.warning(f"No se pudo verificar el modo headless: {e}")
+                    logger.warning("El modo headless podría no estar funcionando correctamente")
+            except Exception as e:
+                 logger.warning(f"No se pudo verificar el modo headless: {e}")
 
 
-            except Exception as e:
-                logger.error(f"Error al configurar el driver de Chrome: {e}")
-                raise
+        except Exception as e:
+            logger.error(f"Error al configurar el driver de Chrome: {e}")
+            raise
+        return driver
 
     def quit_driver(self):
         """Quits the Chrome driver if it's active"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        was_active = self.driver is not None
+        self.managed.close() # También detiene el watchdog; el próximo uso lo vuelve a arrancar
+        if was_active:
             logger.info("Driver de Chrome cerrado exitosamente")
 
+    def close_fetcher(self):
+        """Cierra la sesión HTTP si está activa"""
+        if self.fetcher:
+            self.fetcher.close()
+            self.fetcher = None
 
-    def load_processed_ids(self):
-        """Carga los IDs ya procesados desde el CSV existente"""
-        try:
-            csv_path = 'data/guiaCores_leads.csv'
-            if os.path.exists(csv_path):
-                # Leer solo la columna 'id_negocio' y convertir a set de strings
-                df = pd.read_csv(csv_path, usecols=['id_negocio'], dtype={'id_negocio': str})
-                if 'id_negocio' in df.columns:
-                    self.processed_ids = set(df['id_negocio'])
-                    logger.info(f"Cargados {len(self.processed_ids)} IDs ya procesados desde {csv_path}")
-                else:
-                     logger.warning(f"La columna 'id_negocio' no se encontró en {csv_path}. No se cargarán IDs procesados.")
-            else:
-                logger.info(f"No se encontró el archivo {csv_path}. Se iniciará sin IDs procesados.")
 
-        except pd.errors.EmptyDataError:
-             logger.warning(f"El archivo {csv_path} está vacío. No se cargarán IDs procesados.")
-        except FileNotFoundError:
-             logger.info(f"No se encontró el archivo {csv_path}. Se iniciará sin IDs procesados.")
-        except Exception as e:
-            logger.error(f"Error al cargar IDs procesados desde {csv_path}: {e}")
+    def load_processed_ids(self):
+        """Reabre el índice de IDs procesados (p. ej. si otro proceso lo reconstruyó)."""
+        self.processed_index.close()
+        self.processed_index = ProcessedIdIndex(self.config)
 
 
     def get_all_business_links(self):
@@ -199,104 +206,58 @@ class GuiaCoresScraper:
 
     def extract_detailed_info(self, url):
         """Extract detailed information from a business's detail page"""
-        # Mantener la implementación existente, asumiendo que self.driver está disponible
-        if self.driver is None:
-             raise RuntimeError("Driver de Selenium no inicializado. Llame a setup_driver primero.")
-
+        business_id = extract_id_from_url(url)
+        cached_html = self.page_store.get(business_id) if business_id else None
+        if cached_html is not None:
+            logger.info(f"Página de detalle obtenida de la caché: {url}")
+            return self._parse_detail_soup(BeautifulSoup(cached_html, 'html.parser'))
+
+        if self.engine == 'http':
+            if self.fetcher is None:
+                self.fetcher = HttpFetcher(self.config)
+
+            logger.info(f"Descargando página de detalle por HTTP: {url}")
+            response = self.fetcher.fetch(url)
+            if response is not None and response.ok:
+                soup = BeautifulSoup(response.text, 'html.parser')
+                if has_detail_content(soup):
+                    if business_id:
+                        self.page_store.put(business_id, url, response.text)
+                    info = self._parse_detail_soup(soup)
+                    logger.info(f"Información detallada extraída para: {info.get('nombre', 'Negocio')}")
+                    return info
+
+            logger.info(f"La respuesta HTTP no contiene el detalle del negocio. Reintentando con Selenium: {url}")
+
+        return self._extract_detailed_info_selenium(url)
+
+    def _load_detail_page(self, driver, url):
+        """Navega a la página de detalle y retorna su HTML una vez estable"""
+        with throttled():
+            driver.get(url)
+
+        # Esperar a que la página cargue completamente
+        wait_for_selector(driver, '.search-result-name', 10,
+                          self.waits_config.get('poll_interval', DEFAULT_POLL_INTERVAL))
+
+        # Esperar a que el contenido dinámico deje de cambiar
+        wait_for_dom_settle(driver, self.waits_config.get('dom_quiet_ms', 150))
+
+        return driver.page_source
+
+    def _extract_detailed_info_selenium(self, url):
+        """Extrae la información de una página de detalle navegándola con Selenium"""
         try:
             logger.info(f"Visitando página de detalle: {url}")
-            self.driver.get(url)
-
-            # Esperar a que la página cargue completamente
-            WebDriverWait(self.driver, 10).until(\
-                EC.presence_of_element_located((By.CLASS_NAME, "search-result-name"))\
-            )
-
-            # Esperar un momento adicional para asegurar que todo el contenido dinámico se cargue
-            time.sleep(1) # Reducir sleep si es posible
-
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-
-            info = {}
-
-            # ... (Lógica de extracción de datos existente) ...
-            # Extraer nombre del negocio
-            name_tag = soup.select_one('a.search-result-name h1')
-            info['nombre'] = name_tag.get_text(strip=True) if name_tag else 'N/A'
-
-            # Extraer dirección
-            address_tag = soup.select_one('span.search-result-address')
-            info['direccion'] = address_tag.get_text(strip=True) if address_tag else 'N/A'
-
-            # Extraer teléfonos
-            phone_links = soup.select('a[href^="tel:"]')
-            phones = [link.get_text(strip=True) for link in phone_links]
-            info['telefonos'] = ', '.join(phones) if phones else 'N/A'
-
-            # Extraer WhatsApp
-            whatsapp_link = soup.select_one('a[href^="https://api.whatsapp.com/send?"]')
-            whatsapp_number = 'N/A'
-            if whatsapp_link:
-                whatsapp_number = whatsapp_link.get_text(strip=True)
-                if not whatsapp_number or not any(char.isdigit() for char in whatsapp_number):
-                    if 'href' in whatsapp_link.attrs:
-                        try:
-                            query_params = urllib.parse.parse_qs(urllib.parse.urlparse(whatsapp_link['href']).query)
-                            if 'phone' in query_params and query_params['phone']:
-                                whatsapp_number = query_params['phone'][0]
-                        except Exception as e:
-                            logger.error(f"Error al parsear URL de WhatsApp: {e}")
-            info['whatsapp'] = whatsapp_number
-
-            # Extraer sitio web
-            website_link = soup.select_one('a[itemprop="url"]')
-            if not website_link:
-                website_icon = soup.select_one('i.fa.fa-cloud')
-                if website_icon:
-                    website_link = website_icon.find_next('a', class_='search-result-link')
-            info['sitio_web'] = website_link['href'] if website_link and 'href' in website_link.attrs else 'N/A'
-
-            # Extraer email
-            email_link = soup.select_one('a[onclick="irContacto()"]')
-            if not email_link:
-                email_icon = soup.select_one('i.fa.fa-envelope')
-                if email_icon:
-                    email_link = email_icon.find_next('a', class_='search-result-link')
-            info['email'] = email_link.get_text(strip=True) if email_link else 'N/A'
-
-            # Extraer redes sociales
-            facebook_link = soup.select_one('a[href*="facebook.com"]')
-            info['facebook'] = facebook_link['href'] if facebook_link and 'href' in facebook_link.attrs else 'N/A'
-
-            instagram_link = soup.select_one('a[href*="instagram.com"]')
-            info['instagram'] = instagram_link['href'] if instagram_link and 'href' in instagram_link.attrs else 'N/A'
-
-            # Extraer horarios
-            horario_icon = soup.select_one('i.far.fa-clock')
-            if horario_icon:
-                horario_span = horario_icon.find_next('span', class_='search-result-address')
-                horarios_text = horario_span.get_text(strip=True) if horario_span else ''
-                # Limpiar texto de horarios
-                horarios_clean = horarios_text.replace('Cerrado', '').replace('Abierto', '').strip()
-                info['horarios'] = horarios_clean if horarios_clean else 'N/A'
-
-            else:
-                info['horarios'] = 'N/A'
-
-            # Extraer rubros/categorías
-            rubros_div = soup.select_one('div#yw0.list-view div.items')
-            if rubros_div:
-                rubro_links = rubros_div.find_all('a', class_='search-result-link')
-                rubros = [link.get_text(strip=True) for link in rubro_links]
-                info['rubros'] = ', '.join(rubros) if rubros else 'N/A'
-            else:
-                info['rubros'] = 'N/A'
-
-            # Extraer coordenadas si están disponibles
-            map_element = soup.find('div', class_='map')
-            if map_element:
-                info['latitud'] = map_element.get('data-lat', 'N/A')
-                info['longitud'] = map_element.get('data-lng', 'N/A')
+            # El driver se crea o recicla si hace falta; si se cuelga, el watchdog lo mata
+            # y la URL se reintenta con uno nuevo
+            html = self.managed.run(lambda driver: self._load_detail_page(driver, url), label=url,
+                                    retries=self.config['extractor'].get('watchdog', {}).get('retries', 1))
+            business_id = extract_id_from_url(url)
+            if business_id:
+                self.page_store.put(business_id, url, html)
+            soup = BeautifulSoup(html, 'html.parser')
+            info = self._parse_detail_soup(soup)
 
             logger.info(f"Información detallada extraída para: {info.get('nombre', 'Negocio')}")
             return info
@@ -307,11 +268,138 @@ class GuiaCoresScraper:
             # ya que self.stats no es seguro en multiprocessing. Las estadísticas se manejarán en el proceso principal.
             return {}
 
-    def append_to_csv(self, data: List[Dict[str, Any]]):
-        """Append a list of dictionaries to the CSV file."""
-        if not data:
+    def _extract_with_tabs(self, pending):
+        """
+        Descarga las páginas de detalle de `pending` ([(id, url)]) en varias pestañas del
+        mismo driver y entrega (id, url, info) a medida que cada una termina. Las que no se
+        llegaron a procesar (timeout de la pestaña, driver colgado o caído) se entregan sin datos: quedan como
+        fallidas en la tabla de reclamos y se reintentan en otro lote.
+        """
+        remaining = {}
+        for business_id, url in pending:
+            cached_html = self.page_store.get(business_id)
+            if cached_html is not None:
+                logger.info(f"Página de detalle obtenida de la caché: {url}")
+                yield business_id, url, self._parse_detail_soup(BeautifulSoup(cached_html, 'html.parser'))
+            else:
+                remaining[url] = business_id
+        if not remaining:
             return
 
+        try:
+            driver = self.managed.get()
+            self._tabs = tab_pool_for(driver, self.config, self._tabs)
+            logger.info(f"Descargando {len(remaining)} páginas de detalle en {self._tabs.tabs} pestañas")
+            with self.managed.operation():
+                for url, html in self._tabs.scrape(list(remaining)):
+                    business_id = remaining.pop(url)
+                    self.managed.progress()
+                    self.managed.page_served()
+                    if html is None:
+                        yield business_id, url, {}
+                        continue
+                    self.page_store.put(business_id, url, html)
+                    info = self._parse_detail_soup(BeautifulSoup(html, 'html.parser'))
+                    logger.info(f"Información detallada extraída para: {info.get('nombre', 'Negocio')}")
+                    yield business_id, url, info
+        except Exception as e:
+            logger.error(f"Error descargando páginas de detalle en pestañas: {e}", exc_info=True)
+            # El driver puede haber quedado en mal estado: el próximo lote usa uno nuevo
+            self.managed.recycle()
+
+        for url, business_id in remaining.items():
+            yield business_id, url, {}
+
+    def _parse_detail_soup(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Extrae los campos del negocio de una página de detalle ya parseada"""
+        info = {}
+
+        # ... (Lógica de extracción de datos existente) ...
+        # Extraer nombre del negocio
+        name_tag = soup.select_one('a.search-result-name h1')
+        info['nombre'] = name_tag.get_text(strip=True) if name_tag else 'N/A'
+
+        # Extraer dirección
+        address_tag = soup.select_one('span.search-result-address')
+        info['direccion'] = address_tag.get_text(strip=True) if address_tag else 'N/A'
+
+        # Extraer teléfonos
+        phone_links = soup.select('a[href^="tel:"]')
+        phones = [link.get_text(strip=True) for link in phone_links]
+        info['telefonos'] = ', '.join(phones) if phones else 'N/A'
+
+        # Extraer WhatsApp
+        whatsapp_link = soup.select_one('a[href^="https://api.whatsapp.com/send?"]')
+        whatsapp_number = 'N/A'
+        if whatsapp_link:
+            whatsapp_number = whatsapp_link.get_text(strip=True)
+            if not whatsapp_number or not any(char.isdigit() for char in whatsapp_number):
+                if 'href' in whatsapp_link.attrs:
+                    try:
+                        query_params = urllib.parse.parse_qs(urllib.parse.urlparse(whatsapp_link['href']).query)
+                        if 'phone' in query_params and query_params['phone']:
+                            whatsapp_number = query_params['phone'][0]
+                    except Exception as e:
+                        logger.error(f"Error al parsear URL de WhatsApp: {e}")
+        info['whatsapp'] = whatsapp_number
+
+        # Extraer sitio web
+        website_link = soup.select_one('a[itemprop="url"]')
+        if not website_link:
+            website_icon = soup.select_one('i.fa.fa-cloud')
+            if website_icon:
+                website_link = website_icon.find_next('a', class_='search-result-link')
+        info['sitio_web'] = website_link['href'] if website_link and 'href' in website_link.attrs else 'N/A'
+
+        # Extraer email
+        email_link = soup.select_one('a[onclick="irContacto()"]')
+        if not email_link:
+            email_icon = soup.select_one('i.fa.fa-envelope')
+            if email_icon:
+                email_link = email_icon.find_next('a', class_='search-result-link')
+        info['email'] = email_link.get_text(strip=True) if email_link else 'N/A'
+
+        # Extraer redes sociales
+        facebook_link = soup.select_one('a[href*="facebook.com"]')
+        info['facebook'] = facebook_link['href'] if facebook_link and 'href' in facebook_link.attrs else 'N/A'
+
+        instagram_link = soup.select_one('a[href*="instagram.com"]')
+        info['instagram'] = instagram_link['href'] if instagram_link and 'href' in instagram_link.attrs else 'N/A'
+
+        # Extraer horarios
+        horario_icon = soup.select_one('i.far.fa-clock')
+        if horario_icon:
+            horario_span = horario_icon.find_next('span', class_='search-result-address')
+            horarios_text = horario_span.get_text(strip=True) if horario_span else ''
+            # Limpiar texto de horarios
+            horarios_clean = horarios_text.replace('Cerrado', '').replace('Abierto', '').strip()
+            info['horarios'] = horarios_clean if horarios_clean else 'N/A'
+
+        else:
+            info['horarios'] = 'N/A'
+
+        # Extraer rubros/categorías
+        rubros_div = soup.select_one('div#yw0.list-view div.items')
+        if rubros_div:
+            rubro_links = rubros_div.find_all('a', class_='search-result-link')
+            rubros = [link.get_text(strip=True) for link in rubro_links]
+            info['rubros'] = ', '.join(rubros) if rubros else 'N/A'
+        else:
+            info['rubros'] = 'N/A'
+
+        # Extraer coordenadas si están disponibles
+        map_element = soup.find('div', class_='map')
+        if map_element:
+            info['latitud'] = map_element.get('data-lat', 'N/A')
+            info['longitud'] = map_element.get('data-lng', 'N/A')
+
+        return info
+
+    def append_to_csv(self, data: List[Dict[str, Any]]) -> bool:
+        """Append a list of dictionaries to the CSV file. Returns False if the write failed."""
+        if not data:
+            return True
+
         df = pd.DataFrame(data)
         csv_path = 'data/guiaCores_leads.csv'
         os.makedirs('data', exist_ok=True)
@@ -323,40 +411,62 @@ class GuiaCoresScraper:
             else:
                 df.to_csv(csv_path, index=False, encoding='utf-8')
             logger.info(f"Appended {len(data)} records to {csv_path}")
+            # Marcar los IDs recién escritos para que ningún otro chunk los vuelva a procesar
+            self.processed_index.add_many(record['id_negocio'] for record in data if record.get('id_negocio'))
+            return True
         except Exception as e:
             logger.error(f"Error appending data to CSV {csv_path}: {e}", exc_info=True)
             # Decidir si relanzar la excepción o simplemente loggear. Para resiliencia, loggear es mejor.
+            return False
 
 
     # Modificar process_urls para que sea el método de scraping principal para una lista de URLs
     # Este método será llamado por cada proceso en el multiprocessing.
-    def process_urls(self, urls: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    def process_urls(self, urls: List[Dict[str, str]], keep_open: bool = False) -> List[Dict[str, Any]]:
         """
         Processes a list of URLs, scrapes detailed info, saves partial results to CSV,
         and returns the scraped data for further processing.
         This method is designed to be called by the multiprocessing pool.
-        """
-        # Cargar processed_ids dentro de cada proceso para que sea thread/process-safe
-        # Esto asume que el archivo CSV no está siendo modificado por *otros* procesos
-        # mientras este proceso carga. La lógica de `append_to_csv` maneja bien adjuntar.
-        # Sin embargo, el set de processed_ids aquí solo reflejará el estado del CSV
-        # al INICIO de la ejecución de este chunk. Esto puede llevar a duplicados mínimos
-        # si un ID es procesado y guardado por otro chunk *después* de que este chunk
-        # cargó sus processed_ids pero *antes* de que lo intente procesar. Es un compromiso aceptable.
-        self.load_processed_ids()
-
 
+        With keep_open=True the driver, HTTP session and processed-ID index stay open
+        for the next batch (long-lived pool workers, see init_sequential_worker).
+        """
         all_businesses_in_chunk = []
         scraped_count = 0
         skipped_count = 0
         error_count = 0
+        scraped_ids = set() # IDs de este chunk aún no escritos en el CSV
+        claimed_ids = set() # IDs que este chunk reclamó en la tabla de reclamos
+        tab_pending = [] # (id, url) a descargar juntos en pestañas (motor 'tabs')
+
+        def record_result(business_id, url, business_data):
+            nonlocal scraped_count, error_count
+            if business_data:
+                business_data['id_negocio'] = business_id
+                business_data['url'] = url # Añadir URL y fecha de extracción
+                business_data['fecha_extraccion'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+                all_businesses_in_chunk.append(business_data)
+                scraped_ids.add(business_id)
+                scraped_count += 1
+
+                # Guardar resultados parciales en CSV después de cada negocio (o agrupar para eficiencia)
+                # Guardar uno a uno puede ser lento. Agruparemos para guardar.
+                # self.append_to_csv([business_data]) # Opción 1: Guardar uno a uno
 
-        # Setup driver for this process/chunk
-        self.setup_driver() # Cada proceso tendrá su propio driver
+            else:
+                logger.warning(f"No se obtuvieron datos detallados para URL: {url} (ID: {business_id})")
+                self.claims.mark_failed([business_id])
+                error_count += 1
+
+        # Con el motor HTTP el driver solo se crea si alguna página necesita el fallback a Selenium
+        if self.engine == 'selenium':
+            self.setup_driver() # Cada proceso tendrá su propio driver
 
         try:
             for url_data in urls:
-                business_id = str(url_data.get('id')) # Asegurar que sea string para la comparación con set
+                # El collector entrega 'id_negocio'; se acepta 'id' por compatibilidad
+                business_id = str(url_data.get('id_negocio') or url_data.get('id') or '') # Asegurar que sea string para la comparación con set
                 url = url_data.get('url')
 
                 if not business_id or not url:
@@ -364,41 +474,37 @@ class GuiaCoresScraper:
                     error_count += 1
                     continue
 
-                # Saltar si ya fue procesado por cualquier proceso
-                # Esta verificación se basa en el CSV cargado al inicio del chunk.
-                # Para una idempotencia total entre procesos concurrentes, se necesitaría un mecanismo de bloqueo
-                # o una base de datos atómica para registrar IDs procesados, lo cual es más complejo.
-                # La carga inicial mitiga duplicados obvios.
-                if business_id in self.processed_ids:
-                    logger.debug(f"Saltando ID ya procesado (local set): {business_id}")
+                # Saltar si ya fue procesado por cualquier proceso. El índice se consulta en cada ID,
+                # así que ve lo que otros chunks guardaron después de que este empezó.
+                if business_id in scraped_ids or (self.resume and self.processed_index.contains(business_id)):
+                    logger.debug(f"Saltando ID ya procesado: {business_id}")
                     skipped_count += 1
                     continue
 
-                logger.info(f"Procesando negocio {business_id} (Chunk)")
-                business_data = self.extract_detailed_info(url)
-
-                if business_data:
-                    business_data['id_negocio'] = business_id
-                    business_data['url'] = url # Añadir URL y fecha de extracción
-                    business_data['fecha_extraccion'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                # Reclamar el ID antes de descargarlo: si otro worker lo tiene o ya está hecho, se saltea
+                if self.resume:
+                    if not self.claims.claim(business_id):
+                        logger.debug(f"Saltando ID reclamado por otro worker: {business_id}")
+                        skipped_count += 1
+                        continue
+                    claimed_ids.add(business_id)
 
-                    all_businesses_in_chunk.append(business_data)
-                    self.processed_ids.add(business_id) # Añadir al set local del proceso
-                    scraped_count += 1
-
-                    # Guardar resultados parciales en CSV después de cada negocio (o agrupar para eficiencia)
-                    # Guardar uno a uno puede ser lento. Agruparemos para guardar.
-                    # self.append_to_csv([business_data]) # Opción 1: Guardar uno a uno
-
-                else:
-                    logger.warning(f"No se obtuvieron datos detallados para URL: {url} (ID: {business_id})")
-                    error_count += 1
+                if self.engine == 'tabs':
+                    tab_pending.append((business_id, url))
+                    continue
 
+                logger.info(f"Procesando negocio {business_id} (Chunk)")
+                self.pacing.wait()
+                record_result(business_id, url, self.extract_detailed_info(url))
 
-                time.sleep(0.5) # Ajustar el delay si es necesario y seguro
+            # Motor 'tabs': los IDs reclamados se descargan a la vez en varias pestañas del driver
+            for business_id, url, business_data in self._extract_with_tabs(tab_pending):
+                record_result(business_id, url, business_data)
 
             # Opción 2: Guardar todos los negocios scrapeados en este chunk al final del chunk
-            self.append_to_csv(all_businesses_in_chunk)
+            # Los reclamos se cierran recién cuando los registros están en el CSV
+            if self.write_csv and self.append_to_csv(all_businesses_in_chunk):
+                self.claims.mark_done(scraped_ids)
             logger.info(f"Chunk processing finished: Scraped {scraped_count}, Skipped {skipped_count}, Errors {error_count}")
 
         except Exception as e:
@@ -408,10 +514,22 @@ class GuiaCoresScraper:
             # Relanzar la excepción para que el executor la maneje si es necesario, o simplemente loggearla
             # Para resiliencia, es mejor loggear y dejar que el chunk termine (aunque con errores).
             # raise # Uncomment to let the exception propagate and potentially stop the pool
+            if keep_open:
+                # El driver pudo quedar en mal estado: el próximo lote crea uno nuevo
+                self.quit_driver()
 
         finally:
-            # Asegurarse de cerrar el driver en este proceso
-            self.quit_driver()
+            # Asegurarse de cerrar el driver y la sesión HTTP en este proceso (salvo en workers persistentes)
+            if not keep_open:
+                self.quit_driver()
+                self.close_fetcher()
+                self.processed_index.close()
+            # Lo que este chunk reclamó y quedó sin terminar (error o escritura fallida) vuelve a estar
+            # disponible. Si escribe el proceso principal, los IDs retornados conservan el lease hasta
+            # que él los confirme; los de chunks anteriores del mismo worker no se tocan.
+            self.claims.release(claimed_ids if self.write_csv else claimed_ids - scraped_ids)
+            if not keep_open:
+                self.claims.close()
 
         # Retornar los datos scrapeados en este chunk
         return all_businesses_in_chunk
@@ -460,7 +578,7 @@ class GuiaCoresScraper:
 
 # Función wrapper para ser usada por ProcessPoolExecutor
 # Cada llamada a esta función ocurre en un proceso separado
-def process_url_chunk_for_sequential(chunk: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+def process_url_chunk_for_sequential(chunk: List[Dict[str, str]], config: Optional[Dict[str, Any]] = None, engine: str = 'http', write_csv: bool = True) -> List[Dict[str, Any]]:
     """
     Wrapper function to initialize scraper and process a chunk of URLs.
     Designed to be run in a separate process.
@@ -468,10 +586,8 @@ def process_url_chunk_for_sequential(chunk: List[Dict[str, str]]) -> List[Dict[s
     logger.info(f"Proceso hijo iniciado para chunk de {len(chunk)} URLs.")
     scraper = None
     try:
-        # No pasar resume=True si la carga de processed_ids se hace dentro de process_urls
-        # O pasar resume=True y load_processed_ids se llama en __init__ (menos seguro en multiprocessing)
-        # Decidimos llamar load_processed_ids dentro de process_urls para más seguridad.
-        scraper = GuiaCoresScraper(resume=True) # Carga processed_ids al inicio del proceso/chunk
+        # resume=True: saltear los IDs que ya están en el índice compartido de procesados
+        scraper = GuiaCoresScraper(resume=True, config=config, engine=engine, write_csv=write_csv)
         # El driver se configura dentro de process_urls ahora
         scraped_data = scraper.process_urls(chunk)
         logger.info(f"Proceso hijo finalizado para chunk. Scrapeados {len(scraped_data)} negocios.")
@@ -489,6 +605,47 @@ def process_url_chunk_for_sequential(chunk: List[Dict[str, str]]) -> List[Dict[s
         logger.info("Proceso hijo finalizado.")
 
 
+# --- Workers persistentes ---
+# Cada proceso del pool crea un único GuiaCoresScraper en el initializer y lo reutiliza
+# para todos los lotes que toma de la cola del executor: el driver, la sesión HTTP, el
+# índice de procesados y la conexión de reclamos se abren una sola vez por worker.
+
+def init_sequential_worker(config: Dict[str, Any], engine: str = 'http', write_csv: bool = True,
+                           rate_limiter: Optional[SharedRateLimiter] = None) -> None:
+    """Initializer del pool: registra el limitador compartido y crea el scraper persistente del proceso worker."""
+    global _worker_scraper
+    install_rate_limiter(rate_limiter)
+    # resume=True: saltear los IDs que ya están en el índice compartido de procesados
+    _worker_scraper = GuiaCoresScraper(resume=True, config=config, engine=engine, write_csv=write_csv)
+    # Los workers del pool no ejecutan atexit; Finalize sí corre al terminar el proceso.
+    mp_util.Finalize(None, shutdown_sequential_worker, exitpriority=10)
+
+
+def shutdown_sequential_worker() -> None:
+    """Cierra el driver y los recursos del scraper del proceso worker, si existe."""
+    global _worker_scraper
+    if _worker_scraper is not None:
+        stats = _worker_scraper.managed.stats
+        _worker_scraper.quit_driver()
+        logger.info(f"Worker finalizado: {stats['drivers_started']} drivers iniciados, {stats['pages_served']} páginas "
+                    f"servidas, {stats['recycles']} reciclados, {stats['kills']} drivers colgados reiniciados")
+        _worker_scraper.close_fetcher()
+        _worker_scraper.processed_index.close()
+        _worker_scraper.claims.close()
+        _worker_scraper = None
+
+
+def process_batch_in_worker(batch: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Procesa un lote pequeño de URLs con el scraper persistente del worker."""
+    if _worker_scraper is None:
+        raise RuntimeError("Scraper del worker no inicializado. Use init_sequential_worker como initializer del pool.")
+    try:
+        return _worker_scraper.process_urls(batch, keep_open=True)
+    except Exception as e:
+        logger.error(f"Error en worker procesando lote de {len(batch)} URLs: {e}", exc_info=True)
+        return []
+
+
 # La función main() original ahora representa el flujo CLI con multiprocessing,
 # pero podemos adaptarla o crear una similar en src/main.py para ser llamada
 # por run_sequential_etl. La lógica de dividir en chunks y usar ProcessPoolExecutor
@@ -0,0 +1,141 @@
+import logging
+import random
+import time
+from typing import Callable, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Intervalo de sondeo por defecto: WebDriverWait usa 0.5s, lo que agrega hasta medio segundo por espera
+DEFAULT_POLL_INTERVAL = 0.05
+
+# Resuelve cuando el DOM pasa `quiet_ms` sin mutaciones, o al agotarse `timeout_ms`
+DOM_SETTLE_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var quietTimer = null, deadline = null;
+var observer = new MutationObserver(function() { resetQuiet(); });
+function finish(settled) {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(deadline);
+    done(settled);
+}
+function resetQuiet() {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(function() { finish(true); }, quietMs);
+}
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+deadline = setTimeout(function() { finish(false); }, timeoutMs);
+resetQuiet();
+"""
+
+# Resuelve apenas la cantidad de elementos que cumplen `selector` supera `previous`, o al agotarse `timeout_ms`
+NEW_ITEMS_SCRIPT = """
+var selector = arguments[0], previous = arguments[1], timeoutMs = arguments[2], done = arguments[arguments.length - 1];
+function count() { return document.querySelectorAll(selector).length; }
+if (count() > previous) { done(count()); return; }
+var deadline = null;
+var observer = new MutationObserver(function() {
+    var current = count();
+    if (current > previous) {
+        observer.disconnect();
+        clearTimeout(deadline);
+        done(current);
+    }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true});
+deadline = setTimeout(function() { observer.disconnect(); done(count()); }, timeoutMs);
+"""
+
+
+def wait_until(driver, condition: Callable, timeout: float, poll_interval: float = DEFAULT_POLL_INTERVAL):
+    """WebDriverWait con sondeo ajustado: retorna apenas se cumple la condición."""
+    return WebDriverWait(driver, timeout, poll_frequency=poll_interval).until(condition)
+
+
+def wait_for_selector(driver, selector: str, timeout: float, poll_interval: float = DEFAULT_POLL_INTERVAL):
+    """Espera a que exista un elemento que cumpla el selector CSS y lo retorna."""
+    return wait_until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, selector)), timeout, poll_interval)
+
+
+def _run_async_script(driver, script: str, timeout: float, *args):
+    """Ejecuta un script asíncrono con un script timeout algo mayor que el propio del script."""
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(script, *args)
+
+
+def wait_for_dom_settle(driver, quiet_ms: int = 150, timeout: float = 5) -> bool:
+    """
+    Espera a que el DOM deje de cambiar durante `quiet_ms` milisegundos.
+    Reemplaza las pausas fijas usadas para "dejar cargar" el contenido dinámico.
+
+    Returns:
+        bool: True si el DOM se estabilizó, False si se agotó el timeout.
+    """
+    try:
+        return bool(_run_async_script(driver, DOM_SETTLE_SCRIPT, timeout, quiet_ms, int(timeout * 1000)))
+    except TimeoutException:
+        return False
+    except WebDriverException as e:
+        logger.debug(f"No se pudo observar el DOM: {e}")
+        return False
+
+
+def wait_for_new_items(driver, selector: str, previous_count: int, timeout: float) -> int:
+    """
+    Espera a que se agreguen elementos que cumplan `selector` por encima de `previous_count`.
+
+    Returns:
+        int: Cantidad de elementos al resolver (igual o menor a previous_count si no llegó nada).
+    """
+    try:
+        return int(_run_async_script(driver, NEW_ITEMS_SCRIPT, timeout, selector, previous_count, int(timeout * 1000)))
+    except TimeoutException:
+        return previous_count
+
+
+class PacingPolicy:
+    """
+    Pausa de cortesía entre requests al sitio.
+
+    Garantiza un intervalo mínimo (con jitter opcional) entre acciones consecutivas,
+    descontando el tiempo que ya llevó la acción anterior: si la página tardó más
+    que el intervalo en cargar, no se agrega ninguna pausa.
+    """
+
+    def __init__(self, min_interval: float = 0.0, jitter: float = 0.0):
+        """
+        Args:
+            min_interval: Segundos mínimos entre el inicio de dos acciones.
+            jitter: Fracción aleatoria adicional del intervalo (0.25 = hasta +25%).
+        """
+        self.min_interval = max(0.0, min_interval)
+        self.jitter = max(0.0, jitter)
+        self._last_action: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config: dict, kind: str) -> 'PacingPolicy':
+        """Crea la política para `kind` ('detail' o 'search') desde EXTRACTOR_CONFIG['pacing']."""
+        pacing_config = config['extractor'].get('pacing', {})
+        return cls(pacing_config.get(f'{kind}_min_interval', 0.0), pacing_config.get('jitter', 0.0))
+
+    def wait(self) -> float:
+        """
+        Espera lo que falte para cumplir el intervalo desde la acción anterior y registra la actual.
+
+        Returns:
+            float: Segundos efectivamente esperados.
+        """
+        waited = 0.0
+        now = time.monotonic()
+        if self._last_action is not None and self.min_interval:
+            interval = self.min_interval * (1 + random.uniform(0, self.jitter))
+            waited = max(0.0, interval - (now - self._last_action))
+            if waited:
+                time.sleep(waited)
+        self._last_action = time.monotonic()
+        return waited
@@ -0,0 +1,180 @@
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..extractors.js_extractor import RECORD_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Columnas del CSV de leads: las que emiten los scrapers para cada negocio. Es un esquema
+# fijo: un registro sin coordenadas no puede hacer que se pierdan las de los siguientes.
+LEAD_FIELDS = ('id_negocio', 'url', 'fecha_extraccion') + RECORD_FIELDS
+
+# Marca de fin de la cola
+_STOP = object()
+
+
+class CsvWriter:
+    """
+    Único escritor de un CSV compartido, en un hilo propio detrás de una cola acotada.
+
+    Los productores llaman a `put()`; si la cola está llena, `put()` se bloquea
+    (backpressure) en lugar de acumular registros sin límite. El hilo agrupa los
+    registros en lotes, los escribe con I/O bufferizado y hace fsync según la política
+    configurada: 'always' (cada lote), 'interval' (cada fsync_interval segundos) o 'never'.
+    Como hay un solo escritor, las filas nunca se intercalan y el encabezado se escribe una vez.
+
+    Las columnas son fijas (`fieldnames`): los campos que falten en un registro quedan
+    vacíos, y un campo desconocido hace fallar `put()` en lugar de descartarse.
+    """
+
+    def __init__(self, config: Dict[str, Any], path: Optional[str] = None,
+                 on_flush: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                 fieldnames: Sequence[str] = LEAD_FIELDS):
+        """
+        Args:
+            config: Configuración del proyecto.
+            path: CSV de destino (se agrega al final si ya existe). Por defecto, el de la configuración.
+            on_flush: Función llamada desde el hilo escritor con cada lote ya escrito.
+            fieldnames: Columnas del CSV. Si el archivo ya existe, su encabezado debe coincidir.
+        """
+        self.writer_config = config['extractor'].get('csv_writer', {})
+        self.path = path or self.writer_config.get('path', 'data/guiaCores_leads.csv')
+        self.fieldnames = list(fieldnames)
+        self.on_flush = on_flush
+        self.batch_size = max(1, self.writer_config.get('batch_size', 200))
+        self.flush_interval = self.writer_config.get('flush_interval', 1.0)
+        self.fsync_policy = self.writer_config.get('fsync', 'interval')
+        self.fsync_interval = self.writer_config.get('fsync_interval', 5.0)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.writer_config.get('queue_size', 5000))
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self.stats = {'records': 0, 'batches': 0, 'fsyncs': 0}
+
+    def __enter__(self) -> 'CsvWriter':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Arranca el hilo escritor.
+
+        Raises:
+            ValueError: Si el CSV ya existe con otras columnas (agregar filas las desalinearía).
+        """
+        header = self._existing_header()
+        if header is not None and header != self.fieldnames:
+            raise ValueError(f"El encabezado de {self.path} no coincide con las columnas esperadas "
+                             f"({', '.join(self.fieldnames)}): mueva el archivo o use otro path")
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='csv-writer', daemon=True)
+            self._thread.start()
+
+    def put(self, record: Dict[str, Any], timeout: Optional[float] = None) -> None:
+        """
+        Encola un registro; se bloquea mientras la cola esté llena.
+
+        Raises:
+            ValueError: Si el registro tiene campos que no son columnas del CSV.
+        """
+        if self._error is not None:
+            raise RuntimeError(f"El escritor de {self.path} falló: {self._error}")
+        unknown = [field for field in record if field not in self.fieldnames]
+        if unknown:
+            raise ValueError(f"Campos desconocidos para {self.path}: {unknown}")
+        self._queue.put(record, timeout=timeout)
+
+    def put_many(self, records: List[Dict[str, Any]]) -> None:
+        """Encola varios registros."""
+        for record in records:
+            self.put(record)
+
+    def pending(self) -> int:
+        """Registros encolados que todavía no se escribieron."""
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        """Escribe lo pendiente y detiene el hilo escritor."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        logger.info(f"Escritor de {self.path} cerrado: {self.stats['records']} registros en "
+                    f"{self.stats['batches']} lotes, {self.stats['fsyncs']} fsync")
+
+    def _existing_header(self) -> Optional[List[str]]:
+        """Encabezado del CSV si ya existe y no está vacío."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            return next(csv.reader(f), None)
+
+    def _run(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        new_file = self._existing_header() is None
+        last_fsync = time.monotonic()
+        stopping = False
+
+        with open(self.path, 'a', encoding='utf-8', newline='', buffering=1024 * 1024) as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames, restval='')
+            if new_file:
+                writer.writeheader()
+            while not stopping:
+                batch: List[Dict[str, Any]] = []
+                deadline = time.monotonic() + self.flush_interval
+                # Juntar un lote: hasta batch_size registros o hasta que pase flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                if not batch:
+                    continue
+
+                try:
+                    writer.writerows(batch)
+                    f.flush()
+
+                    now = time.monotonic()
+                    if self.fsync_policy == 'always' or \
+                            (self.fsync_policy == 'interval' and (stopping or now - last_fsync >= self.fsync_interval)):
+                        os.fsync(f.fileno())
+                        last_fsync = now
+                        self.stats['fsyncs'] += 1
+                    self.stats['records'] += len(batch)
+                    self.stats['batches'] += 1
+                except Exception as e:
+                    logger.error(f"Error escribiendo {len(batch)} registros en {self.path}: {e}", exc_info=True)
+                    self._error = e
+                    # Vaciar la cola para no bloquear a los productores; put() ya reporta el error
+                    self._drain()
+                    return
+
+                if self.on_flush is not None:
+                    try:
+                        self.on_flush(batch)
+                    except Exception as e:
+                        logger.error(f"Error en el callback posterior a la escritura de {self.path}: {e}", exc_info=True)
+
+            if self.fsync_policy != 'never':
+                os.fsync(f.fileno())
+
+    def _drain(self) -> None:
+        """Descarta lo que quede en la cola después de un error de escritura."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
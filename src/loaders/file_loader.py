@@ -1,7 +1,9 @@
+import csv
 import logging
 import os
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Set
 import pandas as pd
 from datetime import datetime
 
@@ -13,8 +15,36 @@ class FileLoader:
         # Ensure data/processed directory exists, configure DATA_OUTPUT_DIR in .env or config
         self.output_dir = Path(config.get("OUTPUT_DIR", "data/processed"))
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Si se fija, load_stream agrega a este archivo (reanudación de una corrida) en lugar de crear uno nuevo
+        self.output_file: Optional[Path] = None
         logger.info(f"FileLoader initialized. Output directory: {self.output_dir}")
 
+    def new_output_file(self, filename_prefix: str = "data") -> Path:
+        """Ruta única para un archivo de salida nuevo (timestamp con microsegundos)."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return self.output_dir / f"{filename_prefix}_{timestamp}.csv"
+
+    @staticmethod
+    def _drop_partial_row(path: Path) -> None:
+        """Recorta la última fila si quedó a medio escribir por un corte (sin salto de línea final)."""
+        with open(path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    @classmethod
+    def written_ids(cls, path: Path, id_field: str = 'id_negocio') -> Set[str]:
+        """
+        IDs de los registros ya escritos en un archivo de salida. Una fila a medio
+        escribir se descarta del archivo y no cuenta.
+        """
+        path = Path(path)
+        if not path.exists():
+            return set()
+        cls._drop_partial_row(path)
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return {row.get(id_field) or '' for row in csv.DictReader(f)} - {''}
+
     def load(self, data: List[Dict[str, Any]], filename_prefix: str = "data") -> None:
         if not data:
             logger.info("No data to load into file.")
@@ -35,3 +65,51 @@ class FileLoader:
         except Exception as e:
             logger.error(f"Error writing data to CSV file: {e}", exc_info=True)
             raise
+
+    def load_stream(self, data: Iterable[Dict[str, Any]], filename_prefix: str = "data", batch_size: int = 500) -> int:
+        """
+        Versión streaming de load: escribe los registros por lotes a medida que llegan,
+        con memoria acotada por batch_size. El archivo se crea con el primer lote.
+
+        Con `output_file` fijado y ya existente, los registros se agregan al final con
+        las columnas de su encabezado (se reanuda la corrida que lo creó).
+
+        Returns:
+            int: Cantidad de registros escritos.
+        """
+        records = iter(data)
+        output_file: Optional[Path] = None
+        written = 0
+        f = None
+        try:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                if f is None:
+                    output_file = self.output_file or self.new_output_file(filename_prefix)
+                    fieldnames = None
+                    if output_file.exists() and output_file.stat().st_size:
+                        self._drop_partial_row(output_file)
+                        with open(output_file, 'r', encoding='utf-8', newline='') as existing:
+                            fieldnames = next(csv.reader(existing), None)
+                    f = open(output_file, 'a' if fieldnames else 'w', encoding='utf-8', newline='')
+                    writer = csv.DictWriter(f, fieldnames=fieldnames or list(batch[0].keys()),
+                                            restval='', extrasaction='ignore')
+                    if not fieldnames:
+                        writer.writeheader()
+                writer.writerows(batch)
+                f.flush()
+                written += len(batch)
+        except Exception as e:
+            logger.error(f"Error writing data stream to CSV file {output_file}: {e}", exc_info=True)
+            raise
+        finally:
+            if f is not None:
+                f.close()
+
+        if written:
+            logger.info(f"Successfully streamed {written} records to {output_file} as CSV")
+        else:
+            logger.info("No data to load into file.")
+        return written
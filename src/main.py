@@ -7,16 +7,23 @@ import os
 
 from dotenv import load_dotenv
 
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 from src.common.config import get_config
+from src.common.claim_store import ClaimStore
+from src.common.journal import ResultJournal
+from src.common.processed_index import ProcessedIdIndex
+from src.common.rate_limiter import get_rate_limiter
 from src.extractors.bulk_collector import BulkCollector
 from src.extractors.bulk_scraper import BulkScraper
 from src.extractors.sequential_collector import SequentialCollector
-from src.extractors.sequential_scraper import GuiaCoresScraper, process_url_chunk_for_sequential
+from src.extractors.sequential_scraper import init_sequential_worker, process_batch_in_worker
 
 from src.transformers.business_transformer import BusinessTransformer
 from src.loaders.file_loader import FileLoader
+from src.loaders.csv_writer import CsvWriter
 
 load_dotenv()
 
@@ -77,60 +84,237 @@ def _get_loaders(output_type: str, config: dict) -> List[Any]:
         raise ValueError(f"Invalid output type: {output_type}. Must be 'file'.")
     return loaders
 
-def run_bulk_etl(start_id: int, end_id: int, output: str = "file") -> Dict[str, Any]:
+def _run_pipeline(records: Iterable[Dict[str, Any]], transformer: BusinessTransformer, loaders: List[Any],
+                  buffer_size: int = 1000) -> int:
+    """Encadena extracción, transformación y carga en streaming.
+
+    Cada loader consume los registros transformados desde su propia cola acotada en un
+    hilo aparte (load_stream), así que los registros llegan a disco a medida que se
+    extraen y la memoria queda acotada por buffer_size, no por el tamaño de la corrida.
+
+    Returns:
+        int: Cantidad de registros transformados y entregados a los loaders.
+    """
+    done = object()
+    queues = [queue.Queue(maxsize=buffer_size) for _ in loaders]
+    errors: List[BaseException] = []
+
+    def consume(loader: Any, loader_queue: "queue.Queue") -> None:
+        def drain() -> Iterable[Dict[str, Any]]:
+            while True:
+                item = loader_queue.get()
+                if item is done:
+                    return
+                yield item
+        try:
+            loader.load_stream(drain())
+        except Exception as exc:
+            errors.append(exc)
+            # Seguir vaciando la cola para no bloquear al productor
+            for _ in drain():
+                pass
+
+    threads = [threading.Thread(target=consume, args=(loader, loader_queue), name=f"loader-{i}", daemon=True)
+               for i, (loader, loader_queue) in enumerate(zip(loaders, queues))]
+    for thread in threads:
+        thread.start()
+
+    count = 0
+    try:
+        for record in transformer.transform_iter(records):
+            count += 1
+            for loader_queue in queues:
+                loader_queue.put(record)
+    finally:
+        for loader_queue in queues:
+            loader_queue.put(done)
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    return count
+
+def _scrape_bulk_iter(collector: BulkCollector, scraper: BulkScraper, model, ids: Iterable[int], completed_ids: Optional[set] = None):
+    """Scrapea una secuencia de IDs en streaming y registra aciertos y fallos en el modelo de densidad.
+
+    Solo se marcan como inexistentes los IDs confirmados por el scraper (ver
+    is_confirmed_miss); los que fallaron por timeout o error quedan sin consultar.
+    Los IDs de completed_ids (ya terminados según el journal) se saltean.
+
+    Yields:
+        Dict: Registros a medida que se extraen.
+
+    Returns:
+        Set[int]: Bloques con aciertos nuevos (valor de retorno del generador, vía `yield from`).
+    """
+    probed = 0
+    live_ids = set()
+    dead_ids = set()
+
+    def tracked_ids() -> Iterable[int]:
+        nonlocal probed
+        for business_id in ids:
+            if completed_ids and str(business_id) in completed_ids:
+                continue
+            probed += 1
+            yield business_id
+
+    def on_miss(business_id: str) -> None:
+        if business_id.isdigit():
+            dead_ids.add(int(business_id))
+
+    for record in scraper.scrape_iter(collector.urls_for_ids(tracked_ids()), on_miss=on_miss):
+        if str(record.get('id_negocio', '')).isdigit():
+            live_ids.add(int(record['id_negocio']))
+        yield record
+    hit_blocks = model.record(live_ids, dead_ids)
+    logger.info(f"{len(live_ids)} IDs vivos y {len(dead_ids)} inexistentes de {probed} consultados "
+                f"({probed - len(live_ids) - len(dead_ids)} sin resultado, quedan para la próxima pasada)")
+    return hit_blocks
+
+def _resume_output(journal: ResultJournal, loaders: List[Any], replayed_data: List[Dict[str, Any]],
+                   resume: bool) -> List[Dict[str, Any]]:
+    """Fija el archivo de salida de la corrida y devuelve los registros del journal que faltan escribir.
+
+    Al reanudar se sigue escribiendo en el archivo de la corrida interrumpida (registrado
+    en el journal) y solo se reemiten los registros recuperados que no llegaron a él; así
+    cada negocio queda una sola vez, en un solo archivo. Una corrida nueva registra su
+    propio archivo.
+    """
+    pending = replayed_data
+    for loader in loaders:
+        if not isinstance(loader, FileLoader):
+            continue
+        previous = journal.output_file() if resume else None
+        if previous is not None:
+            loader.output_file = Path(previous)
+            written = FileLoader.written_ids(loader.output_file)
+            pending = [r for r in replayed_data if str(r.get('id_negocio', '')) not in written]
+            logger.info(f"Reanudando sobre {previous}: {len(written)} registros ya escritos, "
+                        f"{len(pending)} del journal por escribir")
+        else:
+            loader.output_file = loader.new_output_file()
+        journal.set_output_file(loader.output_file)
+    return pending
+
+def run_bulk_etl(start_id: Optional[int] = None, end_id: Optional[int] = None, output: str = "file", engine: str = "http", adaptive: bool = False, new_only: bool = False, resume: bool = False) -> Dict[str, Any]:
     """Ejecuta el proceso ETL en modo 'bulk' (masivo) para un rango de IDs dado.
 
+    Cada ejecución registra los IDs vivos e inexistentes en un bitmap persistente.
+    Sin rango explícito, se refrescan todos los IDs vivos conocidos más una frontera
+    por encima del mayor de ellos.
+
     Args:
-        start_id: El ID inicial para el rango de procesamiento masivo.
-        end_id: El ID final para el rango de procesamiento masivo.
+        start_id: El ID inicial para el rango de procesamiento masivo. Opcional.
+        end_id: El ID final para el rango de procesamiento masivo. Opcional.
         output: El destino para los datos de salida.
                 Actualmente solo acepta "file". Por defecto es "file".
+        engine: Motor para las páginas de detalle: "http" (por defecto, con
+                fallback a Selenium), "async", "selenium" o "tabs" (varias
+                pestañas por navegador).
+        adaptive: Si es True, el rango se sondea por bloques y solo se recorren
+                completos los bloques con aciertos, salteando los tramos vacíos.
+        new_only: Si es True, se busca el mayor ID vivo actual y solo se recorren
+                los IDs por encima del high-water mark de la corrida anterior.
+        resume: Si es True, se recuperan los registros del journal de una corrida
+                interrumpida y se saltean los IDs que ya había terminado. La salida se
+                agrega al archivo de esa corrida, sin repetir los registros que ya tenía.
 
     Returns:
         Dict[str, Any]: Un diccionario conteniendo el estado del proceso ETL,
                         un mensaje, y el número de registros procesados.
     """
-    logger.info(f"Iniciando ETL BULK. Start ID: {start_id}, End ID: {end_id}, Output: {output}")
+    from src.extractors.id_density import IdDensityModel
+    from src.extractors.id_frontier import FrontierProber, HighWaterMark
+    logger.info(f"Iniciando ETL BULK. Start ID: {start_id}, End ID: {end_id}, Output: {output}, Engine: {engine}, Adaptive: {adaptive}, New only: {new_only}, Resume: {resume}")
+    journal = None
     try:
         config = get_config()
+        model = IdDensityModel(config)
+        high_water_mark = HighWaterMark(config)
+
+        # Cada registro se escribe al journal apenas llega: un corte no pierde la corrida
+        journal = ResultJournal(config, 'bulk')
+        replayed_data: List[Dict[str, Any]] = []
+        completed_ids: set = set()
+        replayed_hit_blocks: set = set()
+        if resume:
+            replayed_data, completed_ids = journal.replay()
+            # Lo ya consultado en la corrida interrumpida cuenta para el modelo de densidad
+            replayed_live = {int(r['id_negocio']) for r in replayed_data if str(r.get('id_negocio', '')).isdigit()}
+            replayed_hit_blocks = model.record(replayed_live, (int(i) for i in completed_ids if i.isdigit()))
+        else:
+            journal.reset()
+
+        if new_only:
+            # Delta diario: desde el último ID cubierto hasta el mayor ID vivo actual
+            last_mark = high_water_mark.load()
+            if last_mark is None:
+                last_mark = model.bitmap.max_live() or (config['extractor']['bulk']['start_id'] - 1)
+            max_live = FrontierProber(config).find_max_live(last_mark)
+            if max_live <= last_mark:
+                logger.info(f"No hay IDs nuevos por encima del high-water mark {last_mark}.")
+                return {"status": "success", "message": "No hay IDs nuevos.", "records_processed": 0}
+            start_id, end_id = last_mark + 1, max_live
+            logger.info(f"IDs nuevos a recorrer: {start_id}-{end_id}")
+        use_known_ids = start_id is None and end_id is None and model.has_history()
+        if start_id is None:
+            start_id = config['extractor']['bulk']['start_id']
+        if end_id is None:
+            end_id = config['extractor']['bulk']['end_id']
+
         collector = BulkCollector(config=config, start_id=start_id, end_id=end_id)
-        scraper = BulkScraper(config=config)
+        scraper = BulkScraper(config=config, engine=engine)
+        scraper.journal = journal
         transformer = BusinessTransformer()
         loaders = _get_loaders(output, config)
+        replayed_data = _resume_output(journal, loaders, replayed_data, resume)
 
-        logger.info("Recolectando URLs (Bulk)")
-        urls_data = collector.collect_urls()
-        logger.info(f"Recolectadas {len(urls_data)} URLs (Bulk)")
-
-        if not urls_data:
+        if not use_known_ids and collector.count() == 0:
             logger.warning("No se recolectaron URLs en modo Bulk. El ETL se detendrá.")
             return {"status": "warning", "message": "No se recolectaron URLs en modo Bulk.", "records_processed": 0}
 
-        # Flatten the list of lists
-        urls = [url for chunk in urls_data for url in chunk]
-
-        logger.info("Haciendo scraping de datos (Bulk)")
-        scraped_data = scraper.scrape_urls(urls)
-        logger.info(f"Scrapeados {len(scraped_data)} registros (Bulk)")
-
-        if not scraped_data:
+        def bulk_records() -> Iterable[Dict[str, Any]]:
+            # Las URLs se generan de forma perezosa y el scraper mantiene una ventana acotada en vuelo
+            yield from replayed_data
+            if use_known_ids:
+                logger.info(f"Haciendo scraping de datos (Bulk) de los IDs vivos conocidos más {model.frontier} IDs de frontera")
+                yield from _scrape_bulk_iter(collector, scraper, model, model.default_ids(), completed_ids)
+            elif adaptive:
+                logger.info(f"Haciendo scraping de datos (Bulk) adaptativo para IDs {start_id}-{end_id}")
+                hit_blocks = yield from _scrape_bulk_iter(collector, scraper, model, model.coarse_ids(start_id, end_id), completed_ids)
+                hit_blocks |= replayed_hit_blocks
+                if hit_blocks:
+                    logger.info(f"Refinando {len(hit_blocks)} bloques con aciertos nuevos")
+                    yield from _scrape_bulk_iter(collector, scraper, model, model.refine_ids(hit_blocks, start_id, end_id), completed_ids)
+            else:
+                logger.info(f"Haciendo scraping de datos (Bulk) para {collector.count()} IDs")
+                yield from _scrape_bulk_iter(collector, scraper, model, range(start_id, end_id + 1), completed_ids)
+
+        # Extracción, transformación y carga encadenadas: los registros llegan a disco a medida que se extraen
+        logger.info("Scrapeando, transformando y cargando datos en streaming (Bulk)")
+        records_loaded = _run_pipeline(bulk_records(), transformer, loaders)
+        model.save()
+        # El high-water mark es el mayor ID vivo visto: los IDs por encima pueden aparecer más adelante
+        max_live_seen = model.bitmap.max_live()
+        if max_live_seen is not None and max_live_seen > (high_water_mark.load() or 0):
+            high_water_mark.save(max_live_seen)
+
+        if not records_loaded:
             logger.warning("No se scrapearon datos en modo Bulk. El ETL se detendrá.")
             return {"status": "warning", "message": "No se scrapearon datos en modo Bulk.", "records_processed": 0}
+        logger.info(f"Carga de datos completada (Bulk) usando {output}: {records_loaded} registros")
 
-        logger.info("Transformando datos (Bulk)")
-        transformed_data = transformer.transform(scraped_data)
-        logger.info(f"Transformados {len(transformed_data)} registros (Bulk)")
-
-        logger.info("Cargando datos (Bulk)")
-        for loader in loaders:
-            loader.load(transformed_data)
-        logger.info(f"Carga de datos completada (Bulk) usando {output}")
-
+        # Con los datos ya cargados, el journal de la corrida no hace falta
+        journal.reset()
         logger.info("Proceso ETL BULK completado exitosamente.")
-        return {"status": "success", "message": "ETL Bulk completado.", "records_processed": len(transformed_data)}
+        return {"status": "success", "message": "ETL Bulk completado.", "records_processed": records_loaded}
     except Exception as e:
         logger.error(f"Error en el proceso ETL BULK: {e}", exc_info=True)
         return {"status": "error", "message": str(e)}
+    finally:
+        if journal is not None:
+            journal.close()
 
 def process_manual_input(url: Optional[str] = None, file: Optional[str] = None, output: str = "file") -> Dict[str, Any]:
     """Ejecuta el proceso ETL para una única URL o archivos HTML (modo manual).
@@ -203,66 +387,170 @@ def process_manual_input(url: Optional[str] = None, file: Optional[str] = None,
         logger.error(f"Error in ETL MANUAL process: {e}", exc_info=True)
         return {"status": "error", "message": str(e)}
 
-def run_sequential_etl(rubros: Optional[List[str]] = None, localidades: Optional[List[str]] = None, output: str = "file", progress_callback=None) -> Dict[str, Any]:
+def run_sequential_etl(rubros: Optional[List[str]] = None, localidades: Optional[List[str]] = None, output: str = "file", progress_callback=None, engine: str = "http", collection_mode: str = "browser", start_page: int = 1, collectors: Optional[int] = None, resume: bool = False) -> Dict[str, Any]:
     """Ejecuta el proceso ETL secuencialmente basado en categorías (rubros) y localidades.
 
+    La recolección corre en un hilo aparte y alimenta una cola acotada: los workers
+    de scraping procesan las URLs a medida que se descubren, sin esperar a que
+    termine la recolección de todas las combinaciones.
+
     Args:
         rubros: Una lista opcional de categorías (rubros) a procesar.
         localidades: Una lista opcional de localidades por las cuales filtrar.
         output: El destino para los datos de salida.
                 Actualmente solo acepta "file". Por defecto es "file".
         progress_callback: Función opcional para reportar progreso.
+        engine: Motor para las páginas de detalle: "http" (por defecto, con
+                fallback a Selenium), "selenium" o "tabs" (varias pestañas por navegador).
+        collectors: Cantidad de colectores que recorren combinaciones en paralelo.
+                Por defecto se toma de EXTRACTOR_CONFIG['sequential'].
+        resume: Si es True, se recuperan los registros del journal de una corrida
+                interrumpida y se saltean los IDs que ya había terminado. La salida se
+                agrega al archivo de esa corrida, sin repetir los registros que ya tenía.
 
     Returns:
         Dict[str, Any]: Un diccionario conteniendo el estado del proceso ETL,
                         un mensaje, y el número de registros procesados.
     """
-    logger.info(f"Iniciando ETL SEQUENTIAL. Rubros: {rubros}, Localidades: {localidades}, Output: {output}")
+    logger.info(f"Iniciando ETL SEQUENTIAL. Rubros: {rubros}, Localidades: {localidades}, Output: {output}, Engine: {engine}")
     all_scraped_data = []
     collector = None
+    journal = None
+    csv_writer = None
     try:
-        from src.extractors.sequential_collector import SequentialCollector
-        from src.extractors.sequential_scraper import GuiaCoresScraper, process_url_chunk_for_sequential
         config = get_config()
-        collector = SequentialCollector(rubros=rubros, localidades=localidades)
-
-        logger.info("Recolectando URLs (Sequential)")
-        urls_dict: Dict[str, str] = collector.collect_urls(progress_callback=progress_callback)
-
-        if not urls_dict:
-            logger.warning("No se recolectaron URLs en modo Sequential. El ETL se detendrá.")
-            return {"status": "warning", "message": "No se recolectaron URLs en modo Sequential.", "records_processed": 0}
-        logger.info(f"Recolectadas {len(urls_dict)} URLs (Sequential)")
-
-        urls_list_for_scraper = [{"id_negocio": id_negocio, "url": url_value} for id_negocio, url_value in urls_dict.items()]
-
-        logger.info("Iniciando scraping de datos (Sequential) con procesamiento paralelo.")
-
         max_workers = config.get('MAX_WORKERS', 4)
-        chunk_size_scraper = config.get('CHUNK_SIZE_SCRAPER', 10)
-
-        logger.info(f"Usando {max_workers} workers y chunk size {chunk_size_scraper} para scraping paralelo.")
-
-        futures = []
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            url_chunks = list(chunkify(urls_list_for_scraper, chunk_size_scraper))
-            logger.info(f"Dividiendo {len(urls_list_for_scraper)} URLs en {len(url_chunks)} trozos.")
-
-            for i, chunk in enumerate(url_chunks):
-                logger.info(f"Enviando trozo {i+1}/{len(url_chunks)} de URLs a un worker.")
-                futures.append(executor.submit(process_url_chunk_for_sequential, chunk, config))
-
-            for i, future in enumerate(as_completed(futures)):
-                logger.info(f"Recuperando resultado del trozo {i+1}/{len(url_chunks)}.")
+        # Lotes chicos: cada worker persistente toma el siguiente apenas termina el anterior,
+        # así que un lote lento no deja a los demás workers ociosos al final de la corrida
+        batch_size = config['extractor'].get('sequential', {}).get('batch_size', 2)
+        if engine == 'tabs':
+            # Cada lote se reparte entre las pestañas del worker: lotes chicos dejarían pestañas ociosas
+            batch_size = max(batch_size, config['extractor'].get('tabs', {}).get('chunk_size', 32))
+        queue_size = config['extractor'].get('sequential', {}).get('url_queue_size', 1000)
+
+        # Cada registro se escribe al journal apenas vuelve de un worker: un corte no pierde la corrida
+        journal = ResultJournal(config, 'sequential')
+        completed_ids: set = set()
+        if resume:
+            all_scraped_data, completed_ids = journal.replay()
+        else:
+            journal.reset()
+
+        # Un único escritor del CSV de leads: los workers solo retornan registros, y cada lote
+        # escrito se marca en el índice de procesados y se confirma en la tabla de reclamos
+        processed_index = ProcessedIdIndex(config)
+        claims = ClaimStore(config)
+        if resume:
+            # Los workers de la corrida cortada murieron con sus IDs reclamados: liberarlos ya
+            claims.release_dead_owners()
+        else:
+            # Corrida nueva: los IDs que fallaron en corridas anteriores tienen otra vez max_attempts intentos
+            claims.reset_attempts()
+
+        def on_csv_flush(records: List[Dict[str, Any]]) -> None:
+            written_ids = [str(r['id_negocio']) for r in records if r.get('id_negocio')]
+            processed_index.add_many(written_ids)
+            claims.mark_done(written_ids, any_owner=True)
+
+        csv_writer = CsvWriter(config, on_flush=on_csv_flush)
+        csv_writer.start()
+
+        # Cola acotada entre el collector (productor) y los workers de scraping (consumidores):
+        # cada URL nueva se encola apenas se descubre y el collector se frena si el scraping se atrasa
+        url_queue: "queue.Queue[Optional[Dict[str, str]]]" = queue.Queue(maxsize=queue_size)
+        collector = SequentialCollector(rubros=rubros, localidades=localidades, collection_mode=collection_mode,
+                                        start_page=start_page, collectors=collectors,
+                                        url_sink=lambda id_negocio, url: url_queue.put({"id_negocio": id_negocio, "url": url}))
+        collected: Dict[str, Dict[str, str]] = {}
+
+        def run_collector() -> None:
+            try:
+                collected['urls'] = collector.collect_urls(progress_callback=progress_callback)
+            except Exception as exc:
+                logger.error(f"Error en la recolección de URLs (Sequential): {exc}", exc_info=True)
+            finally:
+                url_queue.put(None)
+
+        logger.info("Recolectando URLs y scrapeando en paralelo (Sequential)")
+        logger.info(f"Usando {max_workers} workers persistentes y lotes de {batch_size} URLs para scraping paralelo.")
+        collector_thread = threading.Thread(target=run_collector, name="sequential-collector", daemon=True)
+        collector_thread.start()
+
+        # Los IDs terminados en una corrida anterior se tratan como ya vistos
+        seen_ids = set(completed_ids)
+        batch: List[Dict[str, str]] = []
+        in_flight = set()
+        submitted_chunks = 0
+        collection_done = False
+
+        def harvest(done_futures) -> None:
+            for future in done_futures:
+                in_flight.discard(future)
                 try:
                     chunk_result = future.result()
                     if chunk_result:
+                        for record in chunk_result:
+                            journal.append_record(record)
+                            # Se bloquea si el escritor se atrasa: el backpressure llega hasta el collector
+                            csv_writer.put(record)
                         all_scraped_data.extend(chunk_result)
                         logger.info(f"Añadidos {len(chunk_result)} registros. Total scrapeado hasta ahora: {len(all_scraped_data)}")
                     else:
-                         logger.warning(f"El trozo {i+1} no devolvió datos scrapeados.")
+                        logger.warning("Un trozo no devolvió datos scrapeados.")
                 except Exception as exc:
-                    logger.error(f"Una tarea de scraping (trozo {i+1}) generó una excepción: {exc}", exc_info=True)
+                    logger.error(f"Una tarea de scraping generó una excepción: {exc}", exc_info=True)
+
+        # Cada worker crea su scraper (driver, sesión HTTP, índice) una sola vez en el initializer
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_sequential_worker,
+                                 initargs=(config, engine, False, get_rate_limiter(config))) as executor:
+            def submit(chunk: List[Dict[str, str]]) -> None:
+                nonlocal submitted_chunks
+                # Como mucho dos trozos por worker en vuelo: el resto espera en la cola del collector
+                while len(in_flight) >= max_workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    harvest(done)
+                submitted_chunks += 1
+                logger.info(f"Enviando trozo {submitted_chunks} ({len(chunk)} URLs) a un worker.")
+                in_flight.add(executor.submit(process_batch_in_worker, chunk))
+
+            while not collection_done:
+                try:
+                    item = url_queue.get(timeout=1)
+                except queue.Empty:
+                    # Sin URLs nuevas por ahora: no dejar a los workers ociosos con un trozo incompleto
+                    if batch and len(in_flight) < max_workers:
+                        submit(batch)
+                        batch = []
+                    harvest([f for f in list(in_flight) if f.done()])
+                    continue
+
+                if item is None:
+                    collection_done = True
+                elif item["id_negocio"] not in seen_ids:
+                    seen_ids.add(item["id_negocio"])
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        submit(batch)
+                        batch = []
+
+            collector_thread.join()
+            # URLs recolectadas que no pasaron por la cola (por ejemplo, si el collector falló a mitad de camino)
+            for id_negocio, url_value in collected.get('urls', {}).items():
+                if id_negocio not in seen_ids:
+                    seen_ids.add(id_negocio)
+                    batch.append({"id_negocio": id_negocio, "url": url_value})
+            for chunk in chunkify(batch, batch_size):
+                submit(chunk)
+
+            if not seen_ids:
+                logger.warning("No se recolectaron URLs en modo Sequential. El ETL se detendrá.")
+                return {"status": "warning", "message": "No se recolectaron URLs en modo Sequential.", "records_processed": 0}
+            logger.info(f"Recolectadas {len(seen_ids)} URLs (Sequential). Esperando {len(in_flight)} trozos en vuelo.")
+
+            harvest(list(as_completed(in_flight)))
+
+        csv_writer.close()
+        csv_writer = None
 
         logger.info(f"Scrapeados {len(all_scraped_data)} registros (Sequential).")
 
@@ -282,6 +570,7 @@ def run_sequential_etl(rubros: Optional[List[str]] = None, localidades: Optional
             loader.load(transformed_data)
         logger.info(f"Carga de datos completada (Sequential) usando {output}")
 
+        journal.reset()
         logger.info("Proceso ETL SEQUENTIAL completado.")
         return {"status": "success", "message": "ETL Sequential completado.", "records_processed": len(transformed_data)}
 
@@ -289,6 +578,10 @@ def run_sequential_etl(rubros: Optional[List[str]] = None, localidades: Optional
         logger.error(f"Error en el proceso ETL SEQUENTIAL: {e}", exc_info=True)
         return {"status": "error", "message": str(e)}
     finally:
+        if csv_writer is not None:
+            csv_writer.close()
+        if journal is not None:
+            journal.close()
         if collector and hasattr(collector, 'cleanup') and callable(collector.cleanup):
             try:
                 collector.cleanup()
@@ -296,6 +589,121 @@ def run_sequential_etl(rubros: Optional[List[str]] = None, localidades: Optional
             except Exception as cleanup_error:
                 logger.error(f"Error durante la limpieza final del collector sequential: {cleanup_error}", exc_info=True)
 
+def run_reparse_etl(output: str = "file", include_expired: bool = True) -> Dict[str, Any]:
+    """Reconstruye la salida procesada a partir de la caché de páginas, sin tocar la red.
+
+    Pensado para aplicar un cambio en los selectores de `_extract_*` sin volver a
+    descargar las páginas de detalle.
+
+    Args:
+        output: El destino para los datos de salida.
+                Actualmente solo acepta "file". Por defecto es "file".
+        include_expired: Si es True (por defecto), también se re-parsean las páginas
+                que superaron el TTL de la caché.
+
+    Returns:
+        Dict[str, Any]: Un diccionario conteniendo el estado del proceso ETL,
+                        un mensaje, y el número de registros procesados.
+    """
+    from src.common.page_store import PageStore
+    logger.info(f"Iniciando ETL REPARSE desde la caché de páginas. Output: {output}")
+    try:
+        config = get_config()
+        store = PageStore(config)
+        scraper = BulkScraper(config=config)
+        transformer = BusinessTransformer()
+        loaders = _get_loaders(output, config)
+
+        scraped_data = []
+        for business_id, url, html, fetched_at in store.iter_pages(include_expired=include_expired):
+            record = scraper.parse_business_html(html, url)
+            # La fecha de extracción es la de la descarga original, no la del re-parseo
+            record['fecha_extraccion'] = datetime.fromtimestamp(fetched_at).strftime('%Y-%m-%d %H:%M:%S')
+            scraped_data.append(record)
+        store.close()
+        logger.info(f"Re-parseadas {len(scraped_data)} páginas cacheadas (Reparse)")
+
+        if not scraped_data:
+            logger.warning("La caché de páginas está vacía. El ETL se detendrá.")
+            return {"status": "warning", "message": "No hay páginas en la caché.", "records_processed": 0}
+
+        logger.info("Transformando datos (Reparse)")
+        transformed_data = transformer.transform(scraped_data)
+        logger.info(f"Transformados {len(transformed_data)} registros (Reparse)")
+
+        logger.info("Cargando datos (Reparse)")
+        for loader in loaders:
+            loader.load(transformed_data)
+        logger.info(f"Carga de datos completada (Reparse) usando {output}")
+
+        return {"status": "success", "message": "ETL Reparse completado.", "records_processed": len(transformed_data)}
+    except Exception as e:
+        logger.error(f"Error en el proceso ETL REPARSE: {e}", exc_info=True)
+        return {"status": "error", "message": str(e)}
+
+def run_replay_etl(archive: str, output: str = "file", workers: Optional[int] = None) -> Dict[str, Any]:
+    """Re-deriva los registros a partir de un archivo de páginas de detalle, sin tocar la red.
+
+    Args:
+        archive: Directorio con las páginas archivadas (`<id_negocio>.html`).
+        output: El destino para los datos de salida.
+                Actualmente solo acepta "file". Por defecto es "file".
+        workers: Procesos para el re-parseo (por defecto, uno por núcleo).
+
+    Returns:
+        Dict[str, Any]: Un diccionario conteniendo el estado del proceso ETL,
+                        un mensaje, y el número de registros procesados.
+    """
+    from src.extractors.replay import replay_archive
+    logger.info(f"Iniciando ETL REPLAY. Archivo: {archive}, Output: {output}")
+    try:
+        if not os.path.isdir(archive):
+            raise ValueError(f"El archivo de páginas no existe o no es un directorio: {archive}")
+
+        config = get_config()
+        transformer = BusinessTransformer()
+        loaders = _get_loaders(output, config)
+
+        scraped_data = replay_archive(archive, config, max_workers=workers)
+        if not scraped_data:
+            logger.warning("No se re-parsearon páginas del archivo. El ETL se detendrá.")
+            return {"status": "warning", "message": "No se encontraron páginas en el archivo.", "records_processed": 0}
+
+        logger.info("Transformando datos (Replay)")
+        transformed_data = transformer.transform(scraped_data)
+        logger.info(f"Transformados {len(transformed_data)} registros (Replay)")
+
+        logger.info("Cargando datos (Replay)")
+        for loader in loaders:
+            loader.load(transformed_data)
+        logger.info(f"Carga de datos completada (Replay) usando {output}")
+
+        return {"status": "success", "message": "ETL Replay completado.", "records_processed": len(transformed_data)}
+    except Exception as e:
+        logger.error(f"Error en el proceso ETL REPLAY: {e}", exc_info=True)
+        return {"status": "error", "message": str(e)}
+
+def refresh_search_catalog(force: bool = False) -> Dict[str, Any]:
+    """Carga o regenera el catálogo cacheado de rubros y localidades de la búsqueda avanzada.
+
+    Args:
+        force: Si es True, descarga el catálogo aunque la caché siga vigente.
+
+    Returns:
+        Dict[str, Any]: Un diccionario con el estado y la cantidad de opciones del catálogo.
+    """
+    from src.extractors.search_catalog import SearchCatalog
+    try:
+        catalog = SearchCatalog(get_config())
+        data = catalog.refresh() if force else catalog.load()
+        message = f"Catálogo con {len(data['rubros'])} rubros y {len(data['localidades'])} localidades."
+        logger.info(message)
+        status = "success" if data['rubros'] or data['localidades'] else "warning"
+        return {"status": status, "message": message, "records_processed": len(data['rubros']) + len(data['localidades'])}
+    except Exception as e:
+        logger.error(f"Error al actualizar el catálogo de búsqueda: {e}", exc_info=True)
+        return {"status": "error", "message": str(e)}
+
 
 if __name__ == "__main__":
     import argparse
@@ -303,9 +711,13 @@ if __name__ == "__main__":
     subparsers = parser.add_subparsers(dest="mode", help="Modo ETL a ejecutar", required=True)
 
     bulk_parser = subparsers.add_parser("bulk", help="Ejecutar ETL en modo masivo para un rango de IDs.")
-    bulk_parser.add_argument("--start_id", type=int, required=True, help="ID inicial para el procesamiento masivo.")
-    bulk_parser.add_argument("--end_id", type=int, required=True, help="ID final para el procesamiento masivo.")
+    bulk_parser.add_argument("--start_id", type=int, default=None, help="ID inicial para el procesamiento masivo. Sin rango, se refrescan los IDs vivos conocidos más la frontera.")
+    bulk_parser.add_argument("--end_id", type=int, default=None, help="ID final para el procesamiento masivo.")
     bulk_parser.add_argument("--output", type=str, default="file", choices=["file"], help="Destino de salida (file).")
+    bulk_parser.add_argument("--engine", type=str, default="http", choices=["http", "async", "selenium", "tabs"], help="Motor para las páginas de detalle (http con fallback a Selenium, async, selenium, o tabs: varias pestañas por navegador).")
+    bulk_parser.add_argument("--adaptive", action="store_true", help="Sondear el rango por bloques y saltear los tramos sin IDs vivos.")
+    bulk_parser.add_argument("--new-only", action="store_true", help="Buscar el mayor ID vivo actual y recorrer solo los IDs por encima del high-water mark anterior.")
+    bulk_parser.add_argument("--resume", action="store_true", help="Retomar una corrida interrumpida desde su journal, salteando los IDs ya terminados.")
 
     manual_parser = subparsers.add_parser("manual", help="Ejecutar ETL para una URL única o archivos HTML.")
     manual_group = manual_parser.add_mutually_exclusive_group(required=True)
@@ -317,12 +729,30 @@ if __name__ == "__main__":
     sequential_parser.add_argument("--rubros", type=str, help="Comma-separated list of categories (e.g., 'restaurants,hotels'). Optional.")
     sequential_parser.add_argument("--localidades", type=str, help="Comma-separated list of localities. Optional.")
     sequential_parser.add_argument("--output", type=str, default="file", choices=["file"], help="Destino de salida (file).")
+    sequential_parser.add_argument("--engine", type=str, default="http", choices=["http", "selenium", "tabs"], help="Motor para las páginas de detalle (http con fallback a Selenium, selenium, o tabs: varias pestañas por navegador).")
+    sequential_parser.add_argument("--collection-mode", type=str, default="browser", choices=["browser", "http"], help="Descubrimiento de URLs: clics en 'Ver más' (browser) o paginación HTTP directa (http).")
+    sequential_parser.add_argument("--start-page", type=int, default=1, help="Página de resultados desde la cual retomar la recolección (modo http). Se aplica solo a la primera combinación rubro/localidad.")
+    sequential_parser.add_argument("--collectors", type=int, default=None, help="Cantidad de colectores en paralelo para las combinaciones rubro/localidad.")
+    sequential_parser.add_argument("--resume", action="store_true", help="Retomar una corrida interrumpida desde su journal, salteando los IDs ya terminados.")
+
+    reparse_parser = subparsers.add_parser("reparse", help="Reconstruir la salida procesada desde la caché de páginas, sin descargar nada.")
+    reparse_parser.add_argument("--output", type=str, default="file", choices=["file"], help="Destino de salida (file).")
+    reparse_parser.add_argument("--fresh-only", action="store_true", help="Ignorar las páginas cacheadas que superaron el TTL.")
+
+    replay_parser = subparsers.add_parser("replay", help="Re-parsear un archivo de páginas de detalle usando todos los núcleos.")
+    replay_parser.add_argument("--archive", type=str, required=True, help="Directorio con las páginas archivadas (<id_negocio>.html).")
+    replay_parser.add_argument("--output", type=str, default="file", choices=["file"], help="Destino de salida (file).")
+    replay_parser.add_argument("--workers", type=int, default=None, help="Procesos para el re-parseo (por defecto, uno por núcleo).")
+
+    catalog_parser = subparsers.add_parser("catalog", help="Cargar o actualizar el catálogo cacheado de rubros y localidades.")
+    catalog_parser.add_argument("--refresh", action="store_true", help="Volver a descargar el catálogo aunque la caché siga vigente.")
 
     args = parser.parse_args()
 
     try:
         if args.mode == "bulk":
-            run_bulk_etl(args.start_id, args.end_id, args.output)
+            run_bulk_etl(args.start_id, args.end_id, args.output, engine=args.engine, adaptive=args.adaptive,
+                         new_only=args.new_only, resume=args.resume)
         elif args.mode == "manual":
             if args.url:
                 process_manual_input(url=args.url, output=args.output)
@@ -331,6 +761,14 @@ if __name__ == "__main__":
         elif args.mode == "sequential":
             rubros_list = [r.strip() for r in args.rubros.split(',') if r.strip()] if args.rubros else None
             localidades_list = [l.strip() for l in args.localidades.split(',') if l.strip()] if args.localidades else None
-            run_sequential_etl(rubros_list, localidades_list, args.output)
+            run_sequential_etl(rubros_list, localidades_list, args.output, engine=args.engine,
+                               collection_mode=args.collection_mode, start_page=args.start_page,
+                               collectors=args.collectors, resume=args.resume)
+        elif args.mode == "reparse":
+            run_reparse_etl(args.output, include_expired=not args.fresh_only)
+        elif args.mode == "replay":
+            run_replay_etl(args.archive, args.output, workers=args.workers)
+        elif args.mode == "catalog":
+            refresh_search_catalog(force=args.refresh)
     except Exception as e:
         logger.error(f"Error during ETL execution: {e}", exc_info=True)
@@ -1,6 +1,6 @@
 import logging
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 from urllib.parse import urlparse
 from ..common.config import get_config
 
@@ -67,49 +67,74 @@ class BusinessTransformer:
         except:
             return 'N/A'
             
-    def transform(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def transform_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Transforma y valida los datos de negocios
+        Transforma y valida un único negocio (modifica el diccionario recibido)
         
         Args:
-            data (List[Dict[str, Any]]): Lista de diccionarios con datos de negocios
+            item (Dict[str, Any]): Datos de un negocio
             
         Returns:
-            List[Dict[str, Any]]: Lista de diccionarios con datos transformados
+            Dict[str, Any]: El mismo diccionario con los datos transformados
+        """
+        # Limpiar texto
+        if self.transformer_config['clean_text']:
+            for field in ['nombre', 'direccion', 'descripcion', 'rubros']:
+                if field in item:
+                    item[field] = self._clean_text(item[field])
+                    
+        # Normalizar teléfonos
+        if self.transformer_config['normalize_phones']:
+            if 'telefonos' in item:
+                phones = [self._normalize_phone(p.strip()) for p in item['telefonos'].split(',')]
+                item['telefonos'] = ', '.join(p for p in phones if p != 'N/A') or 'N/A'
+            if 'whatsapp' in item:
+                item['whatsapp'] = self._normalize_phone(item['whatsapp'])
+                
+        # Validar email
+        if self.transformer_config['validate_emails'] and 'email' in item:
+            item['email'] = self._validate_email(item['email'])
+            
+        # Validar URLs
+        if self.transformer_config['validate_urls']:
+            for field in ['sitio_web', 'facebook', 'instagram']:
+                if field in item:
+                    item[field] = self._validate_url(item[field])
+                    
+        return item
+        
+    def transform_iter(self, data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
         """
-        transformed_data = []
+        Versión perezosa de transform: transforma cada negocio a medida que se consume
         
+        Args:
+            data (Iterable[Dict[str, Any]]): Negocios (puede ser un generador)
+            
+        Yields:
+            Dict[str, Any]: Negocios transformados; los que fallan se descartan
+        """
+        total = 0
+        transformed = 0
         for item in data:
+            total += 1
             try:
-                # Limpiar texto
-                if self.transformer_config['clean_text']:
-                    for field in ['nombre', 'direccion', 'descripcion', 'rubros']:
-                        if field in item:
-                            item[field] = self._clean_text(item[field])
-                            
-                # Normalizar teléfonos
-                if self.transformer_config['normalize_phones']:
-                    if 'telefonos' in item:
-                        phones = [self._normalize_phone(p.strip()) for p in item['telefonos'].split(',')]
-                        item['telefonos'] = ', '.join(p for p in phones if p != 'N/A') or 'N/A'
-                    if 'whatsapp' in item:
-                        item['whatsapp'] = self._normalize_phone(item['whatsapp'])
-                        
-                # Validar email
-                if self.transformer_config['validate_emails'] and 'email' in item:
-                    item['email'] = self._validate_email(item['email'])
-                    
-                # Validar URLs
-                if self.transformer_config['validate_urls']:
-                    for field in ['sitio_web', 'facebook', 'instagram']:
-                        if field in item:
-                            item[field] = self._validate_url(item[field])
-                            
-                transformed_data.append(item)
-                
+                result = self.transform_item(item)
             except Exception as e:
                 logger.error(f"Error al transformar item: {e}")
                 continue
-                
-        logger.info(f"Transformados {len(transformed_data)} de {len(data)} registros")
-        return transformed_data 
\ No newline at end of file
+            transformed += 1
+            yield result
+            
+        logger.info(f"Transformados {transformed} de {total} registros")
+        
+    def transform(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Transforma y valida los datos de negocios
+        
+        Args:
+            data (List[Dict[str, Any]]): Lista de diccionarios con datos de negocios
+            
+        Returns:
+            List[Dict[str, Any]]: Lista de diccionarios con datos transformados
+        """
+        return list(self.transform_iter(data))
@@ -0,0 +1,120 @@
+import copy
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.common.config import get_config
+from src.common.rate_limiter import install_rate_limiter
+
+DETAIL_HTML = """<html><body>
+<a class="search-result-name" href="#"><h1>{name}</h1></a>
+<span class="search-result-address">Calle {id} 123</span>
+</body></html>"""
+
+EMPTY_HTML = "<html><body><p>Página no encontrada</p></body></html>"
+
+# Página normal del sitio (con su encabezado) para un ID que no existe
+MISSING_HTML = """<html><body>
+<nav><a href="#" data-target="#formBusquedaAvazada">Búsqueda avanzada</a></nav>
+<div class="container"></div>
+</body></html>"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Configuración del proyecto con las cachés en un directorio temporal y sin limitador."""
+    config = copy.deepcopy(get_config())
+    extractor = config['extractor']
+    extractor['rate_limit']['enabled'] = False
+    extractor['bulk']['density']['bitmap_path'] = str(tmp_path / 'bulk_ids.bitmap')
+    extractor['bulk']['frontier_probe']['state_path'] = str(tmp_path / 'bulk_state.json')
+    extractor['page_store']['path'] = str(tmp_path / 'pages.sqlite3')
+    extractor['catalog']['path'] = str(tmp_path / 'search_catalog.json')
+    extractor['processed_index']['path'] = str(tmp_path / 'processed_ids.bitmap')
+    extractor['processed_index']['csv_path'] = str(tmp_path / 'leads.csv')
+    extractor['claims']['path'] = str(tmp_path / 'claims.sqlite3')
+    extractor['journal']['dir'] = str(tmp_path / 'journal')
+    extractor['csv_writer']['path'] = str(tmp_path / 'leads.csv')
+    return config
+
+
+@pytest.fixture(autouse=True)
+def no_process_rate_limiter():
+    """Cada test empieza y termina sin limitador registrado en el proceso."""
+    install_rate_limiter(None)
+    yield
+    install_rate_limiter(None)
+
+
+class StubSite:
+    """
+    Sitio HTTP local que imita las páginas de detalle: /detail?id=N responde con la
+    página de `pages[N]` (estado, cuerpo) o 404. Registra requests y conexiones.
+    """
+
+    def __init__(self, pages: Optional[Dict[int, Tuple[int, str]]] = None, delay: float = 0.0):
+        self.pages = pages or {}
+        self.delay = delay
+        self.requests: Dict[int, int] = {}
+        self.connections = set()
+        self._lock = threading.Lock()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, como el sitio real
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                business_id = int(query.get('id', ['0'])[0])
+                with site._lock:
+                    site.requests[business_id] = site.requests.get(business_id, 0) + 1
+                    site.connections.add(self.client_address)
+                    status, body = site.response_for(business_id)
+                if site.delay:
+                    time.sleep(site.delay)
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def response_for(self, business_id: int) -> Tuple[int, str]:
+        """Estado y cuerpo para un ID (se puede redefinir para simular fallas)."""
+        return self.pages.get(business_id, (404, EMPTY_HTML))
+
+    def add_business(self, business_id: int, name: Optional[str] = None) -> None:
+        self.pages[business_id] = (200, DETAIL_HTML.format(name=name or f"Negocio {business_id}", id=business_id))
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/index.php?r=search/detail&id="
+
+    def url(self, business_id: int) -> str:
+        return f"{self.base_url}{business_id}"
+
+    def start(self) -> 'StubSite':
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_site():
+    site = StubSite().start()
+    yield site
+    site.stop()
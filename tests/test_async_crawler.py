@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from src.extractors.async_crawler import AsyncDetailCrawler
+from src.extractors.bulk_scraper import BulkScraper, ScrapeCancelled
+
+from .conftest import MISSING_HTML
+
+
+@pytest.fixture
+def crawler(config):
+    config['extractor']['async'].update({'max_in_flight': 4, 'max_retries': 0})
+    return AsyncDetailCrawler(config, BulkScraper(config, engine='async'))
+
+
+def test_crawl_fetches_pages_and_reuses_the_cache(crawler, stub_site):
+    for business_id in (1, 2, 3):
+        stub_site.add_business(business_id)
+    urls = [stub_site.url(i) for i in (1, 2, 3)]
+
+    records = crawler.run(urls)
+
+    assert sorted(r['id_negocio'] for r in records) == ['1', '2', '3']
+    assert crawler.stats['records'] == 3 and crawler.stats['requests'] == 3
+
+    again = AsyncDetailCrawler(crawler.config, crawler.scraper)
+    assert len(again.run(urls)) == 3
+    assert again.stats['cached'] == 3 and again.stats['requests'] == 0
+    assert sum(stub_site.requests.values()) == 3
+
+
+def test_crawl_reports_confirmed_misses_and_counts_the_rest_as_failed(crawler, stub_site):
+    stub_site.pages[1] = (200, MISSING_HTML)
+    stub_site.pages[3] = (503, 'Service Unavailable')
+    misses = []
+    crawler.scraper._miss_sink = misses.append
+
+    assert crawler.run([stub_site.url(i) for i in (1, 2, 3)]) == []
+
+    assert sorted(misses) == ['1', '2']  # 2: 404
+    assert crawler.stats['missing'] == 2 and crawler.stats['failed'] == 1
+
+
+def test_cancelled_sink_stops_the_crawl(crawler, stub_site):
+    stub_site.response_for = lambda business_id: (200, f"<a class='search-result-name'><h1>N{business_id}</h1></a>")
+    stub_site.delay = 0.01
+    delivered = []
+
+    def sink(record):
+        if len(delivered) == 2:
+            raise ScrapeCancelled()
+        delivered.append(record)
+
+    crawler.scraper._sink = sink
+    started = time.monotonic()
+
+    with pytest.raises(ScrapeCancelled):
+        crawler.run(stub_site.url(i) for i in range(5000))
+
+    assert len(delivered) == 2
+    assert sum(stub_site.requests.values()) < 100 and time.monotonic() - started < 5
+
+
+def test_blocking_cache_reads_do_not_stall_the_event_loop(crawler, stub_site, monkeypatch):
+    for business_id in range(8):
+        stub_site.add_business(business_id)
+    crawler.io_workers = 8
+
+    def slow_get(business_id, include_expired=False):
+        time.sleep(0.3)  # SQLite sobre un disco lento
+        return None
+
+    monkeypatch.setattr(crawler.scraper.page_store, 'get', slow_get)
+    started = time.monotonic()
+
+    records = crawler.run([stub_site.url(i) for i in range(8)])
+
+    assert len(records) == 8
+    # En el event loop las 8 lecturas irían en serie (2.4 s)
+    assert time.monotonic() - started < 1.5
@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from src.extractors.bulk_collector import BulkCollector
+from src.extractors.bulk_scraper import BulkScraper
+
+from .conftest import DETAIL_HTML, EMPTY_HTML, MISSING_HTML
+
+
+def test_scrape_iter_reraises_engine_errors(config, monkeypatch):
+    scraper = BulkScraper(config, engine='http')
+
+    def broken_engine(urls):
+        scraper._add_result([], {'id_negocio': '1'})
+        raise RuntimeError('pool roto')
+
+    monkeypatch.setattr(scraper, '_scrape_with_http', broken_engine)
+    received = []
+
+    with pytest.raises(RuntimeError, match='pool roto'):
+        for record in scraper.scrape_iter(['u1', 'u2']):
+            received.append(record)
+
+    # Lo entregado antes del error llega igual; el corte no se confunde con un fin normal
+    assert received == [{'id_negocio': '1'}]
+    assert scraper.scrape_urls(['u1']) == []
+
+
+def _fake_init_worker(config, rate_limiter=None, engine=None):
+    pass
+
+
+def _fake_url_worker(url):
+    time.sleep(0.01)
+    return {'id_negocio': url.rsplit('=', 1)[-1], 'url': url}, False, 0, 1
+
+
+def _detail_url(business_id):
+    return f"http://127.0.0.1/index.php?r=search/detail&id={business_id}"
+
+
+def _abandon_after_two(scraper, total, url=_detail_url):
+    consumed = []
+
+    def urls():
+        for business_id in range(total):
+            consumed.append(business_id)
+            yield url(business_id)
+
+    stream = scraper.scrape_iter(urls(), buffer_size=2)
+    started = time.monotonic()
+    first = [next(stream), next(stream)]
+    stream.close()  # el consumidor falló en la transformación o la carga
+    return first, len(consumed), time.monotonic() - started
+
+
+def test_abandoning_scrape_iter_stops_the_selenium_engine(config, monkeypatch):
+    config['extractor']['bulk']['max_workers'] = 2
+    monkeypatch.setattr(BulkScraper, '_init_worker', staticmethod(_fake_init_worker))
+    monkeypatch.setattr(BulkScraper, '_scrape_single_url_worker', staticmethod(_fake_url_worker))
+    scraper = BulkScraper(config, engine='selenium')
+
+    first, consumed, elapsed = _abandon_after_two(scraper, 5000)
+
+    assert len(first) == 2
+    # Sin cancelación el motor seguiría con las 5000 URLs (~25 s con 2 workers)
+    assert consumed < 100 and elapsed < 5
+
+
+def test_abandoning_scrape_iter_stops_the_async_engine(config, stub_site):
+    stub_site.response_for = lambda business_id: (200, DETAIL_HTML.format(name='X', id=business_id))
+    stub_site.delay = 0.01
+    config['extractor']['async']['max_in_flight'] = 4
+    scraper = BulkScraper(config, engine='async')
+
+    first, consumed, elapsed = _abandon_after_two(scraper, 5000, stub_site.url)
+
+    assert len(first) == 2
+    assert consumed < 100 and elapsed < 5
+
+
+@pytest.mark.parametrize('engine', ['http', 'async'])
+def test_engines_only_report_confirmed_misses(config, stub_site, engine):
+    stub_site.add_business(1)
+    stub_site.pages[2] = (200, MISSING_HTML)  # el sitio dice que no existe
+    stub_site.pages[3] = (200, EMPTY_HTML)  # página ajena al sitio (bloqueo, error del proxy)
+    stub_site.pages[4] = (503, 'Service Unavailable')
+    config['extractor']['bulk']['selenium_fallback'] = False
+    config['extractor']['http']['retries'] = 0
+    config['extractor']['async'].update({'max_retries': 0})
+    scraper = BulkScraper(config, engine=engine)
+    misses = []
+
+    records = list(scraper.scrape_iter([stub_site.url(i) for i in range(1, 6)], on_miss=misses.append))
+
+    assert [r['id_negocio'] for r in records] == ['1']
+    assert sorted(misses) == ['2', '5']  # 5: 404
+
+
+def test_selenium_engine_keeps_a_bounded_window_of_ids_in_flight(config, monkeypatch):
+    config['extractor']['bulk'].update({'max_workers': 2, 'max_in_flight_per_worker': 2})
+    monkeypatch.setattr(BulkScraper, '_init_worker', staticmethod(_fake_init_worker))
+    monkeypatch.setattr(BulkScraper, '_scrape_single_url_worker', staticmethod(_fake_url_worker))
+    scraper = BulkScraper(config, engine='selenium')
+    collector = BulkCollector(config, start_id=1, end_id=40)
+    generated = []
+
+    def ids():
+        for business_id in range(collector.start_id, collector.end_id + 1):
+            generated.append(business_id)  # se generan a medida que el motor los envía
+            yield business_id
+
+    ahead = []
+    scraper._sink = lambda record: ahead.append(len(generated) - len(ahead) - 1)
+
+    scraper.scrape_urls(collector.urls_for_ids(ids()))
+
+    assert len(ahead) == 40
+    # Nunca hay más de max_workers * max_in_flight_per_worker IDs generados sin resultado
+    assert max(ahead) <= 4
@@ -0,0 +1,89 @@
+import multiprocessing as mp
+import time
+
+from src.common.claim_store import ClaimStore
+
+
+def _claim_and_die(config, business_ids, conn):
+    store = ClaimStore(config)
+    conn.send([store.claim(business_id) for business_id in business_ids])
+    # Termina sin release(), como un worker que se cae
+
+
+def _claim_in_dead_process(config, business_ids):
+    parent, child = mp.Pipe()
+    process = mp.get_context('fork').Process(target=_claim_and_die, args=(config, business_ids, child))
+    process.start()
+    claimed = parent.recv()
+    process.join()
+    return claimed
+
+
+def test_claim_is_exclusive_until_released(config):
+    store = ClaimStore(config)
+    assert store.claim('1')
+    assert not store.claim('1')
+
+    store.release(['1'])
+    assert store.claim('1')
+    store.close()
+
+
+def test_done_ids_are_never_reclaimed_and_failed_ones_up_to_max_attempts(config):
+    config['extractor']['claims']['max_attempts'] = 2
+    store = ClaimStore(config)
+    store.claim('done')
+    store.mark_done(['done'])
+    store.claim('flaky')
+    store.mark_failed(['flaky'])
+
+    assert not store.claim('done')
+    assert store.claim('flaky')  # segundo intento
+    store.mark_failed(['flaky'])
+    assert not store.claim('flaky')
+    store.close()
+
+
+def test_release_only_frees_the_given_ids(config):
+    worker = ClaimStore(config)
+    assert worker.claim('lote1') and worker.claim('lote2-ok') and worker.claim('lote2-error')
+    worker.mark_done(['lote2-ok'])
+
+    # Fin del segundo lote: 'lote1' sigue esperando a que el escritor del CSV lo confirme
+    worker.release(['lote2-ok', 'lote2-error'])
+
+    leases = dict(worker.conn.execute('SELECT id_negocio, lease_until FROM claims').fetchall())
+    assert leases['lote1'] > time.time() and leases['lote2-error'] == 0
+    assert leases['lote2-ok'] is None  # hecho: no se reabre
+    worker.close()
+
+
+def test_reset_attempts_gives_failed_ids_a_new_chance(config):
+    config['extractor']['claims']['max_attempts'] = 1
+    store = ClaimStore(config)
+    store.claim('1')
+    store.mark_failed(['1'])
+    assert not store.claim('1')
+
+    assert store.reset_attempts() == 1
+    assert store.claim('1')
+    store.close()
+
+
+def test_expired_lease_can_be_taken(config):
+    store = ClaimStore(config, lease_seconds=0)
+    assert store.claim('1')
+    time.sleep(0.01)
+    assert store.claim('1')
+    store.close()
+
+
+def test_resume_releases_leases_of_dead_processes(config):
+    assert _claim_in_dead_process(config, ['1', '2']) == [True, True]
+    store = ClaimStore(config)
+    assert not store.claim('1')  # el lease de 900 s sigue vigente
+
+    assert store.release_dead_owners() == 2
+    assert store.claim('1') and store.claim('2')
+    assert store.release_dead_owners() == 0  # los leases propios (proceso vivo) se conservan
+    store.close()
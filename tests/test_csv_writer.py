@@ -0,0 +1,67 @@
+import csv
+import queue
+import threading
+
+import pytest
+
+from src.loaders.csv_writer import LEAD_FIELDS, CsvWriter
+
+
+def _rows(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_single_writer_keeps_rows_whole_and_header_once(config):
+    path = config['extractor']['csv_writer']['path']
+    flushed = []
+    with CsvWriter(config, on_flush=flushed.extend) as writer:
+        producers = [threading.Thread(target=writer.put_many,
+                                      args=([{'id_negocio': f"{p}-{i}", 'nombre': 'a, "b"'} for i in range(250)],))
+                     for p in range(4)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+
+    rows = _rows(path)
+    assert len(rows) == 1000 and len(flushed) == 1000
+    assert {row['id_negocio'] for row in rows} == {f"{p}-{i}" for p in range(4) for i in range(250)}
+    assert all(row['nombre'] == 'a, "b"' for row in rows)
+
+
+def test_fixed_columns_keep_fields_missing_from_the_first_record(config):
+    path = config['extractor']['csv_writer']['path']
+    with CsvWriter(config) as writer:
+        writer.put({'id_negocio': '1', 'nombre': 'Uno'})  # página sin mapa
+    with CsvWriter(config) as writer:
+        writer.put({'nombre': 'Dos', 'id_negocio': '2', 'latitud': '-32.9', 'longitud': '-68.8'})
+
+    with open(path, encoding='utf-8', newline='') as f:
+        assert next(csv.reader(f)) == list(LEAD_FIELDS)
+    rows = _rows(path)
+    assert [(r['id_negocio'], r['nombre'], r['latitud'], r['longitud']) for r in rows] == \
+        [('1', 'Uno', '', ''), ('2', 'Dos', '-32.9', '-68.8')]
+
+
+def test_unknown_fields_and_foreign_headers_fail(config):
+    path = config['extractor']['csv_writer']['path']
+    with CsvWriter(config) as writer:
+        with pytest.raises(ValueError, match='extra'):
+            writer.put({'id_negocio': '1', 'extra': 'x'})
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('nombre,id_negocio\nA,1\n')
+    with pytest.raises(ValueError, match='encabezado'):
+        CsvWriter(config).start()
+
+
+def test_full_queue_applies_backpressure(config):
+    config['extractor']['csv_writer']['queue_size'] = 2
+    writer = CsvWriter(config)  # sin arrancar: nadie consume la cola
+    writer.put({'id_negocio': '1'})
+    writer.put({'id_negocio': '2'})
+
+    with pytest.raises(queue.Full):
+        writer.put({'id_negocio': '3'}, timeout=0.05)
+    assert writer.pending() == 2
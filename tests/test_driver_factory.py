@@ -0,0 +1,44 @@
+from src.extractors.driver_factory import (
+    CSS_PATTERNS, IMAGE_PATTERNS, apply_network_blocking, blocked_url_patterns, build_options,
+)
+
+
+def test_lean_profile_blocks_styles_images_and_third_parties_but_interactive_keeps_css(config):
+    lean = blocked_url_patterns(config, 'lean')
+    interactive = blocked_url_patterns(config, 'interactive')
+
+    assert set(IMAGE_PATTERNS + CSS_PATTERNS) <= set(lean)
+    assert '*google-analytics.com*' in lean
+    assert not set(CSS_PATTERNS) & set(interactive) and set(IMAGE_PATTERNS) <= set(interactive)
+    assert blocked_url_patterns(config, 'full') == []
+
+
+def test_lean_options_are_headless_eager_and_skip_image_decoding(config):
+    options = build_options(config, 'lean')
+
+    assert '--headless=new' in options.arguments
+    assert '--blink-settings=imagesEnabled=false' in options.arguments
+    assert options.page_load_strategy == 'eager'
+    assert options.experimental_options['prefs']['profile.managed_default_content_settings.images'] == 2
+
+    full = build_options(config, 'full', multi_tab=True)
+    assert '--blink-settings=imagesEnabled=false' not in full.arguments
+    assert full.page_load_strategy == 'none' and '--disable-renderer-backgrounding' in full.arguments
+
+
+class CdpDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+
+
+def test_network_blocking_sends_the_profile_patterns_over_cdp(config):
+    driver = CdpDriver()
+    patterns = blocked_url_patterns(config, 'lean')
+
+    apply_network_blocking(driver, patterns)
+    apply_network_blocking(driver, [])  # perfil 'full': nada que bloquear
+
+    assert driver.commands == [('Network.enable', {}), ('Network.setBlockedURLs', {'urls': patterns})]
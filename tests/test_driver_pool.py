@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from src.extractors import driver_pool
+from src.extractors.driver_pool import HungDriverError, ManagedDriver
+
+
+class FakeProcess:
+    """Proceso de chromedriver simulado: kill() libera a quien espera una respuesta del driver."""
+
+    def __init__(self):
+        self.killed = threading.Event()
+
+    def kill(self):
+        self.killed.set()
+
+    def wait(self, timeout=None):
+        return 0
+
+
+class HangingDriver:
+    """Driver cuyo get() no vuelve hasta que matan chromedriver (como tras un crash del renderer)."""
+
+    def __init__(self, hangs):
+        self.hangs = hangs
+        self.service = type('Service', (), {'process': FakeProcess()})()
+        self.quit_called = False
+
+    def get(self, url):
+        if self.hangs:
+            if not self.service.process.killed.wait(5):
+                raise AssertionError('el watchdog no mató al driver')
+            raise ConnectionError('chromedriver terminó')
+        return f"html de {url}"
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def managed(config, monkeypatch):
+    """Crea ManagedDriver con watchdog corto; hangs(i) indica si el i-ésimo driver se cuelga."""
+    monkeypatch.setattr(driver_pool, 'psutil', None)  # sin árbol de procesos real que recorrer
+    config['extractor']['watchdog'].update({'hang_timeout': 0.2, 'check_interval': 0.05})
+    managers = []
+
+    def build(hangs):
+        drivers = []
+
+        def factory():
+            drivers.append(HangingDriver(hangs(len(drivers))))
+            return drivers[-1]
+
+        managers.append(ManagedDriver.from_config(factory, config, 'bulk'))
+        return managers[-1], drivers
+
+    yield build
+    for manager in managers:
+        manager.close()
+
+
+def test_watchdog_kills_a_hung_driver_and_run_retries_on_a_fresh_one(managed):
+    manager, drivers = managed(lambda index: index == 0)
+
+    started = time.monotonic()
+    assert manager.run(lambda driver: driver.get('u1'), label='u1') == 'html de u1'
+
+    assert time.monotonic() - started < 2
+    assert len(drivers) == 2 and drivers[0].service.process.killed.is_set()
+    assert manager.driver is drivers[1] and manager.generation == 1
+    assert manager.stats['kills'] == 1 and manager.stats['pages_served'] == 1
+
+
+def test_run_gives_up_when_every_driver_hangs(managed):
+    manager, drivers = managed(lambda index: True)
+
+    with pytest.raises(HungDriverError):
+        manager.run(lambda driver: driver.get('u1'), label='u1', retries=1)
+
+    assert len(drivers) == 2 and manager.stats['kills'] == 2 and manager.stats['pages_served'] == 0
+
+
+def test_page_errors_are_raised_without_killing_or_retrying(managed):
+    manager, drivers = managed(lambda index: False)
+
+    def broken(driver):
+        raise ValueError('selector inexistente')
+
+    with pytest.raises(ValueError):
+        manager.run(broken)
+
+    assert len(drivers) == 1 and manager.stats['kills'] == 0 and manager.driver is drivers[0]
+
+
+def test_progress_keeps_a_long_operation_alive(managed):
+    manager, drivers = managed(lambda index: False)
+    manager.get()
+
+    with manager.operation():
+        for _ in range(6):  # 0.6 s en total, más que hang_timeout, con progreso cada 0.1 s
+            time.sleep(0.1)
+            manager.progress()
+
+    assert manager.stats['kills'] == 0 and manager.driver is drivers[0]
@@ -0,0 +1,52 @@
+import csv
+
+from src.common.journal import ResultJournal
+from src.loaders.file_loader import FileLoader
+from src.main import _resume_output
+
+
+def _rows(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_resume_appends_to_the_interrupted_file_without_duplicates(config, tmp_path):
+    config['OUTPUT_DIR'] = str(tmp_path / 'processed')
+    records = [{'id_negocio': str(i), 'nombre': f"Negocio {i}"} for i in range(1, 4)]
+
+    # Corrida interrumpida: los 3 registros llegaron al journal, solo el 1 completo al CSV y el 2 a medias
+    journal = ResultJournal(config, 'bulk')
+    for record in records:
+        journal.append_record(record)
+    loader = FileLoader(config)
+    _resume_output(journal, [loader], [], resume=False)
+    loader.load_stream(records[:1])
+    with open(loader.output_file, 'a', encoding='utf-8') as f:
+        f.write('2,Negoc')
+    journal.close()
+
+    resumed_journal = ResultJournal(config, 'bulk')
+    replayed, _ = resumed_journal.replay()
+    resumed = FileLoader(config)
+    pending = _resume_output(resumed_journal, [resumed], replayed, resume=True)
+    resumed.load_stream(pending + [{'id_negocio': '4', 'nombre': 'Negocio 4'}])
+
+    assert resumed.output_file == loader.output_file
+    assert list((tmp_path / 'processed').iterdir()) == [loader.output_file]
+    assert [row['id_negocio'] for row in _rows(loader.output_file)] == ['1', '2', '3', '4']
+
+
+def test_new_run_gets_its_own_file(config, tmp_path):
+    config['OUTPUT_DIR'] = str(tmp_path / 'processed')
+    journal = ResultJournal(config, 'bulk')
+    first = FileLoader(config)
+    _resume_output(journal, [first], [], resume=False)
+    first.load_stream([{'id_negocio': '1'}])
+
+    journal.reset()
+    assert journal.output_file() is None
+    second = FileLoader(config)
+    _resume_output(journal, [second], [], resume=False)
+
+    assert second.output_file != first.output_file
+    assert journal.output_file() == str(second.output_file)
@@ -0,0 +1,87 @@
+import pytest
+
+from src.common.id_bitmap import IdBitmap
+from src.extractors.bulk_collector import BulkCollector
+from src.extractors.bulk_scraper import BulkScraper
+from src.extractors.id_density import IdDensityModel
+from src.main import _scrape_bulk_iter
+
+
+@pytest.fixture
+def model(config):
+    config['extractor']['bulk']['density'].update({'block_size': 10, 'probes_per_block': 2, 'frontier': 5,
+                                                   'reprobe_ratio': 0})
+    return IdDensityModel(config)
+
+
+def test_bitmap_roundtrip(tmp_path):
+    bitmap = IdBitmap(str(tmp_path / 'ids.bitmap'))
+    for business_id in (3, 17, 4000):
+        bitmap.mark(business_id, True)
+    bitmap.mark(18, False)
+    bitmap.mark(17, False)  # el ID dejó de existir
+    bitmap.save()
+
+    loaded = IdBitmap(str(tmp_path / 'ids.bitmap'))
+    assert list(loaded.iter_live()) == [3, 4000]
+    assert loaded.max_live() == 4000 and loaded.count_live() == 2
+    assert loaded.is_probed(17) and loaded.is_probed(18) and not loaded.is_probed(19)
+
+
+def test_record_marks_only_confirmed_results(model):
+    model.record({1, 2, 3}, set())
+    hit_blocks = model.record({25}, {4, 5, 21, 22})
+
+    assert hit_blocks == {20}
+    assert list(model.bitmap.iter_live()) == [1, 2, 3, 25]
+    assert model.bitmap.is_probed(4) and not model.bitmap.is_probed(6)
+
+
+def test_coarse_pass_skips_dead_blocks_and_probes_unknown_ones(model):
+    model.record({5}, {13, 18})  # bloque 0-9 vivo, bloque 10-19 muerto
+
+    ids = list(model.coarse_ids(0, 29))
+
+    assert [i for i in ids if i < 10] == list(range(10))
+    assert not [i for i in ids if 10 <= i < 20]
+    assert [i for i in ids if i >= 20] == [22, 27]
+
+
+def test_dead_blocks_are_reprobed(model):
+    model.record(set(), {13, 18})
+    model.reprobe_ratio = 1
+
+    ids = list(model.coarse_ids(10, 19))
+
+    assert len(ids) == 2 and all(10 <= i < 20 for i in ids)
+
+
+def test_failed_fetches_do_not_erase_known_ids(config, model, stub_site):
+    """Con el sitio caído (503) una pasada completa no debe marcar nada como inexistente."""
+    model.record({1, 2, 3}, set())
+    stub_site.response_for = lambda business_id: (503, 'Service Unavailable')
+    config['extractor']['bulk']['base_url'] = stub_site.base_url
+    config['extractor']['bulk']['selenium_fallback'] = False
+    config['extractor']['http']['retries'] = 0
+    scraper = BulkScraper(config, engine='http')
+    collector = BulkCollector(config, 1, 10)
+
+    records = list(_scrape_bulk_iter(collector, scraper, model, model.default_ids()))
+
+    assert records == []
+    assert list(model.default_ids()) == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert not model.bitmap.is_probed(4)
+
+
+def test_confirmed_misses_reach_the_model(config, model, stub_site):
+    stub_site.add_business(2)
+    config['extractor']['bulk']['base_url'] = stub_site.base_url
+    config['extractor']['bulk']['selenium_fallback'] = False
+    scraper = BulkScraper(config, engine='http')
+    collector = BulkCollector(config, 1, 3)
+
+    records = list(_scrape_bulk_iter(collector, scraper, model, range(1, 4)))
+
+    assert [r['id_negocio'] for r in records] == ['2']
+    assert list(model.bitmap.iter_live()) == [2]
+    assert model.bitmap.is_probed(1) and model.bitmap.is_probed(3)
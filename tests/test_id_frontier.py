@@ -0,0 +1,56 @@
+import pytest
+
+from src.extractors.id_frontier import FrontierProbeError, FrontierProber, HighWaterMark
+
+
+@pytest.fixture
+def prober_config(config, stub_site):
+    config['extractor']['bulk']['base_url'] = stub_site.base_url
+    config['extractor']['bulk']['frontier_probe'].update({'window': 4, 'initial_step': 8, 'retries': 2,
+                                                         'retry_delay': 0})
+    config['extractor']['http']['retries'] = 0
+    return config
+
+
+def _populate(stub_site, ids):
+    for business_id in ids:
+        stub_site.add_business(business_id)
+
+
+def test_find_max_live_with_gaps(prober_config, stub_site):
+    _populate(stub_site, range(10, 134, 3))  # huecos más chicos que la ventana
+
+    assert FrontierProber(prober_config).find_max_live(10) == 133
+
+
+def test_transient_errors_do_not_end_the_search_early(prober_config, stub_site):
+    _populate(stub_site, range(10, 143, 3))
+    failures = {139: 1, 142: 2}  # 503 en los primeros intentos
+    respond = stub_site.response_for
+
+    def flaky(business_id):
+        if failures.get(business_id):
+            failures[business_id] -= 1
+            return 503, 'Service Unavailable'
+        return respond(business_id)
+
+    stub_site.response_for = flaky
+
+    assert FrontierProber(prober_config).find_max_live(10) == 142
+    assert stub_site.requests[142] >= 3
+
+
+def test_unresolved_window_raises(prober_config, stub_site):
+    _populate(stub_site, range(10, 20, 3))
+    respond = stub_site.response_for
+    stub_site.response_for = lambda business_id: (503, '') if business_id == 27 else respond(business_id)
+
+    with pytest.raises(FrontierProbeError):
+        FrontierProber(prober_config).find_max_live(10)
+
+
+def test_high_water_mark_roundtrip(config):
+    mark = HighWaterMark(config)
+    assert mark.load() is None
+    mark.save(4321)
+    assert HighWaterMark(config).load() == 4321
@@ -0,0 +1,54 @@
+import os
+
+from src.common.journal import ResultJournal
+
+
+def test_replay_recovers_records_and_misses(config):
+    journal = ResultJournal(config, 'bulk')
+    journal.append_record({'id_negocio': '1', 'nombre': 'Uno'})
+    journal.append_miss('2')
+    journal.append_record({'id_negocio': '1', 'nombre': 'Uno (actualizado)'})
+    journal.close()
+
+    records, completed = ResultJournal(config, 'bulk').replay()
+
+    assert records == [{'id_negocio': '1', 'nombre': 'Uno (actualizado)'}]
+    assert completed == {'1', '2'}
+
+
+def test_truncated_last_line_is_discarded(config):
+    journal = ResultJournal(config, 'bulk')
+    journal.append_record({'id_negocio': '1'})
+    journal.close()
+    segment = journal._segments()[-1]
+    with open(segment, 'a', encoding='utf-8') as f:
+        f.write('{"id": "2", "rec')  # corte a mitad de escritura
+
+    records, completed = ResultJournal(config, 'bulk').replay()
+
+    assert completed == {'1'} and len(records) == 1
+
+
+def test_segments_rotate_and_resume_appends_after_the_last(config):
+    config['extractor']['journal']['segment_mb'] = 0  # cada línea abre un segmento nuevo
+    journal = ResultJournal(config, 'bulk')
+    for business_id in range(3):
+        journal.append_miss(business_id)
+    journal.close()
+    assert len(journal._segments()) == 3
+
+    resumed = ResultJournal(config, 'bulk')
+    resumed.append_miss(3)
+    resumed.close()
+
+    assert [os.path.basename(p) for p in resumed._segments()][-1] == 'segment-000004.jsonl'
+    assert resumed.replay()[1] == {'0', '1', '2', '3'}
+
+
+def test_reset_removes_segments(config):
+    journal = ResultJournal(config, 'sequential')
+    journal.append_miss('1')
+    journal.reset()
+
+    assert journal._segments() == []
+    assert journal.replay() == ([], set())
@@ -0,0 +1,74 @@
+import os
+import shutil
+
+import pytest
+
+from src.common.config import get_config
+from src.extractors.bulk_scraper import BulkScraper
+from src.extractors.driver_factory import create_driver
+from src.extractors.js_extractor import RECORD_FIELDS, extract_record
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'detail_pages')
+
+# Campos que cada página de prueba fija, además de ser iguales en ambos caminos
+EXPECTED = {
+    'completa.html': {
+        'telefonos': '261 425-1234, 261 425-5678', 'whatsapp': '5492615551234',
+        'email': 'ventas@ferreteriacentral.com.ar', 'horarios': 'Lun a Vie 8:30 a 13 y 16:30 a 20',
+        'rubros': 'Ferreterías, Pinturerías', 'descripcion': 'Herramientas, pinturas ymateriales eléctricos.',
+        'latitud': '-32.9269', 'longitud': '-68.8453',
+    },
+    # WhatsApp sin phone=: el número sale del parámetro text=; email y web por los íconos
+    'whatsapp_text.html': {
+        'whatsapp': '2615559876', 'sitio_web': 'http://laespiga.com.ar/', 'email': 'hola@laespiga.com.ar',
+        'horarios': 'Todos los días 7 a 21', 'rubros': 'Panaderías', 'latitud': '-33.0371', 'longitud': 'N/A',
+    },
+    # text= sin dígitos no cae al texto del enlace; el email suelto tras el ícono no se encuentra
+    'email_respaldo.html': {
+        'whatsapp': 'N/A', 'email': 'N/A', 'rubros': 'N/A', 'descripcion': 'Liquidación de sueldos\n    e impuestos.',
+    },
+    # Rubro en span.search-result-category y sin div.map
+    'rubro_sin_mapa.html': {
+        'email': 'N/A', 'rubros': 'Veterinarias', 'latitud': 'N/A', 'longitud': 'N/A',
+    },
+}
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(scope='module')
+def scraper():
+    return BulkScraper(get_config())
+
+
+@pytest.fixture(scope='module')
+def driver():
+    if not any(shutil.which(name) for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')):
+        pytest.skip('Chrome no está instalado')
+    try:
+        driver = create_driver(get_config(), 'full')
+    except Exception as e:
+        pytest.skip(f"No se pudo iniciar Chrome: {e}")
+    yield driver
+    driver.quit()
+
+
+@pytest.mark.parametrize('name', sorted(EXPECTED))
+def test_soup_extraction_of_fixtures(scraper, name):
+    record = scraper.parse_business_html(_read(name), name)
+
+    assert {field: record[field] for field in EXPECTED[name]} == EXPECTED[name]
+
+
+@pytest.mark.parametrize('name', sorted(EXPECTED))
+def test_js_extraction_matches_soup(scraper, driver, name):
+    driver.get('file://' + os.path.join(FIXTURES_DIR, name))
+
+    js_record = extract_record(driver)
+    soup_record = scraper.parse_business_html(_read(name), name)
+
+    for field in RECORD_FIELDS:
+        assert js_record[field] == soup_record[field], field
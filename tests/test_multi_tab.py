@@ -0,0 +1,88 @@
+import pytest
+
+from src.extractors import bulk_scraper as bulk_scraper_module
+from src.extractors import driver_pool
+from src.extractors.bulk_scraper import BulkScraper
+from src.extractors.driver_pool import ManagedDriver
+from src.extractors.js_extractor import NAVIGATION_STATUS_SCRIPT
+from src.extractors.multi_tab import NAVIGATE_SCRIPT, READY_SCRIPT, TabPool
+
+from .conftest import DETAIL_HTML, EMPTY_HTML, MISSING_HTML
+
+
+class FakeTabsDriver:
+    """
+    Driver con pestañas simuladas: cada URL termina 'ready', 'missing' (la página del sitio
+    sin el negocio), 'error' (una página de error de Chrome) o nunca carga (None).
+    """
+
+    PAGES = {'ready': DETAIL_HTML, 'missing': MISSING_HTML, 'error': EMPTY_HTML}
+
+    def __init__(self, states):
+        self.states = states
+        self.current_window_handle = 'tab-0'
+        self.tab_urls = {}
+        self.switch_to = self
+
+    # switch_to
+    def new_window(self, kind):
+        self.current_window_handle = f"tab-{len(self.tab_urls) + 1}"
+        self.tab_urls[self.current_window_handle] = None
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def execute_script(self, script, *args):
+        if script == NAVIGATE_SCRIPT:
+            self.tab_urls[self.current_window_handle] = args[0]
+        elif script == READY_SCRIPT:
+            state = self._state()
+            return state if state in (None, 'ready') else 'empty'
+        elif script == NAVIGATION_STATUS_SCRIPT:
+            return 200 if self._state() != 'error' else None
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def _state(self):
+        return self.states[self.tab_urls[self.current_window_handle]]
+
+    @property
+    def page_source(self):
+        return self.PAGES[self._state()]
+
+    def close(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+STATES = {'u1': 'ready', 'u2': 'missing', 'u3': None, 'u4': 'ready', 'u5': None, 'u6': 'error'}
+
+
+def test_timed_out_and_error_tabs_are_not_reported_as_missing():
+    pool = TabPool(FakeTabsDriver(STATES), tabs=2, timeout=0.1, poll_interval=0.01)
+
+    results = dict(pool.scrape(list(STATES)))
+
+    assert set(results) == {'u1', 'u2', 'u4'}
+    assert results['u1'] == DETAIL_HTML and results['u2'] is None
+    assert sorted(pool.unresolved) == ['u3', 'u5', 'u6']
+
+
+@pytest.fixture
+def tabs_worker(config, monkeypatch):
+    config['extractor']['tabs'].update({'per_driver': 2, 'timeout': 0.1, 'poll_interval': 0.01})
+    monkeypatch.setattr(bulk_scraper_module, '_worker_scraper', BulkScraper(config, engine='tabs'))
+    monkeypatch.setattr(driver_pool, '_worker_driver', ManagedDriver(lambda: FakeTabsDriver(STATES)))
+
+
+def test_tabs_worker_keeps_unresolved_pages_for_retry_and_reports_misses(tabs_worker):
+    records, misses, remaining, drivers_started, pages_served = \
+        BulkScraper._scrape_tabs_chunk_worker(list(STATES))
+
+    assert len(records) == 2
+    assert misses == ['u2']
+    assert sorted(remaining) == ['u3', 'u5', 'u6']
+    assert drivers_started == 1 and pages_served == 3
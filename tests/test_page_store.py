@@ -0,0 +1,103 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.common import page_store as page_store_module
+from src.common.page_store import PageStore
+
+
+@pytest.fixture
+def store(config):
+    store = PageStore(config)
+    yield store
+    store.close()
+
+
+def _last_access(store, business_id):
+    with sqlite3.connect(store.path) as conn:
+        return conn.execute('SELECT last_access FROM pages WHERE id_negocio = ?', (business_id,)).fetchone()[0]
+
+
+def test_put_and_get_roundtrip(store):
+    store.put('1', 'https://example.com/?id=1', '<html>uno</html>')
+
+    assert store.get('1') == '<html>uno</html>'
+    assert store.get('2') is None
+    assert store.stats['hits'] == 1 and store.stats['misses'] == 1
+
+
+def test_identical_pages_share_a_blob(store):
+    store.put('1', 'u1', '<html>igual</html>')
+    store.put('2', 'u2', '<html>igual</html>')
+
+    assert store.conn.execute('SELECT COUNT(*) FROM blobs').fetchone()[0] == 1
+    assert store.get('2') == '<html>igual</html>'
+
+
+def test_expired_pages_are_misses_unless_requested(config):
+    store = PageStore(config, ttl=60)
+    store.put('1', 'u1', '<html>vieja</html>')
+    store.conn.execute('UPDATE pages SET fetched_at = ?', (time.time() - 120,))
+
+    assert store.get('1') is None
+    assert store.get('1', include_expired=True) == '<html>vieja</html>'
+    assert store.evict() == 1
+    store.close()
+
+
+def test_hits_do_not_write_until_flushed(store, monkeypatch):
+    monkeypatch.setattr(page_store_module, 'ACCESS_FLUSH_EVERY', 3)
+    for business_id in ('1', '2', '3'):
+        store.put(business_id, f"u{business_id}", f"<html>{business_id}</html>")
+    written = _last_access(store, '1')
+
+    time.sleep(0.01)
+    store.get('1')
+    store.get('2')
+    assert _last_access(store, '1') == written
+
+    store.get('3')  # tercer acierto: se vuelcan los tres accesos juntos
+    assert _last_access(store, '1') > written
+    assert not store._pending_access
+
+
+def test_evict_sees_pending_accesses(config):
+    store = PageStore(config, ttl=0)
+    store.put('0', 'u0', '<html>primera</html>')
+    for business_id in range(1, 251):
+        store.put(str(business_id), f"u{business_id}", f"<html>{business_id}</html>")
+    assert store.get('0') is not None  # la más vieja pasa a ser la más usada, solo en memoria
+
+    total = store.conn.execute('SELECT SUM(size) FROM blobs').fetchone()[0]
+    store.max_bytes = total // 2
+    removed = store.evict()
+
+    assert removed == 200
+    assert store.get('0') is not None
+    assert store.get('1') is None
+    store.close()
+
+
+def test_each_thread_uses_its_own_connection(store):
+    store.put('1', 'u1', '<html>uno</html>')
+    results, errors = {}, []
+
+    def worker(business_id):
+        try:
+            store.put(business_id, f"u{business_id}", f"<html>{business_id}</html>")
+            results[business_id] = (store.get('1'), store.conn)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(str(i),)) for i in (2, 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert all(html == '<html>uno</html>' for html, _ in results.values())
+    assert results['2'][1] is not results['3'][1] is not store.conn
+    assert store.get('3') == '<html>3</html>'
@@ -0,0 +1,53 @@
+import multiprocessing as mp
+
+from src.common.processed_index import ProcessedIdIndex
+
+
+def _add_range(config, start, end):
+    index = ProcessedIdIndex(config)
+    for business_id in range(start, end):
+        index.add_many([business_id])
+    index.close()
+
+
+def test_bootstraps_from_leads_csv(config):
+    csv_path = config['extractor']['processed_index']['csv_path']
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('id_negocio,nombre\n12,Uno\n7,Dos\nabc,Tres\n,Cuatro\n')
+
+    index = ProcessedIdIndex(config)
+
+    assert 12 in index and '7' in index
+    assert not index.contains(8) and not index.contains('abc') and not index.contains(None)
+    index.close()
+
+
+def test_without_csv_starts_empty(config):
+    index = ProcessedIdIndex(config)
+    assert not index.contains(0) and not index.contains(10 ** 6)
+    index.close()
+
+
+def test_growth_is_visible_to_other_instances(config):
+    reader = ProcessedIdIndex(config)
+    writer = ProcessedIdIndex(config)
+    writer.add_many([3, 50000])
+
+    assert reader.contains(3) and reader.contains('50000')
+    assert not reader.contains(49999)
+    reader.close()
+    writer.close()
+
+
+def test_concurrent_writers_do_not_lose_ids(config):
+    ProcessedIdIndex(config).close()
+    ctx = mp.get_context('fork')
+    workers = [ctx.Process(target=_add_range, args=(config, start, start + 300)) for start in (0, 300, 600, 900)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    index = ProcessedIdIndex(config)
+    assert all(index.contains(business_id) for business_id in range(1200))
+    index.close()
@@ -0,0 +1,20 @@
+import gzip
+
+from src.extractors.replay import replay_archive
+
+from .conftest import DETAIL_HTML, EMPTY_HTML
+
+
+def test_replay_skips_pages_without_detail_content(config, tmp_path):
+    archive = tmp_path / 'archive'
+    (archive / 'sub').mkdir(parents=True)
+    (archive / '101.html').write_text(DETAIL_HTML.format(name='Panadería Sol', id=101), encoding='utf-8')
+    with gzip.open(archive / 'sub' / '102.html.gz', 'wt', encoding='utf-8') as f:
+        f.write(DETAIL_HTML.format(name='Kiosco Luna', id=102))
+    (archive / '103.html').write_text(EMPTY_HTML, encoding='utf-8')
+    (archive / 'notas.txt').write_text('no es una página', encoding='utf-8')
+
+    records = replay_archive(str(archive), config, max_workers=1, chunksize=1)
+
+    assert sorted((r['id_negocio'], r['nombre']) for r in records) == [('101', 'Panadería Sol'), ('102', 'Kiosco Luna')]
+    assert records[0]['url'].startswith(config['extractor']['bulk']['base_url'])
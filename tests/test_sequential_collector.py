@@ -0,0 +1,68 @@
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from src.extractors.driver_pool import ManagedDriver
+from src.extractors.sequential_collector import SequentialCollector
+
+
+class FakeSearchFetcher:
+    """Devuelve páginas de resultados con un negocio nuevo por página hasta `last_page`."""
+
+    def __init__(self, last_page=4):
+        self.last_page = last_page
+        self.pages = []
+
+    def fetch(self, url, headers=None):
+        query = parse_qs(urlparse(url).query, keep_blank_values=True)
+        rubro, page = query['R'][0], int(query.get('page', ['1'])[0])
+        self.pages.append((rubro, page))
+        items = ''
+        if page <= self.last_page:
+            items = f'<div class="gc-item"><a href="index.php?r=search/detail&id={rubro}{page}">x</a></div>'
+        return SimpleNamespace(ok=True, text=f'<html><body>{items}</body></html>')
+
+
+def _http_collector(**kwargs):
+    collector = SequentialCollector(collection_mode='http', collectors=1, **kwargs)
+    collector.fetcher = FakeSearchFetcher()
+    collector.pacing.wait = lambda: None
+    collector._resolve_filter_value = lambda kind, text: text
+    return collector
+
+
+def test_start_page_applies_only_to_first_combination():
+    collector = _http_collector(rubros=['1', '2'], start_page=3)
+
+    collector._process_search_http('1', None)
+    collector._process_search_http('2', None)
+
+    assert [page for rubro, page in collector.fetcher.pages if rubro == '1'] == [3, 4, 5]
+    assert [page for rubro, page in collector.fetcher.pages if rubro == '2'] == [1, 2, 3, 4, 5]
+
+
+def test_parallel_workers_share_start_pages():
+    collector = _http_collector(rubros=['1', '2'], start_page=3)
+    worker = collector._spawn_worker()
+
+    assert worker.start_pages is collector.start_pages
+    assert worker.start_pages == {('1', None): 3}
+
+
+def test_slow_url_sink_does_not_trip_the_watchdog():
+    received = []
+
+    def slow_sink(business_id, url):
+        time.sleep(0.5)  # cola llena: los scrapers van atrasados
+        received.append(business_id)
+
+    collector = SequentialCollector(collectors=1, url_sink=slow_sink)
+    collector.managed = ManagedDriver(lambda: SimpleNamespace(quit=lambda: None), hang_timeout=0.2, check_interval=0.05)
+    try:
+        added = collector.managed.run(
+            lambda driver: collector._register_detail_href('index.php?r=search/detail&id=42'), retries=0)
+    finally:
+        collector.managed.close()
+
+    assert added and received == ['42']
+    assert collector.managed.stats['kills'] == 0
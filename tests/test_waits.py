@@ -0,0 +1,67 @@
+import time
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from src.extractors.waits import DOM_SETTLE_SCRIPT, PacingPolicy, wait_for_dom_settle, wait_for_selector
+
+
+class LateElementDriver:
+    """Driver cuyo elemento aparece `delay` segundos después de crearlo."""
+
+    def __init__(self, delay):
+        self.ready_at = time.monotonic() + delay
+        self.lookups = []
+
+    def find_element(self, by, selector):
+        self.lookups.append(selector)
+        if time.monotonic() < self.ready_at:
+            raise NoSuchElementException(selector)
+        return f"<{selector}>"
+
+
+def test_wait_for_selector_returns_as_soon_as_the_element_appears(config):
+    driver = LateElementDriver(0.2)
+    started = time.monotonic()
+
+    element = wait_for_selector(driver, 'h1', timeout=5, poll_interval=config['extractor']['waits']['poll_interval'])
+
+    # Con el sondeo de 0.5 s de WebDriverWait la espera llegaría a 0.5 s
+    assert element == '<h1>'
+    assert time.monotonic() - started < 0.4 and len(driver.lookups) > 2
+
+
+class ScriptDriver:
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.script_timeout = None
+
+    def set_script_timeout(self, timeout):
+        self.script_timeout = timeout
+
+    def execute_async_script(self, script, *args):
+        assert script == DOM_SETTLE_SCRIPT
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+def test_wait_for_dom_settle_reports_whether_the_dom_settled(config):
+    quiet_ms = config['extractor']['waits']['dom_quiet_ms']
+    settled = ScriptDriver(True)
+
+    assert wait_for_dom_settle(settled, quiet_ms=quiet_ms, timeout=2) is True
+    assert settled.script_timeout > 2  # el script resuelve solo antes que el timeout de Selenium
+    assert wait_for_dom_settle(ScriptDriver(False), quiet_ms=quiet_ms, timeout=2) is False
+    assert wait_for_dom_settle(ScriptDriver(TimeoutException()), quiet_ms=quiet_ms, timeout=2) is False
+
+
+def test_pacing_only_waits_for_the_rest_of_the_interval(config):
+    config['extractor']['pacing'].update({'detail_min_interval': 0.3, 'jitter': 0})
+    pacing = PacingPolicy.from_config(config, 'detail')
+
+    assert pacing.wait() == 0  # la primera acción no espera
+    time.sleep(0.1)  # la página tardó 0.1 s en cargar
+    waited = pacing.wait()
+    assert 0.15 < waited <= 0.2
+    time.sleep(0.35)  # tardó más que el intervalo: sin pausa
+    assert pacing.wait() == 0